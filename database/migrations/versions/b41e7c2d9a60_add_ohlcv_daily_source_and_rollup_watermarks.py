@@ -0,0 +1,62 @@
+"""add_ohlcv_daily_source_and_rollup_watermarks
+
+Revision ID: b41e7c2d9a60
+Revises: 737850d30a66
+Create Date: 2026-10-18 09:12:40.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41e7c2d9a60'
+down_revision: Union[str, Sequence[str], None] = '737850d30a66'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track daily bar provenance and add the rollup watermark table.
+
+    This migration:
+    1. Adds quotes.ohlcv_daily.source ('external' for provider/file loads,
+       'rollup' for bars aggregated from quotes.real_time). Existing rows
+       came from yfinance and default to 'external'.
+    2. Creates quotes.rollup_watermarks, holding the last local trading day
+       rolled up per job so each run only processes newly closed days.
+    """
+    op.add_column(
+        "ohlcv_daily",
+        sa.Column("source", sa.VARCHAR(16), nullable=False, server_default="external"),
+        schema="quotes",
+    )
+    op.create_check_constraint(
+        "ck_ohlcv_daily_source",
+        "ohlcv_daily",
+        "source IN ('external', 'rollup')",
+        schema="quotes",
+    )
+
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("job", sa.Text(), nullable=False),
+        sa.Column("watermark", sa.DATE(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+        sa.PrimaryKeyConstraint("job"),
+        schema="quotes",
+    )
+
+
+def downgrade() -> None:
+    """Drop rollup watermarks and the provenance column."""
+    op.drop_table("rollup_watermarks", schema="quotes")
+    op.drop_constraint("ck_ohlcv_daily_source", "ohlcv_daily", schema="quotes")
+    op.drop_column("ohlcv_daily", "source", schema="quotes")
@@ -0,0 +1,46 @@
+"""create_corporate_actions
+
+Revision ID: c7a2e5f1d083
+Revises: b41e7c2d9a60
+Create Date: 2026-10-18 10:02:17.204611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7a2e5f1d083'
+down_revision: Union[str, Sequence[str], None] = 'b41e7c2d9a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create corporate_actions table (splits and dividends per ticker).
+
+    Adjusted prices are computed on read from raw ohlcv_daily prices and the
+    cumulative product of these factors, so recording a new action is a
+    single-row insert instead of a rewrite of the ticker's history.
+    """
+    op.create_table(
+        "corporate_actions",
+        sa.Column("ticker", sa.VARCHAR(10), nullable=False),
+        sa.Column("ex_date", sa.DATE(), nullable=False),
+        sa.Column("action_type", sa.VARCHAR(16), nullable=False),
+        sa.Column("value", sa.FLOAT(), nullable=False),
+        sa.Column("factor", sa.FLOAT(), nullable=False),
+        sa.PrimaryKeyConstraint("ticker", "ex_date", "action_type"),
+        sa.CheckConstraint(
+            "action_type IN ('split', 'dividend')", name="ck_corporate_actions_type"
+        ),
+        sa.CheckConstraint("factor > 0", name="ck_corporate_actions_factor"),
+        schema="quotes",
+    )
+
+
+def downgrade() -> None:
+    """Drop corporate_actions table."""
+    op.drop_table("corporate_actions", schema="quotes")
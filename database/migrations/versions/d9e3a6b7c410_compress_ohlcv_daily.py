@@ -0,0 +1,87 @@
+"""compress_ohlcv_daily
+
+Revision ID: d9e3a6b7c410
+Revises: f3c8d2a6b514
+Create Date: 2026-10-18 11:40:52.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e3a6b7c410'
+down_revision: Union[str, Sequence[str], None] = 'f3c8d2a6b514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Enable columnar compression on ohlcv_daily.
+
+    Backtests scan ohlcv_daily by ticker across years, so chunks are
+    segmented by ticker and ordered by date: a full-history read of one
+    ticker decompresses one contiguous segment per chunk.
+
+    This migration:
+    1. Switches new chunks to 1-year intervals (7-day chunks hold ~5 rows per
+       ticker, far too few for segmentby = ticker)
+    2. Enables compression (segmentby ticker, orderby date)
+    3. Adds a compression policy for chunks older than 30 days
+
+    Backfills into compressed chunks go through CompressionManager, which
+    decompresses the chunks written to and recompresses them afterwards.
+    """
+    op.execute(
+        """
+        SELECT set_chunk_time_interval('quotes.ohlcv_daily', INTERVAL '365 days');
+        """
+    )
+
+    op.execute(
+        """
+        ALTER TABLE quotes.ohlcv_daily SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'ticker',
+            timescaledb.compress_orderby = 'date'
+        );
+        """
+    )
+
+    op.execute(
+        """
+        SELECT add_compression_policy('quotes.ohlcv_daily',
+                                      INTERVAL '30 days',
+                                      if_not_exists => TRUE);
+        """
+    )
+
+
+def downgrade() -> None:
+    """Decompress ohlcv_daily and disable compression."""
+    op.execute(
+        """
+        SELECT remove_compression_policy('quotes.ohlcv_daily', if_exists => TRUE);
+        """
+    )
+
+    op.execute(
+        """
+        SELECT decompress_chunk(c, if_compressed => TRUE)
+        FROM show_chunks('quotes.ohlcv_daily') c;
+        """
+    )
+
+    op.execute(
+        """
+        ALTER TABLE quotes.ohlcv_daily SET (timescaledb.compress = FALSE);
+        """
+    )
+
+    op.execute(
+        """
+        SELECT set_chunk_time_interval('quotes.ohlcv_daily', INTERVAL '7 days');
+        """
+    )
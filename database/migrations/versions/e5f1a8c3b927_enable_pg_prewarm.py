@@ -0,0 +1,42 @@
+"""enable_pg_prewarm
+
+Revision ID: e5f1a8c3b927
+Revises: d9e3a6b7c410
+Create Date: 2026-10-18 15:12:07.504316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f1a8c3b927'
+down_revision: Union[str, Sequence[str], None] = 'd9e3a6b7c410'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Install pg_prewarm for service warm-up.
+
+    Warmup loads the indexes of recent quotes.real_time chunks into shared
+    buffers with pg_prewarm() so the first reads after a deploy or restart
+    do not fault them in from disk. pg_prewarm ships with PostgreSQL
+    contrib; warm-up skips the step when it is missing.
+    """
+    op.execute(
+        """
+        CREATE EXTENSION IF NOT EXISTS pg_prewarm;
+        """
+    )
+
+
+def downgrade() -> None:
+    """Remove pg_prewarm."""
+    op.execute(
+        """
+        DROP EXTENSION IF EXISTS pg_prewarm;
+        """
+    )
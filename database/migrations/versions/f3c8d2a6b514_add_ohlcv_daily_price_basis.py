@@ -0,0 +1,50 @@
+"""add_ohlcv_daily_price_basis
+
+Revision ID: f3c8d2a6b514
+Revises: c7a2e5f1d083
+Create Date: 2026-10-18 10:48:31.927140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8d2a6b514'
+down_revision: Union[str, Sequence[str], None] = 'c7a2e5f1d083'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record the price basis of each daily bar.
+
+    Bars loaded before backfills switched to raw prices were stored
+    yfinance-adjusted for splits and dividends; adjusting them again on read
+    would double-adjust them. This migration:
+    1. Adds quotes.ohlcv_daily.price_basis, 'adjusted' for existing rows
+    2. Switches its default to 'raw' for rows written from now on
+
+    Adjusted reads refuse tickers that still hold 'adjusted' rows until they
+    are re-downloaded (see README, "Split/Dividend Adjustments").
+    """
+    op.add_column(
+        "ohlcv_daily",
+        sa.Column("price_basis", sa.VARCHAR(8), nullable=False, server_default="adjusted"),
+        schema="quotes",
+    )
+    op.alter_column("ohlcv_daily", "price_basis", server_default="raw", schema="quotes")
+    op.create_check_constraint(
+        "ck_ohlcv_daily_price_basis",
+        "ohlcv_daily",
+        "price_basis IN ('raw', 'adjusted')",
+        schema="quotes",
+    )
+
+
+def downgrade() -> None:
+    """Drop the price basis column."""
+    op.drop_constraint("ck_ohlcv_daily_price_basis", "ohlcv_daily", schema="quotes")
+    op.drop_column("ohlcv_daily", "price_basis", schema="quotes")
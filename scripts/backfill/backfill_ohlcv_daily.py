@@ -1,17 +1,22 @@
 """Backfill script for historical OHLCV daily quotes (2017-2024).
 
 Loads 7 years of daily OHLCV data for S&P 500 companies using yfinance.
-Includes rate limiting, checkpoint recovery, and data quality validation.
+Tickers are fetched concurrently under a shared token-bucket rate limit and
+written in multi-ticker COPY batches. Includes retries, checkpoint recovery,
+and data quality validation.
+
+With --input, loads offline vendor drops (CSV / Parquet files covering many
+symbols) instead, COPY-loading several files in parallel without network
+access.
 
 Usage:
     python scripts/backfill/backfill_ohlcv_daily.py [--tickers-file tickers.txt] [--start-date 2017-01-01]
+    python scripts/backfill/backfill_ohlcv_daily.py --input /data/vendor/daily/
 """
 
 import argparse
-import json
 import logging
 import sys
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -20,6 +25,25 @@ import psycopg2
 import yfinance as yf
 from psycopg2.extras import execute_values
 
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.backfill import (
+    DEFAULT_OVERLAP_DAYS,
+    BackfillEngine,
+    CheckpointStore,
+    CopyWriter,
+    FileSource,
+    TokenBucket,
+    YFinanceSource,
+    load_files,
+    load_high_water_marks,
+    plan_incremental,
+)
+from opa_quotes_storage.compression import CompressionManager
+from opa_quotes_storage.connection import get_engine, get_session
+from opa_quotes_storage.quality import check_tickers
+
 # Logging configuration
 logging.basicConfig(
     level=logging.INFO,
@@ -34,9 +58,17 @@ logger = logging.getLogger(__name__)
 # Constants
 DEFAULT_START_DATE = "2017-01-01"
 DEFAULT_END_DATE = datetime.now().strftime("%Y-%m-%d")
-RATE_LIMIT_DELAY = 0.5  # seconds between requests
-BATCH_SIZE = 50  # Number of tickers to process before checkpoint
-CHECKPOINT_FILE = "logs/backfill_checkpoint.json"
+REQUESTS_PER_SECOND = 2.0  # sustained provider request rate (all workers)
+RATE_LIMIT_BURST = 4  # requests allowed back-to-back
+FETCH_WORKERS = 8  # concurrent fetch workers
+MAX_RETRIES = 3  # retries per ticker with jittered backoff
+WRITE_BATCH_ROWS = 20_000  # rows per write transaction (across tickers)
+SEGMENT_DAYS = 365  # days per fetch segment (checkpointed independently)
+CHECKPOINT_FILE = "logs/backfill_checkpoint.sqlite"
+LEGACY_CHECKPOINT_FILE = "logs/backfill_checkpoint.json"
+FILE_WORKERS = 4  # files COPY-loaded concurrently (one connection each)
+FILE_CHUNK_ROWS = 100_000  # rows read per CSV chunk / Parquet batch
+FILE_CHECKPOINT_FILE = "logs/backfill_files_checkpoint.sqlite"
 
 # Database connection (use environment variables in production)
 DB_CONFIG = {
@@ -46,40 +78,21 @@ DB_CONFIG = {
     "user": "opa_user",
     "password": "opa_password",
 }
+DB_URL = "postgresql://{user}:{password}@{host}:{port}/{database}".format(**DB_CONFIG)
 
 
-class BackfillCheckpoint:
-    """Manages checkpoint state for resumable backfill operations."""
+class BackfillCheckpoint(CheckpointStore):
+    """Manages checkpoint state for resumable backfill operations.
+
+    SQLite journal with set semantics: O(1) crash-safe updates per ticker and
+    per committed (ticker, date-range) segment. A legacy JSON checkpoint is
+    imported on first use.
+    """
 
     def __init__(self, checkpoint_file: str = CHECKPOINT_FILE):
-        self.checkpoint_file = Path(checkpoint_file)
-        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
-
-    def load(self) -> dict:
-        """Load checkpoint state from file."""
-        if self.checkpoint_file.exists():
-            with open(self.checkpoint_file, "r") as f:
-                return json.load(f)
-        return {"completed_tickers": [], "failed_tickers": [], "last_updated": None}
-
-    def save(self, state: dict) -> None:
-        """Save checkpoint state to file."""
-        state["last_updated"] = datetime.now().isoformat()
-        with open(self.checkpoint_file, "w") as f:
-            json.dump(state, f, indent=2)
-
-    def mark_completed(self, ticker: str) -> None:
-        """Mark ticker as successfully completed."""
-        state = self.load()
-        if ticker not in state["completed_tickers"]:
-            state["completed_tickers"].append(ticker)
-        self.save(state)
-
-    def mark_failed(self, ticker: str, error: str) -> None:
-        """Mark ticker as failed with error message."""
-        state = self.load()
-        state["failed_tickers"].append({"ticker": ticker, "error": error})
-        self.save(state)
+        super().__init__(checkpoint_file)
+        if checkpoint_file == CHECKPOINT_FILE and self.import_json(LEGACY_CHECKPOINT_FILE):
+            logger.info(f"Imported legacy checkpoint {LEGACY_CHECKPOINT_FILE}")
 
 
 def get_sp500_tickers() -> list[str]:
@@ -137,37 +150,18 @@ def fetch_ohlcv_data(
         or None if fetch fails
     """
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(start=start_date, end=end_date)
-
-        if df.empty:
-            logger.warning(f"No data returned for {ticker}")
-            return None
-
-        # Convert to list of tuples for batch insert
-        data = []
-        for date, row in df.iterrows():
-            # yfinance returns 'Close' as adjusted close by default
-            data.append(
-                (
-                    ticker,
-                    date.date(),
-                    float(row["Open"]),
-                    float(row["High"]),
-                    float(row["Low"]),
-                    float(row["Close"]),
-                    float(row["Close"]),  # adj_close = close (already adjusted)
-                    int(row["Volume"]),
-                )
-            )
-
-        logger.info(f"Fetched {len(data)} records for {ticker}")
-        return data
-
+        data = YFinanceSource(yf).fetch(ticker, start_date, end_date)
     except Exception as e:
         logger.error(f"Error fetching data for {ticker}: {e}")
         return None
 
+    if data is None:
+        logger.warning(f"No data returned for {ticker}")
+        return None
+
+    logger.info(f"Fetched {len(data)} records for {ticker}")
+    return data
+
 
 def insert_ohlcv_data(conn, data: list[tuple]) -> int:
     """Insert OHLCV data into quotes.ohlcv_daily table.
@@ -203,50 +197,21 @@ def insert_ohlcv_data(conn, data: list[tuple]) -> int:
 def validate_data_quality(conn, ticker: str, start_date: str) -> dict:
     """Validate data quality for a ticker.
 
+    Uses the set-based report from ``opa_quotes_storage.quality`` (one query);
+    see ``scripts/backfill/check_ohlcv_quality.py`` to check all tickers.
+
     Args:
         conn: psycopg2 connection
         ticker: Stock ticker symbol
         start_date: Expected start date
 
     Returns:
-        Dict with validation metrics
+        Dict with validation metrics (record_count, min_date, max_date, gaps,
+        ohlc_violations, bad_volume, duplicate_days, ...)
     """
     with conn.cursor() as cursor:
-        # Count records
-        cursor.execute(
-            "SELECT COUNT(*) FROM quotes.ohlcv_daily WHERE ticker = %s", (ticker,)
-        )
-        record_count = cursor.fetchone()[0]
-
-        # Check date range
-        cursor.execute(
-            "SELECT MIN(date), MAX(date) FROM quotes.ohlcv_daily WHERE ticker = %s",
-            (ticker,),
-        )
-        min_date, max_date = cursor.fetchone()
-
-        # Check for gaps (>5 trading days)
-        cursor.execute(
-            """
-            SELECT date, LEAD(date) OVER (ORDER BY date) as next_date
-            FROM quotes.ohlcv_daily
-            WHERE ticker = %s
-            ORDER BY date
-        """,
-            (ticker,),
-        )
-        gaps = []
-        for row in cursor.fetchall():
-            if row[1] and (row[1] - row[0]).days > 7:  # ~5 trading days = 7 calendar
-                gaps.append((row[0], row[1]))
-
-        return {
-            "ticker": ticker,
-            "record_count": record_count,
-            "min_date": min_date,
-            "max_date": max_date,
-            "gaps": gaps,
-        }
+        (metrics,) = check_tickers(cursor, [ticker], anomalies_only=False)
+    return metrics
 
 
 def run_backfill(
@@ -254,6 +219,11 @@ def run_backfill(
     start_date: str = DEFAULT_START_DATE,
     end_date: str = DEFAULT_END_DATE,
     resume: bool = True,
+    workers: int = FETCH_WORKERS,
+    requests_per_second: float = REQUESTS_PER_SECOND,
+    burst: int = RATE_LIMIT_BURST,
+    incremental: bool = False,
+    overlap_days: int = DEFAULT_OVERLAP_DAYS,
 ) -> dict:
     """Run backfill operation for all tickers.
 
@@ -262,57 +232,107 @@ def run_backfill(
         start_date: Start date (YYYY-MM-DD)
         end_date: End date (YYYY-MM-DD)
         resume: Whether to resume from checkpoint
+        workers: Number of concurrent fetch workers
+        requests_per_second: Shared provider request rate
+        burst: Requests allowed back-to-back by the rate limiter
+        incremental: Fetch only the tail after each ticker's latest stored
+            date (plus overlap_days) instead of the full range; ignores the
+            completed-tickers checkpoint
+        overlap_days: Days re-fetched before the latest stored date
 
     Returns:
         Summary statistics
     """
     checkpoint = BackfillCheckpoint()
-    state = checkpoint.load() if resume else {"completed_tickers": [], "failed_tickers": []}
-
-    # Filter out already completed tickers
-    pending_tickers = [
-        t for t in tickers if t not in state["completed_tickers"]
-    ]
-    logger.info(f"Starting backfill: {len(pending_tickers)} tickers pending")
 
     # Connect to database
     conn = psycopg2.connect(**DB_CONFIG)
     logger.info("Connected to database")
 
-    stats = {
-        "total_tickers": len(tickers),
-        "completed": len(state["completed_tickers"]),
-        "failed": len(state["failed_tickers"]),
-        "total_records": 0,
-    }
-
-    try:
-        for i, ticker in enumerate(pending_tickers, 1):
-            logger.info(
-                f"Processing {ticker} ({i}/{len(pending_tickers)} pending, "
-                f"{stats['completed']}/{stats['total_tickers']} total)"
-            )
+    start_dates = None
+    # Tickers whose earlier rows are already stored: an empty tail completes them
+    resumed: set[str] = set()
+    if incremental:
+        # Nightly refresh: every ticker is due, but only for its missing tail
+        marks = load_high_water_marks(conn, tickers)
+        start_dates = plan_incremental(tickers, marks, start_date, end_date, overlap_days)
+        pending_tickers = list(start_dates)
+        resumed = set(marks)
+        stats = {
+            "total_tickers": len(tickers),
+            "completed": len(tickers) - len(pending_tickers),  # already up to date
+            "failed": 0,
+            "total_records": 0,
+        }
+        logger.info(
+            f"Incremental backfill: {len(marks)} tickers with data, "
+            f"{len(pending_tickers)} need new rows"
+        )
+    elif resume:
+        # Filter out already completed tickers (set lookup) and resume
+        # partially fetched ones after their last committed segment
+        start_dates = {
+            t: checkpoint.resume_start(t, start_date, end_date)
+            for t in checkpoint.pending(tickers)
+        }
+        pending_tickers = [t for t, s in start_dates.items() if s < end_date]
+        resumed = {t for t, s in start_dates.items() if s > start_date}
+        stats = {
+            "total_tickers": len(tickers),
+            "completed": len(tickers) - len(pending_tickers),
+            "failed": 0,
+            "total_records": 0,
+        }
+    else:
+        pending_tickers = list(tickers)
+        stats = {
+            "total_tickers": len(tickers),
+            "completed": 0,
+            "failed": 0,
+            "total_records": 0,
+        }
+    logger.info(f"Starting backfill: {len(pending_tickers)} tickers pending")
 
-            # Fetch data
-            data = fetch_ohlcv_data(ticker, start_date, end_date)
+    # Compressed historical chunks are decompressed on first write and
+    # recompressed once the backfill ends (compression policy paused meanwhile)
+    session = get_session(get_engine(DB_URL))
+    compression = CompressionManager(session)
+
+    engine = BackfillEngine(
+        YFinanceSource(yf),
+        CopyWriter(conn, compression),
+        limiter=TokenBucket(requests_per_second, burst),
+        workers=workers,
+        max_retries=MAX_RETRIES,
+        batch_rows=WRITE_BATCH_ROWS,
+        segment_days=SEGMENT_DAYS,
+    )
 
-            if data is None:
-                checkpoint.mark_failed(ticker, "No data returned")
-                stats["failed"] += 1
-            else:
-                # Insert data
-                inserted = insert_ohlcv_data(conn, data)
-                stats["total_records"] += inserted
-                checkpoint.mark_completed(ticker)
-                stats["completed"] += 1
-                logger.info(f"✅ {ticker}: {inserted} records inserted")
+    def on_completed(ticker: str, records: int) -> None:
+        checkpoint.mark_completed(ticker)
+        stats["completed"] += 1
+        stats["total_records"] += records
+        logger.info(
+            f"✅ {ticker}: {records} records "
+            f"({stats['completed']}/{stats['total_tickers']} total)"
+        )
 
-            # Rate limiting
-            time.sleep(RATE_LIMIT_DELAY)
+    def on_failed(ticker: str, error: str) -> None:
+        checkpoint.mark_failed(ticker, error)
+        stats["failed"] += 1
 
-            # Checkpoint every batch
-            if i % BATCH_SIZE == 0:
-                logger.info(f"Checkpoint: {stats['completed']}/{stats['total_tickers']} completed")
+    try:
+        with compression.backfill():
+            engine.run(
+                pending_tickers,
+                start_date,
+                end_date,
+                on_completed=on_completed,
+                on_failed=on_failed,
+                start_dates=start_dates,
+                on_range_done=checkpoint.mark_range_done,
+                resumed=resumed,
+            )
 
     except KeyboardInterrupt:
         logger.warning("Backfill interrupted by user. Progress saved to checkpoint.")
@@ -321,10 +341,54 @@ def run_backfill(
         raise
     finally:
         conn.close()
+        session.close()
+        checkpoint.close()
 
     return stats
 
 
+def run_file_backfill(
+    input_path: str,
+    resume: bool = True,
+    workers: int = FILE_WORKERS,
+    chunk_rows: int = FILE_CHUNK_ROWS,
+) -> dict:
+    """Load OHLCV rows from local CSV / Parquet files.
+
+    Args:
+        input_path: File or directory of vendor files
+        resume: Skip files already loaded according to the checkpoint
+        workers: Files loaded concurrently
+        chunk_rows: Rows read per chunk
+
+    Returns:
+        Summary statistics
+    """
+    # Loaded files are tracked by path in the checkpoint's completed set
+    checkpoint = CheckpointStore(FILE_CHECKPOINT_FILE)
+    skip = checkpoint.completed_tickers() if resume else set()
+
+    def on_file_done(path: str, records: int) -> None:
+        checkpoint.mark_completed(path)
+        logger.info(f"✅ {path}: {records} records")
+
+    session = get_session(get_engine(DB_URL))
+    try:
+        with CompressionManager(session).backfill() as compression:
+            return load_files(
+                FileSource(input_path, chunk_rows=chunk_rows),
+                lambda: psycopg2.connect(**DB_CONFIG),
+                workers=workers,
+                skip=skip,
+                on_file_done=on_file_done,
+                on_file_failed=checkpoint.mark_failed,
+                compression=compression,
+            )
+    finally:
+        session.close()
+        checkpoint.close()
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Backfill historical OHLCV data")
@@ -350,9 +414,68 @@ def main():
         action="store_true",
         help="Start fresh (ignore checkpoint)",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch rows after each ticker's latest stored date (nightly refresh)",
+    )
+    parser.add_argument(
+        "--overlap-days",
+        type=int,
+        default=DEFAULT_OVERLAP_DAYS,
+        help=f"Days re-fetched before the latest stored date. Default: {DEFAULT_OVERLAP_DAYS}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help=f"Concurrent fetch workers (files with --input). "
+        f"Default: {FETCH_WORKERS} ({FILE_WORKERS} with --input)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=REQUESTS_PER_SECOND,
+        help=f"Provider requests per second (shared). Default: {REQUESTS_PER_SECOND}",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=RATE_LIMIT_BURST,
+        help=f"Requests allowed back-to-back. Default: {RATE_LIMIT_BURST}",
+    )
+
+    parser.add_argument(
+        "--input",
+        type=str,
+        help="Load CSV / Parquet files from this file or directory instead of yfinance",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=FILE_CHUNK_ROWS,
+        help=f"Rows per chunk when loading files. Default: {FILE_CHUNK_ROWS}",
+    )
 
     args = parser.parse_args()
 
+    if args.input:
+        logger.info(f"Starting file backfill from {args.input}")
+        stats = run_file_backfill(
+            args.input,
+            resume=not args.no_resume,
+            workers=args.workers or FILE_WORKERS,
+            chunk_rows=args.chunk_rows,
+        )
+        logger.info("=" * 60)
+        logger.info("FILE BACKFILL SUMMARY")
+        logger.info("=" * 60)
+        logger.info(f"Total files: {stats['total_files']}")
+        logger.info(f"Loaded: {stats['loaded']}")
+        logger.info(f"Failed: {stats['failed']}")
+        logger.info(f"Total records: {stats['total_records']}")
+        logger.info(f"Rejected rows: {stats['rejected']}")
+        return
+
     # Load tickers
     if args.tickers_file:
         tickers = load_tickers_from_file(args.tickers_file)
@@ -366,6 +489,11 @@ def main():
         start_date=args.start_date,
         end_date=args.end_date,
         resume=not args.no_resume,
+        workers=args.workers or FETCH_WORKERS,
+        requests_per_second=args.rate,
+        burst=args.burst,
+        incremental=args.incremental,
+        overlap_days=args.overlap_days,
     )
 
     # Print summary
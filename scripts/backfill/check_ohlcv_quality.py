@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Data-quality report for quotes.ohlcv_daily across all tickers.
+
+Runs one set-based query per chunk of tickers (chunks in parallel) and prints
+only tickers with anomalies as JSON. Exits with status 1 if any are found.
+
+Usage:
+    python scripts/backfill/check_ohlcv_quality.py [--start-date 2017-01-01] [--tickers-file tickers.txt]
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.connection import get_engine
+from opa_quotes_storage.quality import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_MISSING_SESSIONS,
+    is_anomaly,
+    quality_report,
+)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Check ohlcv_daily data quality")
+    parser.add_argument(
+        "--tickers-file",
+        type=str,
+        help="Path to file with ticker symbols (one per line). Default: all stored tickers",
+    )
+    parser.add_argument("--start-date", type=date.fromisoformat, help="First date checked")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Last date checked")
+    parser.add_argument(
+        "--max-missing-sessions",
+        type=int,
+        default=DEFAULT_MAX_MISSING_SESSIONS,
+        help=f"Missing sessions tolerated between bars. Default: {DEFAULT_MAX_MISSING_SESSIONS}",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Tickers per query. Default: {DEFAULT_CHUNK_SIZE}",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Parallel queries. Default: 4")
+    parser.add_argument(
+        "--all", action="store_true", help="Report every ticker, not only anomalies"
+    )
+
+    args = parser.parse_args()
+
+    tickers = None
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers = [line.strip().upper() for line in f if line.strip()]
+
+    report = quality_report(
+        get_engine(),
+        tickers,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        max_missing_sessions=args.max_missing_sessions,
+        anomalies_only=not args.all,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+
+    print(json.dumps(report, indent=2, default=str))
+    sys.exit(1 if any(is_anomaly(entry) for entry in report) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Roll closed trading days from quotes.real_time into quotes.ohlcv_daily.
+
+Run after the session close (e.g. nightly cron). Only days after the stored
+watermark are processed; tickers covered by the streamer then no longer need
+a daily yfinance backfill.
+
+Usage:
+    python scripts/backfill/rollup_ohlcv_daily.py [--since 2024-01-02]
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.connection import get_session
+from opa_quotes_storage.rollup import DailyRollup
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Roll up real_time quotes into daily bars")
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="Re-roll from this day instead of the watermark (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--batch-days",
+        type=int,
+        help="Days per transaction. Default: real_time chunk interval",
+    )
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        stats = DailyRollup(session, batch_days=args.batch_days).run(start_date=args.since)
+    finally:
+        session.close()
+
+    logger.info(
+        f"Rolled up {stats['days']} days, {stats['bars']} bars (watermark {stats['watermark']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
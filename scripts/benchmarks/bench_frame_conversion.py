@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark DataFrame-to-rows conversion used by the yfinance backfill source.
+
+Compares the previous per-row ``iterrows`` loop with the column-wise
+conversion in ``YFinanceSource.fetch`` on synthetic yfinance-shaped frames.
+
+Usage:
+    python scripts/benchmarks/bench_frame_conversion.py [--rows 1750] [--tickers 500]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.backfill import YFinanceSource
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Synthetic daily history indexed by exchange-local midnight timestamps."""
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    return pd.DataFrame(
+        {
+            "Open": close + rng.random(rows),
+            "High": close + 2,
+            "Low": close - 2,
+            "Close": close,
+            "Volume": rng.integers(1_000, 10_000_000, rows),
+        },
+        index=pd.date_range("2017-01-02", periods=rows, freq="B", tz="America/New_York"),
+    )
+
+
+def iterrows_rows(ticker: str, df: pd.DataFrame) -> list[tuple]:
+    """Previous implementation: one tuple per iterrows() row."""
+    data = []
+    for date, row in df.iterrows():
+        data.append(
+            (
+                ticker,
+                date.date(),
+                float(row["Open"]),
+                float(row["High"]),
+                float(row["Low"]),
+                float(row["Close"]),
+                float(row["Close"]),
+                int(row["Volume"]),
+            )
+        )
+    return data
+
+
+def timed(fn, repeat: int) -> float:
+    """Best wall time of repeat runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark frame-to-rows conversion")
+    parser.add_argument("--rows", type=int, default=1750, help="Rows per ticker. Default: 1750")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers. Default: 500")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method. Default: 3")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    client = Mock()
+    client.Ticker.return_value.history.return_value = df
+    source = YFinanceSource(client)
+
+    assert source.fetch("AAPL", "", "") == iterrows_rows("AAPL", df)
+
+    old = timed(lambda: [iterrows_rows("AAPL", df) for _ in range(args.tickers)], args.repeat)
+    new = timed(lambda: [source.fetch("AAPL", "", "") for _ in range(args.tickers)], args.repeat)
+
+    total = args.rows * args.tickers
+    print(f"{args.tickers} tickers x {args.rows} rows = {total:,} rows")
+    print(f"iterrows:    {old:8.3f}s  ({total / old:12,.0f} rows/s)")
+    print(f"column-wise: {new:8.3f}s  ({total / new:12,.0f} rows/s)")
+    print(f"speedup:     {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
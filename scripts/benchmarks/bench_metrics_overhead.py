@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the per-call overhead of repository instrumentation.
+
+Times a trivial read with and without the ``instrument`` decorator and the
+bulk_insert metric calls, and reports the difference per call.
+
+Usage:
+    python scripts/benchmarks/bench_metrics_overhead.py [--calls 200000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage import metrics
+from opa_quotes_storage.metrics import instrument
+
+ROWS = list(range(100))
+
+
+def plain_read() -> list[int]:
+    """Uninstrumented read returning a fixed result."""
+    return ROWS
+
+
+instrumented_read = instrument("bench_read")(plain_read)
+
+
+def insert_metrics() -> None:
+    """Metric calls made by one bulk_insert (validation, DB time, rows)."""
+    start = time.perf_counter()
+    validated_at = time.perf_counter()
+    metrics.INSERT_VALIDATION_SECONDS.observe(validated_at - start)
+    metrics.INSERT_DB_SECONDS.observe(time.perf_counter() - validated_at)
+    metrics.INSERT_ROWS.observe(len(ROWS))
+
+
+def timed(fn, calls: int, repeat: int) -> float:
+    """Best time per call over repeat runs, in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e6
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark metrics overhead")
+    parser.add_argument("--calls", type=int, default=200_000, help="Calls per run. Default: 200000")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method. Default: 5")
+    args = parser.parse_args()
+
+    base = timed(plain_read, args.calls, args.repeat)
+    read = timed(instrumented_read, args.calls, args.repeat)
+    insert = timed(insert_metrics, args.calls, args.repeat)
+
+    print(f"plain call:          {base:6.2f} us")
+    print(f"instrumented read:   {read:6.2f} us  (+{read - base:.2f} us)")
+    print(f"bulk_insert metrics: {insert:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark full-history ohlcv_daily scans before and after compression.
+
+Decompresses every chunk of quotes.ohlcv_daily, times full-history reads of
+sample tickers, compresses the chunks the policy would compress and times
+the same reads again. Runs against the configured database and leaves the
+table compressed as the policy would.
+
+Usage:
+    python scripts/benchmarks/bench_ohlcv_compression.py [--tickers 50] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.compression import CompressionManager
+from opa_quotes_storage.connection import get_session
+from opa_quotes_storage.ohlcv_repository import OhlcvDailyRepository
+
+
+def timed(fn, repeat: int) -> float:
+    """Best wall time of repeat runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(session, tickers: list[str], repeat: int) -> dict:
+    """Table size and scan timings in the current compression state."""
+    repo = OhlcvDailyRepository(session)
+    start, end = date(1970, 1, 1), date.today()
+    session.execute(text("ANALYZE quotes.ohlcv_daily"))
+    return {
+        "bytes": session.execute(text("SELECT hypertable_size('quotes.ohlcv_daily')")).scalar(),
+        "per_ticker": timed(lambda: [repo.get_bars(t, start, end) for t in tickers], repeat),
+        "all_tickers": timed(lambda: repo.get_bars(tickers, start, end), repeat),
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark ohlcv_daily compression")
+    parser.add_argument("--tickers", type=int, default=50, help="Sample tickers. Default: 50")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scan. Default: 3")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=30,
+        help="Compress chunks ending at least this many days ago. Default: 30 (policy)",
+    )
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        tickers = list(
+            session.execute(
+                text(
+                    "SELECT ticker FROM (SELECT DISTINCT ticker FROM quotes.ohlcv_daily) t "
+                    "ORDER BY random() LIMIT :n"
+                ),
+                {"n": args.tickers},
+            ).scalars()
+        )
+        manager = CompressionManager(session)
+
+        manager.decompress_range()
+        before = measure(session, tickers, args.repeat)
+        compressed = manager.compress_range(older_than=timedelta(days=args.older_than_days))
+        after = measure(session, tickers, args.repeat)
+    finally:
+        session.close()
+
+    print(f"{len(tickers)} tickers, full history, {len(compressed)} chunks compressed")
+    print(f"{'':14}{'rowstore':>12}{'compressed':>12}{'ratio':>8}")
+    print(
+        f"{'size (MiB)':14}{before['bytes'] / 1024**2:12.1f}{after['bytes'] / 1024**2:12.1f}"
+        f"{before['bytes'] / after['bytes']:8.1f}x"
+    )
+    for key, label in (("per_ticker", "per ticker (s)"), ("all_tickers", "one query (s)")):
+        print(f"{label:14}{before[key]:12.3f}{after[key]:12.3f}{before[key] / after[key]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
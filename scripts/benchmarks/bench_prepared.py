@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Per-call latency of hot repository reads with and without prepared statements.
+
+Runs get_latest_quote and a multi-day get_quotes repeatedly on one pooled
+connection, once with server-side prepared statements and once with plain
+SQL, and reports the mean time per call. Point it at a database holding
+several chunks of quotes for the symbol (e.g. the plan test dataset).
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/benchmarks/bench_prepared.py \\
+        --symbol PLN05 --start 2020-01-14 --end 2020-02-03 [--calls 2000]
+"""
+
+import argparse
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.connection import get_session
+from opa_quotes_storage.repository import QuoteRepository
+
+
+def timed(call, calls: int) -> float:
+    """Mean time per call in milliseconds, after one untimed call."""
+    call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls * 1000
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark prepared statements")
+    parser.add_argument("--symbol", default="AAPL", help="Symbol queried. Default: AAPL")
+    parser.add_argument("--start", required=True, help="Range start (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="Range end (YYYY-MM-DD)")
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per method. Default: 2000")
+    args = parser.parse_args()
+
+    start = datetime.fromisoformat(args.start).replace(tzinfo=UTC)
+    end = datetime.fromisoformat(args.end).replace(tzinfo=UTC)
+
+    for prepared in (False, True):
+        session = get_session()
+        try:
+            repo = QuoteRepository(session, prepared=prepared)
+            latest = timed(lambda: repo.get_latest_quote(args.symbol), args.calls)
+            quotes = timed(lambda: repo.get_quotes(args.symbol, start, end), args.calls)
+        finally:
+            session.close()
+        label = "prepared" if prepared else "plain   "
+        print(f"{label}: get_latest_quote {latest:7.3f} ms  get_quotes {quotes:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""First-request latency after a (simulated) deploy, with and without warm-up.
+
+Each round drops all pooled connections, as a restart does, then sends a
+burst of concurrent repository reads (one per pool slot). With warm-up the
+pool is opened and the hot statements are prepared before the burst. The
+first read of each worker and the burst's wall time are reported.
+
+Usage:
+    DATABASE_URL=postgresql://... python scripts/benchmarks/bench_warmup.py [--rounds 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.connection import dispose_all, get_engine, get_session
+from opa_quotes_storage.repository import QuoteRepository
+from opa_quotes_storage.warmup import Warmup
+
+
+def first_request(symbol: str) -> float:
+    """Latency of a worker's first latest-quote and one-hour reads, in ms."""
+    start = time.perf_counter()
+    session = get_session()
+    try:
+        repo = QuoteRepository(session)
+        now = datetime.now(UTC)
+        repo.get_latest_quote(symbol)
+        repo.get_quotes(symbol, now - timedelta(hours=1), now)
+    finally:
+        session.close()
+    return (time.perf_counter() - start) * 1000
+
+
+def burst(symbol: str, workers: int) -> tuple[list[float], float]:
+    """Concurrent first requests; returns per-worker latencies and wall time."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        latencies = list(pool.map(first_request, [symbol] * workers))
+    return latencies, (time.perf_counter() - start) * 1000
+
+
+def run(symbol: str, rounds: int, warm: bool) -> tuple[list[float], list[float], list[float]]:
+    """Latencies, burst wall times and warm-up times over fresh pools."""
+    latencies, walls, warmups = [], [], []
+    for _ in range(rounds):
+        dispose_all()
+        engine = get_engine()
+        workers = engine.pool.size()
+        if warm:
+            warmups.append(Warmup(engine).run().duration_ms)
+        round_latencies, wall = burst(symbol, workers)
+        latencies.extend(round_latencies)
+        walls.append(wall)
+    dispose_all()
+    return latencies, walls, warmups
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark first-request latency")
+    parser.add_argument("--symbol", default="AAPL", help="Symbol queried. Default: AAPL")
+    parser.add_argument("--rounds", type=int, default=5, help="Restarts per mode. Default: 5")
+    args = parser.parse_args()
+
+    for warm in (False, True):
+        latencies, walls, warmups = run(args.symbol, args.rounds, warm)
+        latencies.sort()
+        label = "warm" if warm else "cold"
+        print(
+            f"{label}: first request p50 {statistics.median(latencies):7.2f} ms  "
+            f"max {latencies[-1]:7.2f} ms  burst {statistics.median(walls):7.2f} ms"
+            + (f"  (warm-up {statistics.median(warmups):.0f} ms)" if warm else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Report hypertable storage and compression progress.
+
+Prints per-hypertable sizes, compression ratio against the 10:1 target,
+the backlog of chunks the compression policy is behind on, background job
+runs and projected disk growth. Exits with status 1 if a problem is found.
+
+Usage:
+    python scripts/monitoring/report_storage.py [--chunks] [--target-ratio 10]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from opa_quotes_storage.connection import get_session
+from opa_quotes_storage.storage import TARGET_COMPRESSION_RATIO, StorageMonitor
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report hypertable storage")
+    parser.add_argument("--chunks", action="store_true", help="Include per-chunk sizes")
+    parser.add_argument(
+        "--target-ratio",
+        type=float,
+        default=TARGET_COMPRESSION_RATIO,
+        help=f"Minimum compression ratio. Default: {TARGET_COMPRESSION_RATIO:g}",
+    )
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        reports = StorageMonitor(session).reports()
+    finally:
+        session.close()
+
+    output = {}
+    problems = []
+    for name, report in reports.items():
+        output[name] = report.summary()
+        if args.chunks:
+            output[name]["chunk_sizes"] = [
+                {
+                    "chunk": chunk.chunk,
+                    "range_start": chunk.range_start.isoformat() if chunk.range_start else None,
+                    "is_compressed": chunk.is_compressed,
+                    "uncompressed_bytes": chunk.uncompressed_bytes,
+                    "total_bytes": chunk.total_bytes,
+                }
+                for chunk in report.chunks
+            ]
+        problems.extend(report.problems(args.target_ratio))
+
+    print(json.dumps({"hypertables": output, "problems": problems}, indent=2))
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Recommend chunk intervals and compression settings for the hypertables.
+
+Measures row density, chunk counts, planning time and compression ratios and
+prints a recommendation per hypertable. ``--apply`` changes the chunk
+interval of new chunks; ``--write-migration`` writes an Alembic revision
+applying chunk interval and compression settings on top of the current head.
+
+Usage:
+    python scripts/setup/advise_hypertables.py [--hypertable quotes.ohlcv_daily] [--apply] [--write-migration]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import uuid
+from pathlib import Path
+
+# Add src to path for direct execution
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from opa_quotes_storage.advisor import HYPERTABLES, HypertableAdvisor, render_migration
+from opa_quotes_storage.connection import get_session
+
+ROOT = Path(__file__).parent.parent.parent
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def write_migration(recommendations, message: str) -> Path:
+    """Write a migration for the recommendations after the current head."""
+    scripts = ScriptDirectory.from_config(Config(str(ROOT / "alembic.ini")))
+    revision = uuid.uuid4().hex[:12]
+    source = render_migration(recommendations, revision, scripts.get_current_head(), message)
+    path = Path(scripts.versions) / f"{revision}_{message}.py"
+    path.write_text(source)
+    return path
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Advise hypertable chunk and compression layout")
+    parser.add_argument(
+        "--hypertable",
+        action="append",
+        help=f"Qualified hypertable name (repeatable). Default: {', '.join(HYPERTABLES)}",
+    )
+    parser.add_argument(
+        "--target-chunk-mb",
+        type=int,
+        help="Target chunk size in MiB. Default: shared_buffers",
+    )
+    parser.add_argument(
+        "--apply", action="store_true", help="Apply chunk intervals with set_chunk_time_interval"
+    )
+    parser.add_argument("--write-migration", action="store_true", help="Write an Alembic migration")
+    parser.add_argument(
+        "--message", default="tune_hypertable_layout", help="Migration message (slug)"
+    )
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        advisor = HypertableAdvisor(
+            session,
+            target_chunk_bytes=args.target_chunk_mb * 1024**2 if args.target_chunk_mb else None,
+        )
+        recommendations = advisor.advise(args.hypertable or HYPERTABLES)
+
+        for rec in recommendations:
+            print(
+                json.dumps(
+                    {
+                        "hypertable": rec.hypertable,
+                        "chunk_interval": str(rec.chunk_interval),
+                        "segmentby": rec.segmentby,
+                        "orderby": rec.orderby,
+                        "reasons": rec.reasons,
+                        "profile": rec.profile.model_dump(mode="json"),
+                    },
+                    indent=2,
+                )
+            )
+            if args.apply and advisor.apply(rec):
+                logger.info(f"Applied chunk interval {rec.chunk_interval} to {rec.hypertable}")
+    finally:
+        session.close()
+
+    if args.write_migration:
+        logger.info(f"Wrote {write_migration(recommendations, args.message)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,60 @@
-"""opa-quotes-storage - TimescaleDB storage for real-time market quotes."""
-
-from .connection import (
-    create_session_factory,
-    get_connection_string,
-    get_engine,
-    get_session,
-)
-from .health import HealthChecker
-from .models import Base, RealTimeQuote
-from .repository import QuoteRepository, QuoteSchema
+"""opa-quotes-storage - TimescaleDB storage for real-time market quotes.
+
+Public names are imported lazily on first access (PEP 562), so importing
+the package, e.g. for the health CLI, does not load SQLAlchemy or Pydantic.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
 __version__ = "0.1.0"
 
-__all__ = [
-    "Base",
-    "RealTimeQuote",
-    "get_connection_string",
-    "get_engine",
-    "get_session",
-    "create_session_factory",
-    "QuoteRepository",
-    "QuoteSchema",
-    "HealthChecker",
-]
+# Public name -> defining submodule
+_EXPORTS = {
+    "Base": ".models",
+    "RealTimeQuote": ".models",
+    "OhlcvDaily": ".models",
+    "RollupWatermark": ".models",
+    "CorporateAction": ".models",
+    "get_connection_string": ".config",
+    "get_engine": ".connection",
+    "get_session": ".connection",
+    "create_session_factory": ".connection",
+    "dispose_all": ".connection",
+    "QuoteRepository": ".repository",
+    "QuoteSchema": ".repository",
+    "OhlcvDailyRepository": ".ohlcv_repository",
+    "OhlcvDailySchema": ".ohlcv_repository",
+    "CorporateActionRepository": ".adjustments",
+    "HealthChecker": ".health",
+    "DailyRollup": ".rollup",
+    "CompressionManager": ".compression",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .adjustments import CorporateActionRepository
+    from .compression import CompressionManager
+    from .config import get_connection_string
+    from .connection import create_session_factory, dispose_all, get_engine, get_session
+    from .health import HealthChecker
+    from .models import Base, CorporateAction, OhlcvDaily, RealTimeQuote, RollupWatermark
+    from .ohlcv_repository import OhlcvDailyRepository, OhlcvDailySchema
+    from .repository import QuoteRepository, QuoteSchema
+    from .rollup import DailyRollup
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    """Module attributes including not yet imported public names."""
+    return sorted(set(globals()) | set(__all__))
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
-"""CLI for opa-quotes-storage health checks."""
+"""CLI for opa-quotes-storage health checks.
 
+Usage:
+    python -m opa_quotes_storage                  # one-shot health report
+    python -m opa_quotes_storage serve [--host H] [--port P] [--warmup]
+"""
+
+import argparse
 import json
 import sys
 
@@ -8,7 +14,27 @@ from .health import HealthChecker
 
 
 def main():  # pragma: no cover
-    """Run health checks and print results."""
+    """Run health checks and print results, or serve them over HTTP."""
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from .server import DEFAULT_HOST, DEFAULT_PORT, serve
+
+        parser = argparse.ArgumentParser(
+            prog="python -m opa_quotes_storage serve",
+            description="Serve /healthz, /readyz and /metrics",
+        )
+        parser.add_argument("--host", default=DEFAULT_HOST, help=f"Default: {DEFAULT_HOST}")
+        parser.add_argument(
+            "--port", type=int, default=DEFAULT_PORT, help=f"Default: {DEFAULT_PORT}"
+        )
+        parser.add_argument(
+            "--warmup",
+            action="store_true",
+            help="Warm the connection pool and hot statements before reporting ready",
+        )
+        args = parser.parse_args(sys.argv[2:])
+        serve(host=args.host, port=args.port, warmup=args.warmup)
+        return
+
     checker = HealthChecker()
     health = checker.check_all()
 
@@ -0,0 +1,256 @@
+"""Corporate-action adjustments computed on read from raw daily prices."""
+
+import datetime as dt
+from collections.abc import Iterable, MutableMapping
+from typing import Any, Optional
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .models import CorporateAction, OhlcvDaily
+from .ohlcv_repository import PRICE_BASIS_RAW, OhlcvDailyRepository
+
+# Price columns scaled by the price factor
+_PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+class FactorIndex:
+    """
+    Cumulative adjustment factors of one ticker.
+
+    Holds the sorted ex-dates and the suffix products of the per-action
+    factors, so the factor for any bar is one binary search: the product of
+    all actions with an ex-date after the bar's date.
+    """
+
+    def __init__(self, actions: Iterable[tuple[dt.date, str, float, float]]):
+        """
+        Build index from actions.
+
+        Args:
+            actions: (ex_date, action_type, value, factor) tuples in any order
+        """
+        actions = sorted(actions)
+        self.ex_dates = np.array([a[0] for a in actions], dtype="datetime64[D]")
+        price = np.array([a[3] for a in actions], dtype="float64")
+        # Splits also scale volume (by the share ratio); dividends do not
+        volume = np.array([a[2] if a[1] == "split" else 1.0 for a in actions], dtype="float64")
+        # suffix[i] = product of factors i..n-1; suffix[n] = 1 (no later actions)
+        self.price_suffix = np.append(np.cumprod(price[::-1])[::-1], 1.0)
+        self.volume_suffix = np.append(np.cumprod(volume[::-1])[::-1], 1.0)
+
+    def factors(self, dates: Iterable[dt.date]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Price and volume factors for bar dates.
+
+        Args:
+            dates: Bar dates
+
+        Returns:
+            Tuple (price factors, volume factors) aligned with dates
+        """
+        idx = np.searchsorted(self.ex_dates, np.array(list(dates), dtype="datetime64[D]"), "right")
+        return self.price_suffix[idx], self.volume_suffix[idx]
+
+
+class CorporateActionRepository:
+    """
+    Store corporate actions and serve split/dividend-adjusted daily bars.
+
+    ohlcv_daily keeps raw prices; adjusted series are computed on read with
+    vectorized factors, so a new action is a single-row write. Factor
+    indexes are cached per ticker and invalidated when that ticker's actions
+    change.
+    """
+
+    def __init__(self, session: Session, cache: Optional[MutableMapping[str, FactorIndex]] = None):
+        """
+        Initialize repository with database session.
+
+        Args:
+            session: SQLAlchemy session
+            cache: Factor index cache keyed by ticker (pass a shared mapping to
+                reuse factors across repository instances)
+        """
+        self.session = session
+        self.cache: MutableMapping[str, FactorIndex] = {} if cache is None else cache
+
+    def add_split(self, ticker: str, ex_date: dt.date, ratio: float) -> None:
+        """
+        Record a split (e.g. ratio=4.0 for a 4-for-1 split).
+
+        Args:
+            ticker: Ticker symbol
+            ex_date: First trading date on the new share basis
+            ratio: New shares per old share
+
+        Raises:
+            ValueError: If ratio is not positive
+        """
+        if ratio <= 0:
+            raise ValueError("Split ratio must be positive")
+        self._upsert(ticker, ex_date, "split", ratio, 1.0 / ratio)
+
+    def add_dividend(
+        self,
+        ticker: str,
+        ex_date: dt.date,
+        amount: float,
+        prev_close: Optional[float] = None,
+    ) -> None:
+        """
+        Record a cash dividend.
+
+        Args:
+            ticker: Ticker symbol
+            ex_date: Ex-dividend date
+            amount: Cash amount per share
+            prev_close: Raw close before ex_date (read from ohlcv_daily if None)
+
+        Raises:
+            ValueError: If no previous close is available or amount >= prev_close
+        """
+        ticker = ticker.upper()
+        if prev_close is None:
+            prev_close = self.session.execute(
+                select(OhlcvDaily.close)
+                .where(OhlcvDaily.ticker == ticker, OhlcvDaily.date < ex_date)
+                .order_by(OhlcvDaily.date.desc())
+                .limit(1)
+            ).scalar_one_or_none()
+        if not prev_close:
+            raise ValueError(f"No close before {ex_date} for {ticker}")
+        if not 0 <= amount < prev_close:
+            raise ValueError(f"Dividend {amount} must be in [0, {prev_close})")
+        self._upsert(ticker, ex_date, "dividend", amount, 1.0 - amount / prev_close)
+
+    def _upsert(
+        self, ticker: str, ex_date: dt.date, action_type: str, value: float, factor: float
+    ) -> None:
+        """Write one action and invalidate the ticker's cached factors."""
+        ticker = ticker.upper()
+        stmt = pg_insert(CorporateAction).values(
+            ticker=ticker, ex_date=ex_date, action_type=action_type, value=value, factor=factor
+        )
+        self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["ticker", "ex_date", "action_type"],
+                set_={"value": value, "factor": factor},
+            )
+        )
+        self.session.commit()
+        self.cache.pop(ticker, None)
+
+    def get_actions(self, ticker: str) -> list[CorporateAction]:
+        """
+        Get actions of a ticker ordered by ex-date.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            List of CorporateAction rows
+        """
+        stmt = (
+            select(CorporateAction)
+            .where(CorporateAction.ticker == ticker.upper())
+            .order_by(CorporateAction.ex_date.asc())
+        )
+        return list(self.session.execute(stmt).scalars().all())
+
+    def factor_index(self, ticker: str) -> FactorIndex:
+        """
+        Cached cumulative factor index for ticker.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            FactorIndex (identity when the ticker has no actions)
+        """
+        ticker = ticker.upper()
+        index = self.cache.get(ticker)
+        if index is None:
+            rows = self.session.execute(
+                select(
+                    CorporateAction.ex_date,
+                    CorporateAction.action_type,
+                    CorporateAction.value,
+                    CorporateAction.factor,
+                ).where(CorporateAction.ticker == ticker)
+            )
+            index = self.cache[ticker] = FactorIndex(tuple(row) for row in rows)
+        return index
+
+    def adjust(self, ticker: str, bars: dict[str, list[Any]]) -> dict[str, list[Any]]:
+        """
+        Apply split/dividend adjustments to one ticker's columnar bars.
+
+        Args:
+            ticker: Ticker symbol
+            bars: Columnar bars as returned by OhlcvDailyRepository.get_bars
+                (date, open, high, low, close, volume lists)
+
+        Returns:
+            New columnar dict with adjusted prices, adj_close equal to the
+            adjusted close, and split-adjusted volume
+        """
+        price, volume = self.factor_index(ticker).factors(bars["date"])
+        adjusted = dict(bars)
+        for column in _PRICE_COLUMNS:
+            adjusted[column] = (np.asarray(bars[column], dtype="float64") * price).tolist()
+        adjusted["adj_close"] = adjusted["close"]
+        volumes = np.rint(np.asarray(bars["volume"], dtype="float64") * volume)
+        adjusted["volume"] = volumes.astype("int64").tolist()
+        return adjusted
+
+    def get_adjusted_bars(
+        self, tickers: str | list[str], start_date: dt.date, end_date: dt.date
+    ) -> dict[str, dict[str, list[Any]]]:
+        """
+        Retrieve split/dividend-adjusted daily bars.
+
+        Args:
+            tickers: Ticker symbol or list of symbols
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+
+        Returns:
+            Same columnar shape as OhlcvDailyRepository.get_bars
+
+        Raises:
+            ValueError: If bars in range are stored provider-adjusted (legacy
+                rows); adjusting them again would double-adjust
+
+        Example:
+            >>> bars = repo.get_adjusted_bars("AAPL", dt.date(2020, 1, 1), dt.date(2020, 12, 31))
+            >>> bars["AAPL"]["close"][0]  # scaled by the 2020-08-31 4:1 split
+            75.0875
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+        names = [t.upper() for t in tickers]
+        adjusted = (
+            self.session.execute(
+                select(OhlcvDaily.ticker)
+                .distinct()
+                .where(
+                    OhlcvDaily.ticker.in_(names),
+                    OhlcvDaily.date >= start_date,
+                    OhlcvDaily.date <= end_date,
+                    OhlcvDaily.price_basis != PRICE_BASIS_RAW,
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if adjusted:
+            raise ValueError(
+                f"Bars of {sorted(adjusted)} are stored provider-adjusted; "
+                "re-download them raw before reading adjusted bars"
+            )
+
+        raw = OhlcvDailyRepository(self.session).get_bars(names, start_date, end_date)
+        return {ticker: self.adjust(ticker, bars) for ticker, bars in raw.items()}
@@ -0,0 +1,620 @@
+"""Chunk-interval and compression advisor for the quotes hypertables."""
+
+import json
+import logging
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Hypertables managed by this repository
+HYPERTABLES = ("quotes.real_time", "quotes.ohlcv_daily")
+
+# Chunk intervals the advisor recommends (days); computed values are rounded
+# down to one of these so boundaries stay readable
+CHUNK_INTERVAL_DAYS = (1, 7, 14, 30, 90, 180, 365, 730, 1825, 3650)
+
+# A compressed batch holds up to 1000 rows; segments much smaller than that
+# per chunk compress poorly and make segmentby counterproductive
+DEFAULT_MIN_ROWS_PER_SEGMENT = 100
+
+# Fallback chunk size target when shared_buffers cannot be read
+DEFAULT_TARGET_CHUNK_BYTES = 256 * 1024**2
+
+# Column types eligible for segmentby
+_SEGMENTBY_TYPES = ("text", "character varying", "character")
+
+
+class HypertableProfile(BaseModel):
+    """
+    Measured layout of one hypertable.
+
+    Attributes:
+        hypertable: Qualified name ('schema.table')
+        time_column: Time dimension column
+        chunk_interval: Current chunk_time_interval
+        num_chunks: Number of chunks
+        compressed_chunks: Number of compressed chunks
+        span_days: Days covered by all chunks
+        total_bytes: Table size including indexes and TOAST
+        row_estimate: Approximate row count
+        compression_enabled: Whether compression is enabled
+        segmentby: Current compress_segmentby columns
+        orderby: Current compress_orderby entries (e.g. 'date DESC')
+        compress_after: Compression policy age (None without a policy)
+        before_compression_bytes: Size of compressed chunks before compression
+        after_compression_bytes: Size of compressed chunks after compression
+        distinct_values: Estimated distinct values per segmentby-eligible column
+        planning_ms: Planning time of a full-range query
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    hypertable: str
+    time_column: str
+    chunk_interval: timedelta
+    num_chunks: int = 0
+    compressed_chunks: int = 0
+    span_days: int = 0
+    total_bytes: int = 0
+    row_estimate: int = 0
+    compression_enabled: bool = False
+    segmentby: tuple[str, ...] = ()
+    orderby: tuple[str, ...] = ()
+    compress_after: Optional[timedelta] = None
+    before_compression_bytes: Optional[int] = None
+    after_compression_bytes: Optional[int] = None
+    distinct_values: dict[str, float] = {}
+    planning_ms: Optional[float] = None
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """Before/after size of compressed chunks (None if nothing is compressed)."""
+        if not self.before_compression_bytes or not self.after_compression_bytes:
+            return None
+        return self.before_compression_bytes / self.after_compression_bytes
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        """Table size as if no chunk were compressed."""
+        return (
+            self.total_bytes
+            + (self.before_compression_bytes or 0)
+            - (self.after_compression_bytes or 0)
+        )
+
+    @property
+    def bytes_per_day(self) -> float:
+        """Uncompressed bytes per day of data."""
+        return self.uncompressed_bytes / self.span_days if self.span_days else 0.0
+
+    @property
+    def rows_per_day(self) -> float:
+        """Rows per day of data."""
+        return self.row_estimate / self.span_days if self.span_days else 0.0
+
+
+class Recommendation(BaseModel):
+    """
+    Recommended layout of one hypertable.
+
+    Attributes:
+        profile: Measured profile the recommendation is based on
+        chunk_interval: Recommended chunk_time_interval
+        segmentby: Recommended compress_segmentby columns
+        orderby: Recommended compress_orderby entries
+        reasons: Human-readable justification, one entry per decision
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    profile: HypertableProfile
+    chunk_interval: timedelta
+    segmentby: tuple[str, ...]
+    orderby: tuple[str, ...]
+    reasons: tuple[str, ...] = ()
+
+    @property
+    def hypertable(self) -> str:
+        """Qualified hypertable name."""
+        return self.profile.hypertable
+
+    @property
+    def chunk_interval_changed(self) -> bool:
+        """Whether the chunk interval differs from the current one."""
+        return self.chunk_interval != self.profile.chunk_interval
+
+    @property
+    def compression_changed(self) -> bool:
+        """Whether compression settings differ from the current ones."""
+        return not self.profile.compression_enabled or (
+            (self.segmentby, self.orderby) != (self.profile.segmentby, self.profile.orderby)
+        )
+
+
+def recommend_chunk_days(bytes_per_day: float, target_bytes: int) -> Optional[int]:
+    """
+    Largest standard chunk interval whose chunks stay below target_bytes.
+
+    Args:
+        bytes_per_day: Uncompressed bytes written per day
+        target_bytes: Target chunk size (data plus indexes)
+
+    Returns:
+        Interval in days from CHUNK_INTERVAL_DAYS, or None without data
+    """
+    if bytes_per_day <= 0:
+        return None
+    fitting = [days for days in CHUNK_INTERVAL_DAYS if days * bytes_per_day <= target_bytes]
+    return fitting[-1] if fitting else CHUNK_INTERVAL_DAYS[0]
+
+
+def recommend_segmentby(
+    distinct_values: Mapping[str, float],
+    rows_per_chunk: float,
+    min_rows_per_segment: int = DEFAULT_MIN_ROWS_PER_SEGMENT,
+) -> tuple[str, ...]:
+    """
+    Pick the segmentby column.
+
+    The highest-cardinality column that still leaves at least
+    ``min_rows_per_segment`` rows per segment in a chunk is chosen: it gives
+    the most selective per-segment filtering while keeping batches full.
+
+    Args:
+        distinct_values: Estimated distinct values per candidate column
+        rows_per_chunk: Rows per chunk at the recommended interval
+        min_rows_per_segment: Minimum rows per segment per chunk
+
+    Returns:
+        Tuple with the chosen column, or empty if no column qualifies
+    """
+    candidates = sorted(distinct_values.items(), key=lambda item: item[1], reverse=True)
+    for column, distinct in candidates:
+        if distinct > 1 and rows_per_chunk / distinct >= min_rows_per_segment:
+            return (column,)
+    return ()
+
+
+def _interval_sql(interval: timedelta) -> str:
+    """Render a timedelta as a PostgreSQL interval literal."""
+    if interval.seconds or interval.microseconds:
+        return f"INTERVAL '{int(interval.total_seconds())} seconds'"
+    return f"INTERVAL '{interval.days} days'"
+
+
+def _compression_sql(hypertable: str, segmentby: Sequence[str], orderby: Sequence[str]) -> str:
+    """ALTER TABLE statement enabling compression with the given settings."""
+    options = ["timescaledb.compress"]
+    if segmentby:
+        options.append(f"timescaledb.compress_segmentby = '{', '.join(segmentby)}'")
+    if orderby:
+        options.append(f"timescaledb.compress_orderby = '{', '.join(orderby)}'")
+    return f"ALTER TABLE {hypertable} SET ({', '.join(options)})"
+
+
+def _layout_statements(
+    hypertable: str,
+    chunk_interval: Optional[timedelta],
+    compression: Optional[tuple[Sequence[str], Sequence[str]]],
+    compress_after: Optional[timedelta],
+) -> list[str]:
+    """Statements moving a hypertable to a chunk interval and compression settings."""
+    statements = []
+    if chunk_interval is not None:
+        statements.append(
+            f"SELECT set_chunk_time_interval('{hypertable}', {_interval_sql(chunk_interval)})"
+        )
+    if compression is not None:
+        # Settings cannot change while chunks are compressed with the old ones
+        statements.append(f"SELECT remove_compression_policy('{hypertable}', if_exists => TRUE)")
+        statements.append(
+            f"SELECT decompress_chunk(c, if_compressed => TRUE) FROM show_chunks('{hypertable}') c"
+        )
+        segmentby, orderby = compression
+        statements.append(
+            _compression_sql(hypertable, segmentby, orderby)
+            if segmentby or orderby
+            else f"ALTER TABLE {hypertable} SET (timescaledb.compress = FALSE)"
+        )
+        if compress_after is not None:
+            statements.append(
+                f"SELECT add_compression_policy('{hypertable}', "
+                f"{_interval_sql(compress_after)}, if_not_exists => TRUE)"
+            )
+    return statements
+
+
+class HypertableAdvisor:
+    """
+    Measure hypertable layouts and recommend chunk and compression settings.
+
+    Chunk intervals are sized so one chunk (data plus indexes) fits in the
+    memory target, by default shared_buffers (about 25% of RAM under the
+    usual tuning). Segmentby is chosen from text columns by estimated
+    cardinality; orderby keeps the time column first.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        target_chunk_bytes: Optional[int] = None,
+        min_rows_per_segment: int = DEFAULT_MIN_ROWS_PER_SEGMENT,
+    ):
+        """
+        Initialize advisor with database session.
+
+        Args:
+            session: SQLAlchemy session
+            target_chunk_bytes: Target chunk size (None for shared_buffers)
+            min_rows_per_segment: Minimum rows per segment per chunk
+        """
+        self.session = session
+        self.target_chunk_bytes = target_chunk_bytes
+        self.min_rows_per_segment = min_rows_per_segment
+
+    def _scalar(self, sql: str, **params: Any) -> Any:
+        """Execute a query returning one value."""
+        return self.session.execute(text(sql), params).scalar_one_or_none()
+
+    def target_bytes(self) -> int:
+        """
+        Chunk size target in bytes.
+
+        Returns:
+            target_chunk_bytes if set, else shared_buffers
+        """
+        if self.target_chunk_bytes:
+            return self.target_chunk_bytes
+        value = self._scalar("SELECT pg_size_bytes(current_setting('shared_buffers'))")
+        return int(value) if value else DEFAULT_TARGET_CHUNK_BYTES
+
+    def profile(self, hypertable: str) -> HypertableProfile:
+        """
+        Measure one hypertable from timescaledb_information and the statistics.
+
+        Args:
+            hypertable: Qualified name ('schema.table')
+
+        Returns:
+            HypertableProfile
+
+        Raises:
+            ValueError: If the table is not a hypertable
+        """
+        schema, table = hypertable.split(".", 1)
+        names = {"schema": schema, "table": table, "relation": hypertable}
+
+        dimension = self.session.execute(
+            text(
+                "SELECT column_name, time_interval FROM timescaledb_information.dimensions "
+                "WHERE hypertable_schema = :schema AND hypertable_name = :table "
+                "AND dimension_type = 'Time' ORDER BY dimension_number LIMIT 1"
+            ),
+            names,
+        ).one_or_none()
+        if dimension is None:
+            raise ValueError(f"{hypertable} is not a hypertable")
+        time_column, chunk_interval = dimension
+
+        num_chunks, compressed_chunks, first, last = self.session.execute(
+            text(
+                "SELECT count(*), count(*) FILTER (WHERE is_compressed), "
+                "min(range_start), max(range_end) FROM timescaledb_information.chunks "
+                "WHERE hypertable_schema = :schema AND hypertable_name = :table"
+            ),
+            names,
+        ).one()
+
+        compression_enabled = bool(
+            self._scalar(
+                "SELECT compression_enabled FROM timescaledb_information.hypertables "
+                "WHERE hypertable_schema = :schema AND hypertable_name = :table",
+                **names,
+            )
+        )
+
+        segmentby, orderby = self._compression_settings(names)
+        before = after = None
+        if compression_enabled and compressed_chunks:
+            before, after = self.session.execute(
+                text(
+                    "SELECT sum(before_compression_total_bytes), "
+                    "sum(after_compression_total_bytes) "
+                    "FROM hypertable_compression_stats(CAST(:relation AS regclass))"
+                ),
+                names,
+            ).one()
+
+        compress_after = self._scalar(
+            "SELECT CAST(config->>'compress_after' AS interval) FROM timescaledb_information.jobs "
+            "WHERE proc_name = 'policy_compression' "
+            "AND hypertable_schema = :schema AND hypertable_name = :table",
+            **names,
+        )
+
+        row_estimate = (
+            self._scalar("SELECT approximate_row_count(CAST(:relation AS regclass))", **names) or 0
+        )
+
+        return HypertableProfile(
+            hypertable=hypertable,
+            time_column=time_column,
+            chunk_interval=chunk_interval,
+            num_chunks=num_chunks or 0,
+            compressed_chunks=compressed_chunks or 0,
+            span_days=_span_days(first, last),
+            total_bytes=self._scalar("SELECT hypertable_size(CAST(:relation AS regclass))", **names)
+            or 0,
+            row_estimate=row_estimate,
+            compression_enabled=compression_enabled,
+            segmentby=segmentby,
+            orderby=orderby,
+            compress_after=compress_after,
+            before_compression_bytes=before,
+            after_compression_bytes=after,
+            distinct_values=self._distinct_values(names, time_column, row_estimate),
+            planning_ms=self.planning_ms(hypertable, time_column),
+        )
+
+    def _compression_settings(
+        self, names: Mapping[str, str]
+    ) -> tuple[tuple[str, ...], tuple[str, ...]]:
+        """Current segmentby columns and orderby entries."""
+        rows = self.session.execute(
+            text(
+                "SELECT attname, segmentby_column_index, orderby_column_index, orderby_asc "
+                "FROM timescaledb_information.compression_settings "
+                "WHERE hypertable_schema = :schema AND hypertable_name = :table"
+            ),
+            names,
+        ).all()
+        segmentby = tuple(r[0] for r in sorted((r for r in rows if r[1]), key=lambda r: r[1]))
+        orderby = tuple(
+            f"{r[0]} {'ASC' if r[3] else 'DESC'}"
+            for r in sorted((r for r in rows if r[2]), key=lambda r: r[2])
+        )
+        return segmentby, orderby
+
+    def _distinct_values(
+        self, names: Mapping[str, str], time_column: str, row_estimate: float
+    ) -> dict[str, float]:
+        """
+        Estimated distinct values of text columns from the hypertable's pg_stats.
+
+        Inherited statistics (sampled across all chunks) win over the root's
+        own, which cover no rows. Negative n_distinct is a fraction of the
+        row count, taken from approximate_row_count(): the root's reltuples
+        is 0 (-1 if never analyzed).
+        """
+        rows = self.session.execute(
+            text(
+                "SELECT DISTINCT ON (s.attname) s.attname, s.n_distinct "
+                "FROM pg_stats s "
+                "JOIN information_schema.columns col ON col.table_schema = :schema "
+                "AND col.table_name = :table AND col.column_name = s.attname "
+                "WHERE s.schemaname = :schema AND s.tablename = :table "
+                "AND col.data_type = ANY(:types) ORDER BY s.attname, s.inherited DESC"
+            ),
+            {**names, "types": list(_SEGMENTBY_TYPES)},
+        ).all()
+        return {
+            column: -float(distinct) * row_estimate if distinct < 0 else float(distinct)
+            for column, distinct in rows
+            if column != time_column
+        }
+
+    def planning_ms(self, hypertable: str, time_column: str) -> Optional[float]:
+        """
+        Planning time of a query touching every chunk.
+
+        Args:
+            hypertable: Qualified name
+            time_column: Time dimension column
+
+        Returns:
+            Planning time in milliseconds (None if EXPLAIN fails)
+        """
+        try:
+            plan = self._scalar(
+                f"EXPLAIN (SUMMARY TRUE, FORMAT JSON) SELECT count(*) FROM {hypertable} "
+                f"WHERE {time_column} IS NOT NULL"
+            )
+        except Exception as e:
+            self.session.rollback()
+            logger.warning(f"Could not measure planning time of {hypertable}: {e}")
+            return None
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0].get("Planning Time")
+
+    def recommend(self, profile: HypertableProfile) -> Recommendation:
+        """
+        Recommend chunk interval and compression settings.
+
+        Args:
+            profile: Measured profile
+
+        Returns:
+            Recommendation (current settings kept where data is insufficient)
+
+        Example:
+            >>> advisor = HypertableAdvisor(session)
+            >>> rec = advisor.recommend(advisor.profile("quotes.ohlcv_daily"))
+            >>> rec.chunk_interval, rec.segmentby
+            (datetime.timedelta(days=365), ('ticker',))
+        """
+        reasons = []
+        target = self.target_bytes()
+
+        days = recommend_chunk_days(profile.bytes_per_day, target)
+        if days is None:
+            chunk_interval = profile.chunk_interval
+            reasons.append("No data: chunk interval kept")
+        else:
+            chunk_interval = timedelta(days=days)
+            reasons.append(
+                f"{profile.bytes_per_day / 1024**2:.2f} MiB/day uncompressed, target "
+                f"{target / 1024**2:.0f} MiB per chunk -> {days} day(s) "
+                f"(currently {profile.num_chunks} chunks of {profile.chunk_interval}); "
+                "applies to new chunks only"
+            )
+
+        rows_per_chunk = profile.rows_per_day * chunk_interval.total_seconds() / 86400
+        if profile.distinct_values:
+            segmentby = recommend_segmentby(
+                profile.distinct_values, rows_per_chunk, self.min_rows_per_segment
+            )
+            reasons.append(
+                f"~{rows_per_chunk:,.0f} rows per chunk, distinct values "
+                f"{ {c: round(n) for c, n in profile.distinct_values.items()} } -> "
+                f"segmentby {', '.join(segmentby) or 'none'}"
+            )
+        else:
+            segmentby = profile.segmentby
+            reasons.append("No column statistics (run ANALYZE): segmentby kept")
+
+        # Keep an existing orderby led by the time column; otherwise newest first
+        if profile.orderby and profile.orderby[0].split()[0] == profile.time_column:
+            orderby = profile.orderby
+        else:
+            orderby = (f"{profile.time_column} DESC",)
+
+        if profile.compression_ratio:
+            reasons.append(
+                f"Compression ratio {profile.compression_ratio:.1f}x over "
+                f"{profile.compressed_chunks} chunk(s)"
+            )
+        if profile.planning_ms is not None:
+            reasons.append(f"Planning time {profile.planning_ms:.1f} ms over all chunks")
+
+        return Recommendation(
+            profile=profile,
+            chunk_interval=chunk_interval,
+            segmentby=segmentby,
+            orderby=orderby,
+            reasons=tuple(reasons),
+        )
+
+    def advise(self, hypertables: Sequence[str] = HYPERTABLES) -> list[Recommendation]:
+        """
+        Profile and recommend settings for several hypertables.
+
+        Args:
+            hypertables: Qualified names
+
+        Returns:
+            One Recommendation per hypertable
+        """
+        return [self.recommend(self.profile(hypertable)) for hypertable in hypertables]
+
+    def apply(self, recommendation: Recommendation) -> bool:
+        """
+        Apply the recommended chunk interval with set_chunk_time_interval.
+
+        Only chunks created afterwards use the new interval. Compression
+        settings are not changed here: they require decompressing chunks and
+        belong in a migration (see render_migration).
+
+        Args:
+            recommendation: Recommendation to apply
+
+        Returns:
+            True if the interval was changed
+        """
+        if not recommendation.chunk_interval_changed:
+            return False
+        self.session.execute(
+            text("SELECT set_chunk_time_interval(CAST(:relation AS regclass), :interval)"),
+            {"relation": recommendation.hypertable, "interval": recommendation.chunk_interval},
+        )
+        self.session.commit()
+        logger.info(
+            f"{recommendation.hypertable}: chunk_time_interval -> {recommendation.chunk_interval}"
+        )
+        return True
+
+
+def render_migration(
+    recommendations: Sequence[Recommendation],
+    revision: str,
+    down_revision: Optional[str],
+    message: str = "tune_hypertable_layout",
+    create_date: Optional[datetime] = None,
+) -> str:
+    """
+    Render an Alembic migration applying recommendations.
+
+    The downgrade restores the measured settings. Changing compression
+    settings decompresses the hypertable's chunks first; the compression
+    policy recompresses them afterwards.
+
+    Args:
+        recommendations: Recommendations to apply
+        revision: New revision id
+        down_revision: Current head revision
+        message: Migration message (slug)
+        create_date: Create Date header (default: now)
+
+    Returns:
+        Python source of the migration file
+    """
+    upgrade, downgrade = [], []
+    for rec in recommendations:
+        current = rec.profile
+        compression = (rec.segmentby, rec.orderby) if rec.compression_changed else None
+        interval = rec.chunk_interval if rec.chunk_interval_changed else None
+        upgrade += _layout_statements(rec.hypertable, interval, compression, current.compress_after)
+        downgrade += _layout_statements(
+            rec.hypertable,
+            current.chunk_interval if interval else None,
+            (current.segmentby, current.orderby) if compression else None,
+            current.compress_after,
+        )
+
+    def body(statements: list[str]) -> str:
+        if not statements:
+            return "    pass\n"
+        return "".join(f"    op.execute(\n        {stmt!r}\n    )\n" for stmt in statements)
+
+    summary = "\n".join(f"    {_describe(rec)}" for rec in recommendations)
+    return (
+        f'"""{message}\n\n'
+        f"Revision ID: {revision}\n"
+        f"Revises: {down_revision or ''}\n"
+        f"Create Date: {create_date or datetime.now()}\n\n"
+        '"""\n'
+        "from typing import Sequence, Union\n\n"
+        "from alembic import op\n\n\n"
+        "# revision identifiers, used by Alembic.\n"
+        f"revision: str = {revision!r}\n"
+        f"down_revision: Union[str, Sequence[str], None] = {down_revision!r}\n"
+        "branch_labels: Union[str, Sequence[str], None] = None\n"
+        "depends_on: Union[str, Sequence[str], None] = None\n\n\n"
+        "def upgrade() -> None:\n"
+        f'    """Apply hypertable layout recommendations.\n\n{summary}\n    """\n'
+        f"{body(upgrade)}\n\n"
+        "def downgrade() -> None:\n"
+        '    """Restore previous hypertable layout."""\n'
+        f"{body(downgrade)}"
+    )
+
+
+def _describe(rec: Recommendation) -> str:
+    """One-line summary of a recommendation for migration docstrings."""
+    return (
+        f"{rec.hypertable}: chunk_time_interval {rec.chunk_interval}, "
+        f"segmentby {', '.join(rec.segmentby) or 'none'}, orderby {', '.join(rec.orderby)}"
+    )
+
+
+def _span_days(first: Any, last: Any) -> int:
+    """Days between the first chunk start and the last chunk end."""
+    if first is None or last is None:
+        return 0
+    return max((last - first).days, 1)
@@ -0,0 +1,23 @@
+"""Backfill pipeline for historical OHLCV data."""
+
+from .checkpoint import CheckpointStore
+from .engine import BackfillEngine, CopyWriter
+from .files import FileSource, load_files, normalize_frame
+from .incremental import DEFAULT_OVERLAP_DAYS, load_high_water_marks, plan_incremental
+from .rate_limit import TokenBucket
+from .sources import DataSource, YFinanceSource
+
+__all__ = [
+    "DEFAULT_OVERLAP_DAYS",
+    "BackfillEngine",
+    "CheckpointStore",
+    "CopyWriter",
+    "DataSource",
+    "FileSource",
+    "TokenBucket",
+    "YFinanceSource",
+    "load_files",
+    "load_high_water_marks",
+    "normalize_frame",
+    "plan_incremental",
+]
@@ -0,0 +1,204 @@
+"""Crash-safe backfill checkpoint store backed by SQLite."""
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickers (
+    ticker TEXT PRIMARY KEY,
+    status TEXT NOT NULL CHECK (status IN ('completed', 'failed')),
+    error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ranges (
+    ticker TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (ticker, start_date)
+);
+"""
+
+
+class CheckpointStore:
+    """
+    Resumable backfill state with set semantics.
+
+    Every update is a single-row SQLite transaction (WAL journal), so marking
+    a ticker costs O(log n) regardless of universe size and a crash never
+    leaves a half-written state file. Besides per-ticker status, committed
+    (ticker, date-range) segments are recorded so partially fetched tickers
+    resume from the first missing date.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def _write(self, sql: str, params: Iterable = ()) -> None:
+        # Autocommit: each single-row statement is its own atomic transaction
+        with self._lock:
+            self._conn.execute(sql, tuple(params))
+
+    def mark_completed(self, ticker: str) -> None:
+        """Mark ticker as successfully completed (clears a previous failure)."""
+        self._write(
+            "INSERT OR REPLACE INTO tickers (ticker, status, error, updated_at) "
+            "VALUES (?, 'completed', NULL, ?)",
+            (ticker, datetime.now().isoformat()),
+        )
+
+    def mark_failed(self, ticker: str, error: str) -> None:
+        """Mark ticker as failed with error message (latest error wins)."""
+        self._write(
+            "INSERT OR REPLACE INTO tickers (ticker, status, error, updated_at) "
+            "VALUES (?, 'failed', ?, ?)",
+            (ticker, error, datetime.now().isoformat()),
+        )
+
+    def mark_range_done(self, ticker: str, start_date: str, end_date: str) -> None:
+        """
+        Record a committed [start_date, end_date) segment for ticker.
+
+        Args:
+            ticker: Ticker symbol
+            start_date: Segment start (YYYY-MM-DD, inclusive)
+            end_date: Segment end (YYYY-MM-DD, exclusive)
+        """
+        self._write(
+            "INSERT OR REPLACE INTO ranges (ticker, start_date, end_date, updated_at) "
+            "VALUES (?, ?, ?, ?)",
+            (ticker, start_date, end_date, datetime.now().isoformat()),
+        )
+
+    def completed_tickers(self) -> set[str]:
+        """Set of completed tickers."""
+        with self._lock:
+            rows = self._conn.execute("SELECT ticker FROM tickers WHERE status = 'completed'")
+            return {ticker for (ticker,) in rows}
+
+    def failed_tickers(self) -> dict[str, str]:
+        """Dict ticker -> last error for failed tickers."""
+        with self._lock:
+            rows = self._conn.execute("SELECT ticker, error FROM tickers WHERE status = 'failed'")
+            return dict(rows.fetchall())
+
+    def pending(self, tickers: Iterable[str]) -> list[str]:
+        """
+        Filter out completed tickers, preserving input order.
+
+        Args:
+            tickers: Candidate tickers
+
+        Returns:
+            Tickers not yet completed
+        """
+        completed = self.completed_tickers()
+        return [t for t in tickers if t not in completed]
+
+    def resume_start(self, ticker: str, start_date: str, end_date: str) -> str:
+        """
+        First date of [start_date, end_date) not covered by committed segments.
+
+        Only segments contiguous from start_date count, so a hole is never
+        skipped.
+
+        Args:
+            ticker: Ticker symbol
+            start_date: Requested start (YYYY-MM-DD)
+            end_date: Requested end (YYYY-MM-DD, exclusive)
+
+        Returns:
+            Date to resume fetching from (end_date if fully covered)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_date, end_date FROM ranges "
+                "WHERE ticker = ? AND end_date > ? AND start_date < ? ORDER BY start_date",
+                (ticker, start_date, end_date),
+            ).fetchall()
+
+        cursor = start_date
+        for seg_start, seg_end in rows:
+            if seg_start > cursor:
+                break
+            cursor = max(cursor, seg_end)
+        return min(cursor, end_date)
+
+    def load(self) -> dict:
+        """
+        Snapshot in the legacy JSON layout.
+
+        Returns:
+            Dict with completed_tickers, failed_tickers and last_updated
+        """
+        with self._lock:
+            last_updated = self._conn.execute("SELECT MAX(updated_at) FROM tickers").fetchone()[0]
+        return {
+            "completed_tickers": sorted(self.completed_tickers()),
+            "failed_tickers": [
+                {"ticker": ticker, "error": error}
+                for ticker, error in sorted(self.failed_tickers().items())
+            ],
+            "last_updated": last_updated,
+        }
+
+    def save(self, state: dict) -> None:
+        """
+        Replace ticker state with a legacy-layout snapshot.
+
+        Args:
+            state: Dict with completed_tickers and failed_tickers
+        """
+        now = datetime.now().isoformat()
+        rows = [(t, "completed", None, now) for t in state.get("completed_tickers", [])]
+        rows += [
+            (f["ticker"], "failed", f.get("error"), now) for f in state.get("failed_tickers", [])
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM tickers")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tickers (ticker, status, error, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def import_json(self, json_file: str | Path) -> bool:
+        """
+        Import a legacy JSON checkpoint if this store is still empty.
+
+        Args:
+            json_file: Path to the old rewrite-whole-file checkpoint
+
+        Returns:
+            True if state was imported
+        """
+        json_file = Path(json_file)
+        if not json_file.exists():
+            return False
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM tickers LIMIT 1").fetchone():
+                return False
+        with open(json_file) as f:
+            self.save(json.load(f))
+        return True
@@ -0,0 +1,392 @@
+"""Concurrent backfill engine: fetch workers, shared rate limiter, batching writer."""
+
+import logging
+import queue
+import random
+import threading
+import time
+from collections.abc import Callable, Collection, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Any, Optional
+
+from ..bulk import copy_upsert
+from ..compression import CompressionManager
+from ..models import OhlcvDaily
+from ..ohlcv_repository import EXTERNAL_CONSTANTS, OHLCV_COLUMNS
+from .rate_limit import TokenBucket
+from .sources import DataSource
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling the writer stage that all fetches are done
+_DONE = object()
+
+# Seconds between checks that the writer is still alive while the queue is full
+_PUT_POLL = 0.1
+
+
+class CopyWriter:
+    """Write OHLCV rows into quotes.ohlcv_daily with COPY, one transaction per call."""
+
+    def __init__(self, conn: Any, compression: Optional[CompressionManager] = None):
+        """
+        Initialize writer.
+
+        Args:
+            conn: psycopg2 connection (used only from the writer thread)
+            compression: Manager decompressing the chunks written to (None
+                when ohlcv_daily has no compressed chunks in range)
+        """
+        self.conn = conn
+        self.compression = compression
+
+    def __call__(self, rows: Sequence[tuple]) -> int:
+        """
+        Upsert rows and commit.
+
+        Args:
+            rows: Tuples in OHLCV_COLUMNS order, possibly from many tickers
+
+        Returns:
+            Number of rows inserted or updated
+        """
+        if self.compression is not None:
+            return self.compression.merge(rows, self._write)
+        return self._write(rows)
+
+    def _write(self, rows: Sequence[tuple]) -> int:
+        """Upsert rows in one transaction."""
+        try:
+            with self.conn.cursor() as cursor:
+                written = copy_upsert(
+                    cursor,
+                    OhlcvDaily.__table__,
+                    OHLCV_COLUMNS,
+                    rows,
+                    ("ticker", "date"),
+                    constants=EXTERNAL_CONSTANTS,
+                )
+            self.conn.commit()
+            return written
+        except Exception:
+            self.conn.rollback()
+            raise
+
+
+class BackfillEngine:
+    """
+    Run a backfill as a small pipeline.
+
+    A thread pool fetches tickers concurrently, sharing one token bucket so
+    the provider sees a bounded request rate. Fetch errors are retried with
+    exponential backoff and full jitter. A single writer thread batches rows
+    from many tickers into one transaction and reports tickers as completed
+    only after their rows are committed.
+    """
+
+    def __init__(
+        self,
+        source: DataSource,
+        writer: Callable[[Sequence[tuple]], int],
+        limiter: Optional[TokenBucket] = None,
+        workers: int = 8,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        batch_rows: int = 20_000,
+        flush_interval: float = 5.0,
+        segment_days: Optional[int] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize engine.
+
+        Args:
+            source: Data source used by fetch workers
+            writer: Callable that persists a batch of rows and returns the count
+            limiter: Shared rate limiter (None for no limit)
+            workers: Number of concurrent fetch workers
+            max_retries: Retries per ticker after the first failed attempt
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum backoff delay in seconds
+            batch_rows: Rows accumulated before the writer commits a batch
+            flush_interval: Seconds without new results before a partial batch is written
+            segment_days: Split each ticker's range into fetch segments of this
+                many days, committed and checkpointed independently (None
+                fetches the whole range in one request)
+            sleep: Sleep function (injectable for tests)
+            rng: Random generator for jitter (injectable for tests)
+        """
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+
+        self.source = source
+        self.writer = writer
+        self.limiter = limiter
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.segment_days = segment_days
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Delay before retry number ``attempt`` (0-based), with full jitter.
+
+        Args:
+            attempt: Number of failed attempts so far minus one
+
+        Returns:
+            Seconds to wait
+        """
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def segments(self, start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """
+        Split [start_date, end_date) into fetch segments of ``segment_days``.
+
+        Args:
+            start_date: Start date (YYYY-MM-DD, inclusive)
+            end_date: End date (YYYY-MM-DD, exclusive)
+
+        Returns:
+            List of (start, end) ISO date pairs covering the range in order
+        """
+        if self.segment_days is None:
+            return [(start_date, end_date)]
+
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        step = timedelta(days=self.segment_days)
+        bounds = []
+        while start < end:
+            bounds.append((start.isoformat(), min(start + step, end).isoformat()))
+            start += step
+        return bounds or [(start_date, end_date)]
+
+    def run(
+        self,
+        tickers: Sequence[str],
+        start_date: str,
+        end_date: str,
+        on_completed: Optional[Callable[[str, int], None]] = None,
+        on_failed: Optional[Callable[[str, str], None]] = None,
+        start_dates: Optional[Mapping[str, str]] = None,
+        on_range_done: Optional[Callable[[str, str, str], None]] = None,
+        resumed: Collection[str] = (),
+    ) -> dict[str, int]:
+        """
+        Backfill tickers concurrently.
+
+        Callbacks are invoked from the writer thread only, so non thread-safe
+        checkpoint stores can be used directly. A callback that raises fails
+        its ticker; if the writer thread itself dies, fetching stops and its
+        error is raised.
+
+        Args:
+            tickers: Ticker symbols to backfill
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            on_completed: Called with (ticker, records) once all its rows are committed
+            on_failed: Called with (ticker, error) when a ticker fails
+            start_dates: Per-ticker start dates overriding start_date
+                (used by incremental and resumed runs)
+            on_range_done: Called with (ticker, start, end) once a fetch
+                segment is committed, so interrupted tickers resume mid-range
+            resumed: Tickers with rows committed before this run; if their
+                remaining range returns no rows (delisted, only non-trading
+                days) they complete instead of failing with "No data returned"
+
+        Returns:
+            Stats dict with total_tickers, completed, failed, total_records
+
+        Raises:
+            RuntimeError: If the writer thread died
+        """
+        stats = {"total_tickers": len(tickers), "completed": 0, "failed": 0, "total_records": 0}
+        results: queue.Queue = queue.Queue(maxsize=self.workers * 2)
+        stopped = threading.Event()
+        writer_errors: list[BaseException] = []
+
+        def write_loop() -> None:
+            try:
+                self._write_loop(results, stats, on_completed, on_failed, on_range_done)
+            except BaseException as e:
+                logger.error(f"Backfill writer died: {e}")
+                writer_errors.append(e)
+                stopped.set()
+
+        writer_thread = threading.Thread(
+            target=write_loop,
+            name="backfill-writer",
+            daemon=True,
+        )
+        writer_thread.start()
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill-fetch")
+        try:
+            start_dates = start_dates or {}
+            futures = [
+                pool.submit(
+                    self._fetch_task,
+                    ticker,
+                    start_dates.get(ticker, start_date),
+                    end_date,
+                    results,
+                    stopped,
+                    ticker in resumed,
+                )
+                for ticker in tickers
+            ]
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            # On interrupt: drop queued tickers, let in-flight ones finish and flush
+            pool.shutdown(wait=True, cancel_futures=True)
+            _put(results, _DONE, stopped)
+            writer_thread.join()
+
+        if writer_errors:
+            raise RuntimeError(f"Backfill writer failed: {writer_errors[0]}") from writer_errors[0]
+        return stats
+
+    def _fetch_with_retry(
+        self, ticker: str, start_date: str, end_date: str
+    ) -> tuple[Optional[list[tuple]], Optional[str]]:
+        """Fetch one range, retrying transient errors. Returns (rows, error)."""
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                return self.source.fetch(ticker, start_date, end_date), None
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"{ticker}: giving up after {attempt + 1} attempts: {e}")
+                    return None, f"{type(e).__name__}: {e}"
+                delay = self.backoff(attempt)
+                logger.warning(f"{ticker}: fetch failed ({e}), retrying in {delay:.2f}s")
+                self._sleep(delay)
+        return None, "No attempts made"
+
+    def _fetch_task(
+        self,
+        ticker: str,
+        start_date: str,
+        end_date: str,
+        results: queue.Queue,
+        stopped: threading.Event,
+        resumed: bool = False,
+    ) -> None:
+        """Fetch one ticker segment by segment and hand each outcome to the writer."""
+        segments = self.segments(start_date, end_date)
+        found = resumed
+        for i, (seg_start, seg_end) in enumerate(segments):
+            if stopped.is_set():
+                return
+            last = i == len(segments) - 1
+            rows, error = self._fetch_with_retry(ticker, seg_start, seg_end)
+            found = found or bool(rows)
+            if error is None and last and not found:
+                error = "No data returned"
+            # (ticker, segment start, segment end, rows, error, last segment)
+            if not _put(results, (ticker, seg_start, seg_end, rows or [], error, last), stopped):
+                return
+            if error is not None:
+                return
+
+    def _write_loop(
+        self,
+        results: queue.Queue,
+        stats: dict[str, int],
+        on_completed: Optional[Callable[[str, int], None]],
+        on_failed: Optional[Callable[[str, str], None]],
+        on_range_done: Optional[Callable[[str, str, str], None]],
+    ) -> None:
+        """Consume fetch results and write them in multi-ticker batches."""
+        pending_rows: list[tuple] = []
+        pending: list[tuple[str, str, str, int, bool]] = []
+        records: dict[str, int] = {}
+        failed: set[str] = set()
+
+        def fail(ticker: str, error: str) -> None:
+            if ticker in failed:
+                return
+            failed.add(ticker)
+            records.pop(ticker, None)
+            stats["failed"] += 1
+            if on_failed is not None:
+                try:
+                    on_failed(ticker, error)
+                except Exception as e:
+                    logger.error(f"{ticker}: on_failed callback failed: {e}")
+
+        def flush() -> None:
+            if not pending:
+                return
+            try:
+                written = self.writer(pending_rows) if pending_rows else 0
+            except Exception as e:
+                logger.error(f"Write of {len(pending)} segments failed: {e}")
+                for ticker, *_ in pending:
+                    fail(ticker, f"Write failed: {e}")
+            else:
+                stats["total_records"] += written
+                for ticker, seg_start, seg_end, count, last in pending:
+                    try:
+                        # Committed segments count for resume even if a later one failed
+                        if on_range_done is not None:
+                            on_range_done(ticker, seg_start, seg_end)
+                        if ticker in failed:
+                            continue
+                        records[ticker] = records.get(ticker, 0) + count
+                        if last:
+                            if on_completed is not None:
+                                on_completed(ticker, records[ticker])
+                            records.pop(ticker)
+                            stats["completed"] += 1
+                    except Exception as e:
+                        logger.error(f"{ticker}: checkpoint callback failed: {e}")
+                        fail(ticker, f"Callback failed: {e}")
+                if written:
+                    logger.info(f"Committed {written} records for {len(pending)} segments")
+            pending_rows.clear()
+            pending.clear()
+
+        while True:
+            try:
+                item = results.get(timeout=self.flush_interval)
+            except queue.Empty:
+                flush()
+                continue
+
+            if item is _DONE:
+                flush()
+                return
+
+            ticker, seg_start, seg_end, rows, error, last = item
+            if ticker in failed:
+                continue
+            if error is not None:
+                fail(ticker, error)
+                continue
+
+            pending_rows.extend(rows)
+            pending.append((ticker, seg_start, seg_end, len(rows), last))
+            if len(pending_rows) >= self.batch_rows:
+                flush()
+
+
+def _put(results: queue.Queue, item: Any, stopped: threading.Event) -> bool:
+    """Put an item on the bounded queue unless the writer has died. Returns whether it was put."""
+    while not stopped.is_set():
+        try:
+            results.put(item, timeout=_PUT_POLL)
+            return True
+        except queue.Full:
+            continue
+    return False
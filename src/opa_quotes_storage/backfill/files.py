@@ -0,0 +1,210 @@
+"""Offline backfill from vendor file drops (CSV / Parquet directories)."""
+
+import logging
+import threading
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from ..bulk import frame_to_rows
+from ..compression import CompressionManager
+from ..ohlcv_repository import OHLCV_COLUMNS
+from .engine import CopyWriter
+
+logger = logging.getLogger(__name__)
+
+# File name patterns picked up when the source path is a directory
+FILE_PATTERNS = ("*.csv", "*.csv.gz", "*.parquet")
+
+# Vendor column names mapped to OHLCV_COLUMNS (matched case-insensitively)
+COLUMN_ALIASES = {
+    "symbol": "ticker",
+    "adj close": "adj_close",
+    "adjclose": "adj_close",
+    "adjusted_close": "adj_close",
+    "timestamp": "date",
+}
+
+_PRICE_COLUMNS = ("open", "high", "low", "close", "adj_close")
+
+
+def normalize_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Validate a vendor frame column-wise and reshape it to OHLCV_COLUMNS.
+
+    Applies the same rules as ``OhlcvDailySchema`` with vectorized
+    operations instead of one model per row: ticker stripped, uppercased and
+    1-10 chars, parseable date, non-negative prices and volume, adj_close
+    defaulting to close. Invalid rows are dropped and counted.
+
+    Args:
+        df: Raw frame with (aliases of) ticker, date, open, high, low, close,
+            volume and optionally adj_close
+
+    Returns:
+        Tuple (clean frame in OHLCV_COLUMNS order, number of rejected rows)
+
+    Raises:
+        ValueError: If required columns are missing
+    """
+    df = df.rename(
+        columns=lambda c: COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower())
+    )
+    missing = [c for c in OHLCV_COLUMNS if c != "adj_close" and c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {missing}")
+
+    out = pd.DataFrame(
+        {
+            "ticker": df["ticker"].astype("string").str.strip().str.upper(),
+            "date": pd.to_datetime(df["date"], errors="coerce"),
+        }
+    )
+    for column in _PRICE_COLUMNS:
+        if column in df.columns:
+            out[column] = pd.to_numeric(df[column], errors="coerce")
+    out["adj_close"] = out.get("adj_close", out["close"]).fillna(out["close"])
+    out["volume"] = pd.to_numeric(df["volume"], errors="coerce")
+
+    valid = (
+        out.notna().all(axis=1)
+        & out["ticker"].str.len().between(1, 10)
+        & (out[list(_PRICE_COLUMNS)] >= 0).all(axis=1)
+        & (out["volume"] >= 0)
+    )
+    clean = out[valid.fillna(False)][list(OHLCV_COLUMNS)]
+    clean = clean.assign(date=clean["date"].dt.date, volume=clean["volume"].astype("int64"))
+    return clean, int(len(out) - len(clean))
+
+
+class FileSource:
+    """
+    Daily bars from local CSV / Parquet files covering many symbols each.
+
+    Files are streamed in chunks (CSV) or record batches (Parquet) so memory
+    stays bounded regardless of file size.
+    """
+
+    def __init__(self, path: str | Path, chunk_rows: int = 100_000):
+        """
+        Initialize source.
+
+        Args:
+            path: A single file or a directory searched recursively for
+                FILE_PATTERNS
+            chunk_rows: Rows per chunk read from a file
+        """
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+
+    def files(self) -> list[Path]:
+        """
+        List input files in a stable order.
+
+        Returns:
+            Sorted file paths
+        """
+        if self.path.is_file():
+            return [self.path]
+        return sorted({f for pattern in FILE_PATTERNS for f in self.path.rglob(pattern)})
+
+    def iter_chunks(self, path: Path) -> Iterator[pd.DataFrame]:
+        """
+        Stream a file as raw DataFrame chunks.
+
+        Args:
+            path: CSV (optionally gzipped) or Parquet file
+
+        Yields:
+            Raw frames of at most chunk_rows rows
+        """
+        if path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunk_rows):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=self.chunk_rows)
+
+
+def load_files(
+    source: FileSource,
+    connect: Callable[[], Any],
+    workers: int = 4,
+    skip: Collection[str] = (),
+    on_file_done: Optional[Callable[[str, int], None]] = None,
+    on_file_failed: Optional[Callable[[str, str], None]] = None,
+    compression: Optional[CompressionManager] = None,
+) -> dict[str, int]:
+    """
+    COPY-load every file of a source, several files in parallel.
+
+    Each worker thread owns one database connection; every chunk is
+    upserted in its own transaction, and a file is reported done only after
+    all its chunks are committed. Callbacks may be called from any worker
+    thread.
+
+    Args:
+        source: File source to load
+        connect: Factory returning a new psycopg2 connection
+        workers: Files loaded concurrently
+        skip: File paths (as str) already loaded, e.g. from a checkpoint
+        on_file_done: Called with (path, rows written) after a file is loaded
+        on_file_failed: Called with (path, error) when a file fails
+        compression: Manager decompressing the chunks written to (shared by
+            all workers)
+
+    Returns:
+        Stats dict with total_files, loaded, failed, total_records, rejected
+    """
+    files = [f for f in source.files() if str(f) not in skip]
+    stats = {"total_files": len(files), "loaded": 0, "failed": 0, "total_records": 0, "rejected": 0}
+    lock = threading.Lock()
+    local = threading.local()
+    connections = []
+
+    def writer() -> CopyWriter:
+        if not hasattr(local, "writer"):
+            conn = connect()
+            with lock:
+                connections.append(conn)
+            local.writer = CopyWriter(conn, compression)
+        return local.writer
+
+    def load(path: Path) -> None:
+        written = rejected = 0
+        try:
+            for chunk in source.iter_chunks(path):
+                frame, dropped = normalize_frame(chunk)
+                rejected += dropped
+                if not frame.empty:
+                    written += writer()(frame_to_rows(frame, OHLCV_COLUMNS))
+        except Exception as e:
+            logger.error(f"{path}: load failed: {e}")
+            with lock:
+                stats["failed"] += 1
+            if on_file_failed is not None:
+                on_file_failed(str(path), f"{type(e).__name__}: {e}")
+            return
+
+        if rejected:
+            logger.warning(f"{path}: rejected {rejected} invalid rows")
+        with lock:
+            stats["loaded"] += 1
+            stats["total_records"] += written
+            stats["rejected"] += rejected
+        if on_file_done is not None:
+            on_file_done(str(path), written)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill-file") as pool:
+            for future in as_completed([pool.submit(load, f) for f in files]):
+                future.result()
+    finally:
+        for conn in connections:
+            conn.close()
+
+    return stats
@@ -0,0 +1,90 @@
+"""Incremental backfill planning from per-ticker high-water marks."""
+
+from collections.abc import Mapping, Sequence
+from datetime import date, timedelta
+from typing import Any
+
+from ..models import OhlcvDaily
+from ..ohlcv_repository import PRICE_BASIS_ADJUSTED
+
+# Days re-fetched before the high-water mark to pick up late provider revisions
+DEFAULT_OVERLAP_DAYS = 5
+
+
+def load_high_water_marks(conn: Any, tickers: Sequence[str]) -> dict[str, date]:
+    """
+    Load the latest stored date for every ticker in a single query.
+
+    Each ticker is resolved with index scans on (ticker, date) instead of
+    aggregating the whole table. Tickers whose oldest row is still stored
+    provider-adjusted are omitted, so incremental runs re-download their
+    whole range raw instead of appending raw rows to adjusted history.
+
+    Args:
+        conn: psycopg2 connection
+        tickers: Ticker symbols to look up
+
+    Returns:
+        Dict ticker -> latest date (tickers without rows are omitted)
+    """
+    if not tickers:
+        return {}
+
+    table = OhlcvDaily.__table__.fullname
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT t.ticker,
+                   (SELECT MAX(d.date) FROM {table} d WHERE d.ticker = t.ticker),
+                   (SELECT d.price_basis FROM {table} d WHERE d.ticker = t.ticker
+                    ORDER BY d.date LIMIT 1)
+            FROM unnest(%s::text[]) AS t(ticker)
+            """,
+            (list(tickers),),
+        )
+        return {
+            ticker: max_date
+            for ticker, max_date, basis in cursor.fetchall()
+            if max_date and basis != PRICE_BASIS_ADJUSTED
+        }
+
+
+def plan_incremental(
+    tickers: Sequence[str],
+    marks: Mapping[str, date],
+    start_date: str,
+    end_date: str,
+    overlap_days: int = DEFAULT_OVERLAP_DAYS,
+) -> dict[str, str]:
+    """
+    Compute the fetch start date for each ticker.
+
+    Tickers with stored data resume ``overlap_days`` before their
+    high-water mark; new tickers start at ``start_date``. Tickers that are
+    already up to date are left out.
+
+    Args:
+        tickers: Ticker symbols to refresh
+        marks: Latest stored date per ticker (see load_high_water_marks)
+        start_date: Start date for tickers without data (YYYY-MM-DD)
+        end_date: End date of the run (YYYY-MM-DD, exclusive)
+        overlap_days: Days re-fetched before the high-water mark
+
+    Returns:
+        Dict ticker -> start date (YYYY-MM-DD) for tickers needing a fetch
+    """
+    floor = date.fromisoformat(start_date)
+    end = date.fromisoformat(end_date)
+
+    plan = {}
+    for ticker in tickers:
+        mark = marks.get(ticker)
+        if mark is None:
+            start = floor
+        else:
+            start = max(floor, mark - timedelta(days=overlap_days))
+            if mark + timedelta(days=1) >= end:
+                continue
+        if start < end:
+            plan[ticker] = start.isoformat()
+    return plan
@@ -0,0 +1,84 @@
+"""Data sources for daily OHLCV backfills."""
+
+from itertools import repeat
+from typing import Any, Optional, Protocol
+
+
+class DataSource(Protocol):
+    """
+    Source of daily OHLCV rows for one ticker.
+
+    Implementations return rows as tuples in ``OHLCV_COLUMNS`` order
+    (ticker, date, open, high, low, close, adj_close, volume), ``None`` when
+    the ticker has no data, and raise on transient errors so the engine can
+    retry.
+    """
+
+    def fetch(self, ticker: str, start_date: str, end_date: str) -> Optional[list[tuple]]:
+        """Fetch rows for ticker between start_date and end_date (YYYY-MM-DD)."""
+        ...
+
+
+class YFinanceSource:
+    """Daily bars from Yahoo Finance via yfinance (one HTTP call per ticker)."""
+
+    def __init__(self, client: Any = None):
+        """
+        Initialize source.
+
+        Args:
+            client: yfinance module (or compatible object with ``Ticker``);
+                imported lazily when not provided
+        """
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        """yfinance module, imported on first use."""
+        if self._client is None:
+            import yfinance
+
+            self._client = yfinance
+        return self._client
+
+    def fetch(self, ticker: str, start_date: str, end_date: str) -> Optional[list[tuple]]:
+        """
+        Fetch daily bars for ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD, exclusive)
+
+        Returns:
+            List of tuples (ticker, date, open, high, low, close, adj_close, volume)
+            or None if no data was returned
+
+        Raises:
+            Exception: Network/provider errors are propagated for retry
+        """
+        # Raw (unadjusted) prices; splits and dividends are applied on read
+        # from quotes.corporate_actions
+        df = self.client.Ticker(ticker).history(start=start_date, end=end_date, auto_adjust=False)
+
+        if df.empty:
+            return None
+
+        # Column-wise conversion; DatetimeIndex.date yields exchange-local
+        # dates for tz-aware indexes. adj_close keeps the provider's adjusted
+        # close for reference (close when not provided).
+        close = df["Close"].to_numpy(dtype="float64").tolist()
+        adj_close = df.get("Adj Close", df["Close"]).to_numpy(dtype="float64").tolist()
+        return list(
+            zip(
+                repeat(ticker, len(df)),
+                df.index.date.tolist(),
+                df["Open"].to_numpy(dtype="float64").tolist(),
+                df["High"].to_numpy(dtype="float64").tolist(),
+                df["Low"].to_numpy(dtype="float64").tolist(),
+                close,
+                adj_close,
+                df["Volume"].to_numpy(dtype="int64").tolist(),
+                strict=True,
+            )
+        )
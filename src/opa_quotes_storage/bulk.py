@@ -0,0 +1,151 @@
+"""Shared write-path helpers: batch validation and COPY-based upserts."""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import Table
+
+
+def validate_records(schema: type[BaseModel], records: Iterable[dict[str, Any]]) -> list[dict]:
+    """
+    Validate raw records with a Pydantic schema.
+
+    Args:
+        schema: Pydantic model class used for validation
+        records: Raw dicts to validate
+
+    Returns:
+        List of validated and normalized dicts
+
+    Raises:
+        ValidationError: If any record is invalid
+    """
+    return [schema(**record).model_dump() for record in records]
+
+
+def iter_batches(rows: Sequence[Any], batch_size: int | None) -> Iterator[Sequence[Any]]:
+    """
+    Split rows into consecutive batches.
+
+    Args:
+        rows: Rows to split
+        batch_size: Rows per batch (None or <= 0 for a single batch)
+
+    Yields:
+        Slices of rows
+    """
+    if batch_size is None or batch_size <= 0:
+        batch_size = max(len(rows), 1)
+
+    for i in range(0, len(rows), batch_size):
+        yield rows[i : i + batch_size]
+
+
+def frame_to_rows(frame: Any, columns: Sequence[str]) -> list[tuple]:
+    """
+    Convert a DataFrame to row tuples column-wise.
+
+    Each column is converted to native Python values in one ``tolist`` call
+    and the columns are zipped into tuples, avoiding per-row pandas access
+    (``iterrows``/``itertuples``) and per-value casts.
+
+    Args:
+        frame: pandas DataFrame (or mapping of column name to Series)
+        columns: Column names in output order
+
+    Returns:
+        List of tuples in column order
+    """
+    return list(zip(*(frame[c].tolist() for c in columns), strict=True))
+
+
+def encode_csv(rows: Iterable[Sequence[Any]]) -> io.StringIO:
+    """
+    Encode rows as CSV for ``COPY ... FROM STDIN WITH (FORMAT csv)``.
+
+    None is written as an empty unquoted field, which COPY reads as NULL.
+
+    Args:
+        rows: Tuples in target column order
+
+    Returns:
+        Buffer positioned at the start
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+def copy_upsert(
+    cursor: Any,
+    table: Table,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    key_columns: Sequence[str],
+    deduplicate: bool = True,
+    skip_unchanged: bool = True,
+    constants: Mapping[str, Any] | None = None,
+) -> int:
+    """
+    Upsert rows through a temporary staging table loaded with COPY.
+
+    Rows are streamed into a transaction-scoped temp table with COPY and
+    merged with a single ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``.
+    The caller owns the transaction (commit/rollback).
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Target SQLAlchemy table
+        columns: Column names matching the order of values in rows
+        rows: Tuples to upsert
+        key_columns: Conflict target (primary key columns)
+        deduplicate: Keep only the last row per key. ON CONFLICT cannot
+            update the same row twice in one statement, so disable only
+            when keys are known to be unique.
+        skip_unchanged: Do not rewrite existing rows whose values are
+            identical, avoiding dead tuples and WAL on re-loads
+        constants: Extra column values applied to every inserted or
+            updated row (e.g. a provenance column), not sent through COPY
+
+    Returns:
+        Number of rows inserted or updated (unchanged rows are not counted
+        when skip_unchanged is set)
+    """
+    if deduplicate:
+        key_idx = [columns.index(k) for k in key_columns]
+        rows = {tuple(row[i] for i in key_idx): row for row in rows}.values()
+
+    constants = dict(constants or {})
+    stage = f"_stage_{table.name}"
+    column_list = ", ".join(columns)
+    insert_list = ", ".join([*columns, *constants])
+    select_list = ", ".join([*columns, *(["%s"] * len(constants))])
+    value_columns = [c for c in [*columns, *constants] if c not in key_columns]
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in value_columns)
+
+    cursor.execute(
+        f"CREATE TEMP TABLE IF NOT EXISTS {stage} "
+        f"(LIKE {table.fullname} INCLUDING DEFAULTS) ON COMMIT DROP"
+    )
+    cursor.execute(f"TRUNCATE {stage}")
+    cursor.copy_expert(
+        f"COPY {stage} ({column_list}) FROM STDIN WITH (FORMAT csv)", encode_csv(rows)
+    )
+
+    action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    if updates and skip_unchanged:
+        current = ", ".join(f"{table.name}.{c}" for c in value_columns)
+        incoming = ", ".join(f"EXCLUDED.{c}" for c in value_columns)
+        action += f" WHERE ({current}) IS DISTINCT FROM ({incoming})"
+    cursor.execute(
+        f"INSERT INTO {table.fullname} ({insert_list}) "
+        f"SELECT {select_list} FROM {stage} "
+        f"ON CONFLICT ({', '.join(key_columns)}) {action}",
+        tuple(constants.values()) or None,
+    )
+    return cursor.rowcount
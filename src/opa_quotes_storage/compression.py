@@ -0,0 +1,273 @@
+"""Compression management for quotes.ohlcv_daily during backfills."""
+
+import bisect
+import datetime as dt
+import logging
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Hypertable compressed by migration d9e3a6b7c410
+OHLCV_HYPERTABLE = "quotes.ohlcv_daily"
+
+
+class CompressionManager:
+    """
+    Keep writes working on a hypertable with compressed chunks.
+
+    Backfills upsert into historical chunks that the compression policy has
+    already compressed. Inside ``backfill()`` the policy is paused, each
+    compressed chunk is decompressed the first time a write targets it, and
+    every chunk decompressed that way is recompressed when the backfill
+    ends, so each chunk is rewritten once per backfill instead of being
+    modified row by row in compressed form.
+
+    ``merge`` may be called from several writer threads; chunk changes are
+    serialized on the manager's session.
+    """
+
+    def __init__(self, session: Session, hypertable: str = OHLCV_HYPERTABLE):
+        """
+        Initialize manager with database session.
+
+        Args:
+            session: SQLAlchemy session (dedicated to the manager)
+            hypertable: Qualified hypertable name ('schema.table')
+        """
+        self.session = session
+        self.hypertable = hypertable
+        self.schema, self.table = hypertable.split(".", 1)
+        self.decompressed: list[str] = []
+        self._lock = threading.Lock()
+        # Compressed chunks as parallel sorted lists: starts, ends, names
+        self._compressed: Optional[tuple[list[dt.date], list[dt.date], list[str]]] = None
+
+    def chunks(
+        self, start: Optional[dt.date] = None, end: Optional[dt.date] = None
+    ) -> list[dict[str, Any]]:
+        """
+        Chunks of the hypertable overlapping [start, end].
+
+        Args:
+            start: First day (None for no lower bound)
+            end: Last day, inclusive (None for no upper bound)
+
+        Returns:
+            Dicts with name, range_start, range_end (exclusive) and
+            is_compressed, ordered by range_start
+        """
+        rows = self.session.execute(
+            text(
+                "SELECT format('%I.%I', chunk_schema, chunk_name), "
+                "CAST(range_start AT TIME ZONE 'UTC' AS date), "
+                "CAST(range_end AT TIME ZONE 'UTC' AS date), is_compressed "
+                "FROM timescaledb_information.chunks "
+                "WHERE hypertable_schema = :schema AND hypertable_name = :table "
+                "ORDER BY range_start"
+            ),
+            {"schema": self.schema, "table": self.table},
+        ).all()
+        return [
+            {"name": name, "range_start": lo, "range_end": hi, "is_compressed": compressed}
+            for name, lo, hi, compressed in rows
+            if (start is None or hi > start) and (end is None or lo <= end)
+        ]
+
+    def _execute(self, sql: str, **params: Any) -> Any:
+        """Execute one maintenance statement in its own transaction."""
+        result = self.session.execute(text(sql), params).scalar_one_or_none()
+        self.session.commit()
+        return result
+
+    def decompress_chunk(self, chunk: str) -> None:
+        """
+        Decompress one chunk (no-op if it is not compressed).
+
+        Args:
+            chunk: Qualified chunk name
+        """
+        self._execute("SELECT decompress_chunk(CAST(:chunk AS regclass), TRUE)", chunk=chunk)
+        logger.info(f"Decompressed {chunk}")
+
+    def compress_chunk(self, chunk: str) -> None:
+        """
+        Compress one chunk (no-op if it is already compressed).
+
+        Args:
+            chunk: Qualified chunk name
+        """
+        self._execute("SELECT compress_chunk(CAST(:chunk AS regclass), TRUE)", chunk=chunk)
+        logger.info(f"Compressed {chunk}")
+
+    def decompress_range(
+        self, start: Optional[dt.date] = None, end: Optional[dt.date] = None
+    ) -> list[str]:
+        """
+        Decompress every compressed chunk overlapping [start, end].
+
+        Args:
+            start: First day (None for no lower bound)
+            end: Last day, inclusive (None for no upper bound)
+
+        Returns:
+            Names of the chunks decompressed
+        """
+        names = [c["name"] for c in self.chunks(start, end) if c["is_compressed"]]
+        for name in names:
+            self.decompress_chunk(name)
+        return names
+
+    def compress_range(
+        self,
+        start: Optional[dt.date] = None,
+        end: Optional[dt.date] = None,
+        older_than: Optional[dt.timedelta] = None,
+    ) -> list[str]:
+        """
+        Compress every uncompressed chunk overlapping [start, end].
+
+        Args:
+            start: First day (None for no lower bound)
+            end: Last day, inclusive (None for no upper bound)
+            older_than: Only chunks ending at least this long ago (as the
+                compression policy would)
+
+        Returns:
+            Names of the chunks compressed
+        """
+        cutoff = dt.date.today() - older_than if older_than is not None else None
+        names = [
+            c["name"]
+            for c in self.chunks(start, end)
+            if not c["is_compressed"] and (cutoff is None or c["range_end"] <= cutoff)
+        ]
+        for name in names:
+            self.compress_chunk(name)
+        return names
+
+    def policy_job_id(self) -> Optional[int]:
+        """
+        Job id of the hypertable's compression policy.
+
+        Returns:
+            Job id, or None without a policy
+        """
+        return self.session.execute(
+            text(
+                "SELECT job_id FROM timescaledb_information.jobs "
+                "WHERE proc_name = 'policy_compression' "
+                "AND hypertable_schema = :schema AND hypertable_name = :table"
+            ),
+            {"schema": self.schema, "table": self.table},
+        ).scalar_one_or_none()
+
+    def set_policy_scheduled(self, scheduled: bool) -> bool:
+        """
+        Pause or resume the compression policy.
+
+        Args:
+            scheduled: False to pause, True to resume
+
+        Returns:
+            True if a policy exists
+        """
+        job_id = self.policy_job_id()
+        if job_id is None:
+            return False
+        self._execute(
+            "SELECT alter_job(:job_id, scheduled => :scheduled)", job_id=job_id, scheduled=scheduled
+        )
+        logger.info(
+            f"Compression policy of {self.hypertable} {'resumed' if scheduled else 'paused'}"
+        )
+        return True
+
+    def refresh(self) -> None:
+        """Reload the compressed chunks targeted by merge."""
+        chunks = [c for c in self.chunks() if c["is_compressed"]]
+        self._compressed = (
+            [c["range_start"] for c in chunks],
+            [c["range_end"] for c in chunks],
+            [c["name"] for c in chunks],
+        )
+
+    def _compressed_chunk(self, day: dt.date) -> Optional[int]:
+        """Index of the compressed chunk containing day, if any."""
+        starts, ends, _ = self._compressed
+        i = bisect.bisect_right(starts, day) - 1
+        return i if i >= 0 and day < ends[i] else None
+
+    def merge(
+        self,
+        rows: Sequence[tuple],
+        write: Callable[[Sequence[tuple]], int],
+        date_index: int = 1,
+    ) -> int:
+        """
+        Write rows, decompressing the compressed chunks they fall into first.
+
+        Decompressed chunks are remembered and recompressed by recompress().
+
+        Args:
+            rows: Row tuples
+            write: Writer called with all rows once their chunks are writable
+            date_index: Position of the time column in each row
+
+        Returns:
+            Value returned by write
+        """
+        with self._lock:
+            if self._compressed is None:
+                self.refresh()
+            targets = {self._compressed_chunk(row[date_index]) for row in rows} - {None}
+            for i in sorted(targets, reverse=True):
+                starts, ends, names = self._compressed
+                self.decompress_chunk(names[i])
+                self.decompressed.append(names[i])
+                del starts[i], ends[i], names[i]
+        return write(rows)
+
+    def recompress(self) -> list[str]:
+        """
+        Recompress the chunks decompressed by merge.
+
+        Returns:
+            Names of the chunks recompressed
+        """
+        with self._lock:
+            names, self.decompressed = self.decompressed, []
+            for name in names:
+                self.compress_chunk(name)
+            self._compressed = None
+        return names
+
+    @contextmanager
+    def backfill(self) -> Iterator["CompressionManager"]:
+        """
+        Pause the policy, decompress chunks on demand, recompress at the end.
+
+        Yields:
+            This manager (pass it to CopyWriter / load_files)
+
+        Example:
+            >>> with CompressionManager(session).backfill() as compression:
+            ...     BackfillEngine(source, CopyWriter(conn, compression)).run(tickers, start, end)
+        """
+        paused = self.set_policy_scheduled(False)
+        self.refresh()
+        try:
+            yield self
+        finally:
+            try:
+                recompressed = self.recompress()
+                if recompressed:
+                    logger.info(f"Recompressed {len(recompressed)} chunks of {self.hypertable}")
+            finally:
+                if paused:
+                    self.set_policy_scheduled(True)
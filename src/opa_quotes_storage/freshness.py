@@ -0,0 +1,244 @@
+"""Per-symbol ingest freshness and lag monitoring."""
+
+import threading
+from collections import deque
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from . import metrics
+from .trading_calendar import US_EQUITIES, TradingSession
+
+# A symbol without quotes for this long during a session is stale
+DEFAULT_MAX_AGE = timedelta(minutes=5)
+
+# How far back the polling query looks for a symbol's latest quote; bounds
+# the scan to the most recent chunks
+DEFAULT_LOOKBACK = timedelta(days=7)
+
+# Lag samples kept for quantiles (oldest evicted first)
+DEFAULT_SAMPLE_SIZE = 10_000
+
+# Lag quantiles reported by check() and exported as gauges
+LAG_QUANTILES = (0.5, 0.9, 0.99)
+
+# Stale symbols listed in a health report (the count is always complete)
+_MAX_LISTED = 20
+
+
+def last_seen_sql(lookback: timedelta = DEFAULT_LOOKBACK) -> str:
+    """
+    Query returning (symbol, latest timestamp) of recently active symbols.
+
+    A ``max(timestamp) ... GROUP BY symbol`` would read every row of the
+    lookback window, as PostgreSQL has no skip scan. Instead a recursive
+    CTE walks the (symbol, timestamp) primary key backwards: each step is
+    one index descent returning the next lower symbol with its latest
+    timestamp, so the cost grows with the number of symbols, not rows.
+    The time bound keeps each descent to the chunks of the lookback
+    window. Parameter-free so it runs on SQLAlchemy sessions and psycopg2
+    cursors.
+
+    Args:
+        lookback: How far back to look
+
+    Returns:
+        SQL text
+    """
+    since = f"now() - INTERVAL '{int(lookback.total_seconds())} seconds'"
+    return (
+        "WITH RECURSIVE latest(symbol, ts) AS ("
+        "(SELECT symbol, timestamp FROM quotes.real_time "
+        f"WHERE timestamp > {since} "
+        "ORDER BY symbol DESC, timestamp DESC LIMIT 1) "
+        "UNION ALL "
+        "SELECT step.symbol, step.timestamp FROM latest, LATERAL ("
+        "SELECT symbol, timestamp FROM quotes.real_time "
+        f"WHERE symbol < latest.symbol AND timestamp > {since} "
+        "ORDER BY symbol DESC, timestamp DESC LIMIT 1) AS step"
+        ") SELECT symbol, ts FROM latest"
+    )
+
+
+def quantile(sorted_values: list[float], q: float) -> float:
+    """
+    Quantile by linear interpolation between closest ranks.
+
+    Args:
+        sorted_values: Non-empty ascending values
+        q: Quantile in [0, 1]
+
+    Returns:
+        Interpolated value
+    """
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class FreshnessMonitor:
+    """
+    Track each symbol's latest quote and the ingest lag.
+
+    Fed from the write path (``QuoteRepository(session, freshness=monitor)``
+    calls ``observe`` after each committed batch) at the cost of one dict
+    update per symbol and one histogram observation per record, or by
+    polling ``last_seen_sql`` when no writer runs in this process. Lag
+    (ingest time minus quote timestamp) is only known on the write path.
+
+    Symbols are flagged stale only while the trading session is open, so
+    nights, weekends and holidays do not raise alerts.
+    """
+
+    def __init__(
+        self,
+        max_age: timedelta = DEFAULT_MAX_AGE,
+        trading_session: Optional[TradingSession] = US_EQUITIES,
+        symbols: Optional[Iterable[str]] = None,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            max_age: Age after which a symbol is stale
+            trading_session: Session outside which nothing is stale (None:
+                always check)
+            symbols: Expected symbols; those never seen count as stale
+            sample_size: Lag samples kept for quantiles
+        """
+        self.max_age = max_age
+        self.trading_session = trading_session
+        self.symbols = frozenset(s.upper() for s in symbols or ())
+        self.last_seen: dict[str, datetime] = {}
+        self.fed = False
+        self._lags: deque[float] = deque(maxlen=sample_size)
+        self._lock = threading.Lock()
+
+    def observe(
+        self, records: Iterable[dict[str, Any]], ingested_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Record written quotes.
+
+        Args:
+            records: Validated records with symbol and timestamp
+            ingested_at: Write time (default: now)
+        """
+        ingested_at = ingested_at or datetime.now(UTC)
+        latest: dict[str, datetime] = {}
+        lags = []
+        for record in records:
+            symbol, timestamp = record["symbol"], record["timestamp"]
+            if symbol not in latest or timestamp > latest[symbol]:
+                latest[symbol] = timestamp
+            lags.append((ingested_at - timestamp).total_seconds())
+
+        for lag in lags:
+            metrics.INGEST_LAG_SECONDS.observe(lag)
+        with self._lock:
+            self.fed = True
+            self._lags.extend(lags)
+            self._merge(latest.items())
+
+    def update_last_seen(self, rows: Iterable[tuple[str, datetime]]) -> None:
+        """
+        Merge (symbol, latest timestamp) rows, e.g. from ``last_seen_sql``.
+
+        Args:
+            rows: Symbol and latest timestamp pairs
+        """
+        with self._lock:
+            self._merge(rows)
+
+    def _merge(self, rows: Iterable[tuple[str, datetime]]) -> None:
+        """Keep the latest timestamp per symbol (caller holds the lock)."""
+        for symbol, timestamp in rows:
+            if timestamp is not None and (
+                symbol not in self.last_seen or timestamp > self.last_seen[symbol]
+            ):
+                self.last_seen[symbol] = timestamp
+
+    def load(self, session: Session, lookback: timedelta = DEFAULT_LOOKBACK) -> None:
+        """
+        Poll the database for each symbol's latest quote.
+
+        Args:
+            session: SQLAlchemy session
+            lookback: How far back to look
+        """
+        self.update_last_seen(session.execute(text(last_seen_sql(lookback))).all())
+
+    def stale(self, now: Optional[datetime] = None) -> dict[str, Optional[float]]:
+        """
+        Symbols without a recent quote while the session is open.
+
+        Args:
+            now: Reference time (default: now)
+
+        Returns:
+            Dict of symbol to age in seconds (None if never seen), oldest first
+        """
+        now = now or datetime.now(UTC)
+        if self.trading_session is not None and not self.trading_session.is_open(now):
+            return {}
+        with self._lock:
+            last_seen = dict(self.last_seen)
+
+        stale: dict[str, Optional[float]] = {
+            s: None for s in sorted(self.symbols - last_seen.keys())
+        }
+        ages = {
+            symbol: (now - timestamp).total_seconds() for symbol, timestamp in last_seen.items()
+        }
+        limit = self.max_age.total_seconds()
+        for symbol, age in sorted(ages.items(), key=lambda item: item[1], reverse=True):
+            if age > limit:
+                stale[symbol] = age
+        return stale
+
+    def lag_quantiles(self, quantiles: Iterable[float] = LAG_QUANTILES) -> dict[float, float]:
+        """
+        Ingest lag quantiles over the recent samples.
+
+        Args:
+            quantiles: Quantiles in [0, 1]
+
+        Returns:
+            Dict of quantile to lag in seconds (empty without samples)
+        """
+        with self._lock:
+            lags = sorted(self._lags)
+        if not lags:
+            return {}
+        return {q: quantile(lags, q) for q in quantiles}
+
+    def check(self, now: Optional[datetime] = None) -> dict[str, Any]:
+        """
+        Health check result; also updates the freshness gauges.
+
+        Args:
+            now: Reference time (default: now)
+
+        Returns:
+            Dict with status, message, stale symbols, lag quantiles and
+            tracked symbol count
+        """
+        stale = self.stale(now)
+        lags = self.lag_quantiles()
+
+        metrics.STALE_SYMBOLS.set(len(stale))
+        for q, lag in lags.items():
+            metrics.INGEST_LAG_QUANTILE_SECONDS.labels(str(q)).set(lag)
+
+        return {
+            "status": "degraded" if stale else "healthy",
+            "message": f"{len(stale)} stale symbol(s)" if stale else "All symbols fresh",
+            "tracked_symbols": len(self.last_seen),
+            "stale_symbols": dict(list(stale.items())[:_MAX_LISTED]),
+            "lag_seconds": {f"p{round(q * 100):g}": round(lag, 3) for q, lag in lags.items()},
+        }
@@ -1,126 +1,318 @@
 """Health checks for opa-quotes-storage."""
 
+import copy
+import threading
+import time
+from collections.abc import Callable
 from datetime import UTC, datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, Optional
 
 import psycopg2
 
-from .connection import get_connection_string
+from .config import get_connection_string
+
+if TYPE_CHECKING:
+    from .freshness import FreshnessMonitor
+    from .resilience import CircuitBreaker
+
+# Seconds to wait for a TCP connection and authentication
+DEFAULT_CONNECT_TIMEOUT = 3
+
+# Server-side limit for each check query, in milliseconds
+DEFAULT_STATEMENT_TIMEOUT_MS = 2000
+
+# Seconds check_all results are reused for
+DEFAULT_CACHE_TTL = 5.0
 
 
 class HealthChecker:
-    """Health check system for TimescaleDB storage."""
+    """
+    Health check system for TimescaleDB storage.
+
+    All checks share one long-lived connection opened with a connect
+    timeout and a per-statement timeout, so a slow database fails a probe
+    quickly instead of hanging it. Each check reports its latency, and
+    ``check_all`` results are cached for ``cache_ttl`` seconds; concurrent
+    callers wait for the single refresh in flight instead of piling up.
 
-    def __init__(self):
-        """Initialize with database connection string."""
-        self.connection_string = get_connection_string()
+    Only psycopg2 is imported up front; the storage and freshness checks
+    import their modules on first use so the one-shot CLI probe starts fast.
+    """
+
+    def __init__(
+        self,
+        connection_string: Optional[str] = None,
+        connect_timeout: int = DEFAULT_CONNECT_TIMEOUT,
+        statement_timeout_ms: int = DEFAULT_STATEMENT_TIMEOUT_MS,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        freshness: Optional["FreshnessMonitor"] = None,
+    ):
+        """
+        Initialize with database connection string.
+
+        Args:
+            connection_string: PostgreSQL DSN (default from environment)
+            connect_timeout: Seconds to wait for a connection
+            statement_timeout_ms: Timeout of each check query
+            cache_ttl: Seconds check_all results are reused (0 disables caching)
+            freshness: Monitor fed by the write path (default: a polling monitor)
+        """
+        self.connection_string = connection_string or get_connection_string()
+        self.connect_timeout = connect_timeout
+        self.statement_timeout_ms = statement_timeout_ms
+        self.cache_ttl = cache_ttl
+        self.freshness = freshness
+        self._conn = None
+        self._lock = threading.RLock()
+        self._cached: Optional[dict[str, Any]] = None
+        self._cached_at = 0.0
+
+    def _connection(self) -> Any:
+        """Shared connection, (re)opened when missing or closed."""
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(
+                self.connection_string,
+                connect_timeout=self.connect_timeout,
+                options=f"-c statement_timeout={self.statement_timeout_ms}",
+                application_name="opa-quotes-storage-health",
+            )
+            self._conn.autocommit = True
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared connection."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                finally:
+                    self._conn = None
+
+    def _query(self, sql: str) -> Optional[tuple]:
+        """Run a query on the shared connection and fetch one row."""
+        cursor = self._connection().cursor()
+        try:
+            cursor.execute(sql)
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def _query_all(self, sql: str) -> list[tuple]:
+        """Run a query on the shared connection and fetch all rows."""
+        cursor = self._connection().cursor()
+        try:
+            cursor.execute(sql)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _run(self, description: str, check: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """
+        Run one check, timing it and turning errors into unhealthy results.
+
+        A failed check drops the shared connection so the next one reconnects.
+        """
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                result = check()
+            except Exception as e:
+                self.close()
+                result = {"status": "unhealthy", "message": f"{description} failed: {str(e)}"}
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return result
 
     def check_database_connection(self) -> dict[str, Any]:
         """
         Verify PostgreSQL/TimescaleDB connection.
 
         Returns:
-            Dict with status, message, and version info
+            Dict with status, message, version info and latency_ms
         """
-        try:
-            conn = psycopg2.connect(self.connection_string)
-            cursor = conn.cursor()
-            cursor.execute("SELECT version()")
-            version = cursor.fetchone()[0]
-            cursor.close()
-            conn.close()
 
+        def check() -> dict[str, Any]:
+            version = self._query("SELECT version()")[0]
             return {
                 "status": "healthy",
                 "message": "Database connected",
                 "version": version.split()[0:2],  # "PostgreSQL 14.0"
             }
-        except Exception as e:
-            return {"status": "unhealthy", "message": f"Database connection failed: {str(e)}"}
+
+        return self._run("Database connection", check)
 
     def check_timescaledb_extension(self) -> dict[str, Any]:
         """
         Verify TimescaleDB extension is loaded.
 
         Returns:
-            Dict with status, message, and version info
+            Dict with status, message, version info and latency_ms
         """
-        try:
-            conn = psycopg2.connect(self.connection_string)
-            cursor = conn.cursor()
-            cursor.execute(
+
+        def check() -> dict[str, Any]:
+            result = self._query(
                 """
                 SELECT extname, extversion
                 FROM pg_extension
                 WHERE extname = 'timescaledb'
             """
             )
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-
             if result:
                 return {
                     "status": "healthy",
                     "message": "TimescaleDB extension loaded",
                     "version": result[1],
                 }
-            else:
-                return {"status": "unhealthy", "message": "TimescaleDB extension not found"}
-        except Exception as e:
-            return {"status": "unhealthy", "message": f"Extension check failed: {str(e)}"}
+            return {"status": "unhealthy", "message": "TimescaleDB extension not found"}
+
+        return self._run("Extension check", check)
 
     def check_hypertable(self) -> dict[str, Any]:
         """
         Verify quotes.real_time hypertable exists.
 
         Returns:
-            Dict with status, message, and chunk count
+            Dict with status, message, chunk count and latency_ms
         """
-        try:
-            conn = psycopg2.connect(self.connection_string)
-            cursor = conn.cursor()
-            cursor.execute(
+
+        def check() -> dict[str, Any]:
+            result = self._query(
                 """
                 SELECT hypertable_name, num_chunks
                 FROM timescaledb_information.hypertables
                 WHERE hypertable_name = 'real_time'
             """
             )
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
-
             if result:
                 return {
                     "status": "healthy",
                     "message": "Hypertable operational",
                     "chunks": result[1],
                 }
-            else:
-                return {"status": "unhealthy", "message": "Hypertable not found"}
-        except Exception as e:
-            return {"status": "unhealthy", "message": f"Hypertable check failed: {str(e)}"}
+            return {"status": "unhealthy", "message": "Hypertable not found"}
+
+        return self._run("Hypertable check", check)
+
+    def check_storage(self, target_ratio: Optional[float] = None) -> dict[str, Any]:
+        """
+        Verify compression keeps up on all hypertables and export storage metrics.
+
+        Degraded when chunks older than the compression policy horizon are
+        still uncompressed, a background job's last run failed, or the
+        compression ratio is below target. Not part of ``check_all``: a
+        compression backlog is a disk-growth risk, not a readiness failure.
 
-    def check_all(self) -> dict[str, Any]:
+        Args:
+            target_ratio: Minimum acceptable compression ratio (default:
+                TARGET_COMPRESSION_RATIO)
+
+        Returns:
+            Dict with status, message, per-hypertable summary and latency_ms
         """
-        Run all health checks.
+
+        from .storage import (
+            CHUNKS_SQL,
+            JOBS_SQL,
+            TARGET_COMPRESSION_RATIO,
+            build_reports,
+            export_metrics,
+        )
+
+        target_ratio = TARGET_COMPRESSION_RATIO if target_ratio is None else target_ratio
+
+        def check() -> dict[str, Any]:
+            reports = build_reports(self._query_all(CHUNKS_SQL), self._query_all(JOBS_SQL))
+            export_metrics(reports)
+            problems = [p for report in reports.values() for p in report.problems(target_ratio)]
+            return {
+                "status": "degraded" if problems else "healthy",
+                "message": "; ".join(problems) if problems else "Compression up to date",
+                "hypertables": {name: report.summary() for name, report in reports.items()},
+            }
+
+        return self._run("Storage check", check)
+
+    def check_freshness(self) -> dict[str, Any]:
+        """
+        Verify every symbol received quotes recently during the trading session.
+
+        A monitor fed by the write path is used as is; otherwise each symbol's
+        latest timestamp is polled with a time-bounded skip scan of the primary key.
+        Degraded when symbols are stale. Not part of ``check_all``: a stalled
+        upstream feed does not make the storage service unready.
 
         Returns:
-            Complete health report with all checks and overall status
-        """
-        checks = {
-            "database": self.check_database_connection(),
-            "timescaledb": self.check_timescaledb_extension(),
-            "hypertable": self.check_hypertable(),
-        }
-
-        return {
-            "timestamp": datetime.now(UTC).isoformat(),
-            "service": "opa-quotes-storage",
-            "checks": checks,
-            "overall_status": self._get_overall_status(checks),
-        }
+            Dict with status, message, stale symbols, lag quantiles and latency_ms
+        """
+
+        from .freshness import FreshnessMonitor, last_seen_sql
+
+        if self.freshness is None:
+            self.freshness = FreshnessMonitor()
+
+        def check() -> dict[str, Any]:
+            if not self.freshness.fed:
+                self.freshness.update_last_seen(self._query_all(last_seen_sql()))
+            return self.freshness.check()
+
+        return self._run("Freshness check", check)
+
+    def check_circuit_breaker(self, breaker: Optional["CircuitBreaker"] = None) -> dict[str, Any]:
+        """
+        Report the state of the write circuit breaker.
+
+        Unhealthy while open (writes are rejected), degraded while
+        half-open (a trial write decides). Not part of ``check_all``:
+        reads keep working while writes are shed.
+
+        Args:
+            breaker: Breaker to report (default: the process-wide WRITE_BREAKER)
+
+        Returns:
+            Dict with status, message, state, consecutive failures and latency_ms
+        """
+        from .resilience import WRITE_BREAKER
+
+        return self._run("Circuit breaker check", (breaker or WRITE_BREAKER).check)
+
+    def check_all(self, max_age: Optional[float] = None) -> dict[str, Any]:
+        """
+        Run all health checks, reusing a recent report.
+
+        Args:
+            max_age: Maximum age in seconds of a cached report (default:
+                cache_ttl; 0 forces a refresh)
+
+        Returns:
+            Complete health report with all checks, overall status and
+            cache age in seconds (a copy: callers may modify it)
+        """
+        max_age = self.cache_ttl if max_age is None else max_age
+        with self._lock:
+            age = time.monotonic() - self._cached_at
+            if self._cached is None or age >= max_age:
+                checks = {"database": self.check_database_connection()}
+                if checks["database"]["status"] == "healthy":
+                    checks["timescaledb"] = self.check_timescaledb_extension()
+                    checks["hypertable"] = self.check_hypertable()
+                else:
+                    # Do not wait for the connect timeout again per check
+                    skipped = {
+                        "status": "unhealthy",
+                        "message": "Skipped: database unavailable",
+                        "latency_ms": 0.0,
+                    }
+                    checks["timescaledb"] = dict(skipped)
+                    checks["hypertable"] = dict(skipped)
+                self._cached = {
+                    "timestamp": datetime.now(UTC).isoformat(),
+                    "service": "opa-quotes-storage",
+                    "checks": checks,
+                    "overall_status": self._get_overall_status(checks),
+                }
+                self._cached_at = time.monotonic()
+                age = 0.0
+
+            return {**copy.deepcopy(self._cached), "cache_age_s": round(age, 3)}
 
     def _get_overall_status(self, checks: dict[str, dict[str, Any]]) -> str:
         """
@@ -7,7 +7,9 @@ import logging
 from shared.utils.pipeline_logger import PipelineLogger
 
 from opa_quotes_storage.config import get_settings
+from opa_quotes_storage.connection import get_engine
 from opa_quotes_storage.logging_setup import setup_logging
+from opa_quotes_storage.warmup import Warmup
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -25,6 +27,9 @@ async def main():
         pipeline_logger.start(metadata={"env": settings.environment})
         logger.info(f"Starting {settings.app_name} v{settings.version}")
 
+        # Open and warm the pool before the first request pays for it
+        await asyncio.to_thread(Warmup(get_engine()).run)
+
         # TODO: Implement pipeline logic here
 
         pipeline_logger.complete(status="success", metadata={"message": "Pipeline completed"})
@@ -0,0 +1,274 @@
+"""Prometheus metrics for repository hot paths, the connection pool and storage."""
+
+import functools
+import time
+from collections.abc import Callable, Sized
+from typing import Any, TypeVar
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Latency buckets (seconds) from sub-millisecond lookups to multi-second scans
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Ingest lag buckets (seconds) from sub-second streaming to hour-old backfills
+LAG_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900, 3600)
+
+# Rows per call, powers of ten up to a full backfill batch
+ROW_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+QUERY_SECONDS = Histogram(
+    "opa_quotes_storage_query_seconds",
+    "Repository read latency",
+    ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_ROWS = Histogram(
+    "opa_quotes_storage_query_rows",
+    "Rows returned per repository read",
+    ["method"],
+    buckets=ROW_BUCKETS,
+)
+QUERY_ERRORS = Counter(
+    "opa_quotes_storage_query_errors_total",
+    "Repository calls that raised",
+    ["method"],
+)
+INSERT_VALIDATION_SECONDS = Histogram(
+    "opa_quotes_storage_insert_validation_seconds",
+    "Pydantic validation time per bulk_insert call",
+    buckets=LATENCY_BUCKETS,
+)
+INSERT_DB_SECONDS = Histogram(
+    "opa_quotes_storage_insert_db_seconds",
+    "Database time (execute + commit) per bulk_insert call",
+    buckets=LATENCY_BUCKETS,
+)
+INSERT_ROWS = Histogram(
+    "opa_quotes_storage_insert_rows",
+    "Rows written per bulk_insert call",
+    buckets=ROW_BUCKETS,
+)
+REJECTED_RECORDS = Counter(
+    "opa_quotes_storage_rejected_records_total",
+    "Records rejected by validation",
+    ["method"],
+)
+CONFLICTS = Counter(
+    "opa_quotes_storage_conflicts_total",
+    "Writes failing on a unique (primary key) conflict",
+    ["method"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "opa_quotes_storage_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+)
+POOL_OVERFLOW = Gauge(
+    "opa_quotes_storage_pool_overflow",
+    "Connections open beyond pool_size",
+    ["pool"],
+)
+POOL_WAIT_SECONDS = Histogram(
+    "opa_quotes_storage_pool_wait_seconds",
+    "Time waiting for a pooled connection",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+HYPERTABLE_BYTES = Gauge(
+    "opa_quotes_storage_hypertable_bytes",
+    "Current size of all chunks of a hypertable",
+    ["hypertable"],
+)
+HYPERTABLE_UNCOMPRESSED_BYTES = Gauge(
+    "opa_quotes_storage_hypertable_uncompressed_bytes",
+    "Size of a hypertable as if no chunk were compressed",
+    ["hypertable"],
+)
+COMPRESSION_RATIO = Gauge(
+    "opa_quotes_storage_compression_ratio",
+    "Before/after size of compressed chunks (0 if none compressed)",
+    ["hypertable"],
+)
+COMPRESSION_BACKLOG_CHUNKS = Gauge(
+    "opa_quotes_storage_compression_backlog_chunks",
+    "Uncompressed chunks older than the compression policy horizon",
+    ["hypertable"],
+)
+PROJECTED_GROWTH_BYTES = Gauge(
+    "opa_quotes_storage_projected_growth_bytes_per_day",
+    "Projected disk growth per day at the observed ingest and compression rates",
+    ["hypertable"],
+)
+JOB_FAILURES = Gauge(
+    "opa_quotes_storage_job_failures",
+    "Failed runs of a TimescaleDB background job since its creation",
+    ["hypertable", "job_id", "proc_name"],
+)
+JOB_LAST_RUN_FAILED = Gauge(
+    "opa_quotes_storage_job_last_run_failed",
+    "1 if the last run of a background job failed",
+    ["hypertable", "job_id", "proc_name"],
+)
+JOB_LAST_SUCCESS = Gauge(
+    "opa_quotes_storage_job_last_success_timestamp_seconds",
+    "End of the last successful run of a background job",
+    ["hypertable", "job_id", "proc_name"],
+)
+JOB_NEXT_START = Gauge(
+    "opa_quotes_storage_job_next_start_timestamp_seconds",
+    "Next scheduled start of a background job",
+    ["hypertable", "job_id", "proc_name"],
+)
+
+INGEST_LAG_SECONDS = Histogram(
+    "opa_quotes_storage_ingest_lag_seconds",
+    "Ingest time minus quote timestamp of written quotes",
+    buckets=LAG_BUCKETS,
+)
+INGEST_LAG_QUANTILE_SECONDS = Gauge(
+    "opa_quotes_storage_ingest_lag_quantile_seconds",
+    "Ingest lag quantile over recent writes",
+    ["quantile"],
+)
+STALE_SYMBOLS = Gauge(
+    "opa_quotes_storage_stale_symbols",
+    "Symbols without a recent quote during the trading session",
+)
+
+SLOW_QUERIES = Counter(
+    "opa_quotes_storage_slow_queries_total",
+    "Queries slower than the slow query threshold",
+)
+STATEMENT_PREPARES = Counter(
+    "opa_quotes_storage_statement_prepares_total",
+    "Server-side PREPAREs issued (one per statement and pooled connection)",
+    ["statement"],
+)
+
+RETRIES = Counter(
+    "opa_quotes_storage_retries_total",
+    "Writes retried after a transient database error",
+    ["method"],
+)
+CIRCUIT_STATE = Gauge(
+    "opa_quotes_storage_circuit_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["breaker"],
+)
+CIRCUIT_REJECTIONS = Counter(
+    "opa_quotes_storage_circuit_rejections_total",
+    "Calls rejected without reaching the database by an open circuit breaker",
+    ["breaker"],
+)
+
+WARMUP_SECONDS = Gauge(
+    "opa_quotes_storage_warmup_seconds",
+    "Duration of the last connection and statement warm-up",
+)
+
+
+def row_count(result: Any) -> int:
+    """
+    Rows in a repository result.
+
+    Args:
+        result: List, dict keyed by symbol (columnar lists), scalar or None
+
+    Returns:
+        Number of rows (1 for a scalar, 0 for None)
+    """
+    if result is None:
+        return 0
+    if isinstance(result, dict):
+        return sum(len(next(iter(columns.values()), ())) for columns in result.values())
+    if isinstance(result, Sized):
+        return len(result)
+    return 1
+
+
+def instrument(method: str, rows: Callable[[Any], int] = row_count) -> Callable[[F], F]:
+    """
+    Decorator recording latency, rows and errors of a repository read.
+
+    Labelled children are resolved once at decoration time, so a call costs
+    two clock reads and two histogram observations.
+
+    Args:
+        method: Value of the ``method`` label
+        rows: Function counting rows in the result
+
+    Returns:
+        Decorator
+    """
+    latency = QUERY_SECONDS.labels(method)
+    row_histogram = QUERY_ROWS.labels(method)
+    errors = QUERY_ERRORS.labels(method)
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            latency.observe(time.perf_counter() - start)
+            row_histogram.observe(rows(result))
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def instrument_engine(engine: Engine, name: str | None = None) -> None:
+    """
+    Export pool gauges and checkout wait time of an engine.
+
+    Gauges follow pool checkout/checkin events (overflow is sampled at each
+    checkout, after the connection was granted). Wait time is
+    measured around the pool's internal connection getter, the only point
+    that sees both the request and the grant of a connection; dispose()
+    replaces the pool, so the new pool is wrapped again from the
+    ``engine_disposed`` event.
+
+    Args:
+        engine: SQLAlchemy engine
+        name: Value of the ``pool`` label (default: database name)
+    """
+    name = name or engine.url.database or "default"
+    checked_out = POOL_CHECKED_OUT.labels(name)
+    overflow = POOL_OVERFLOW.labels(name)
+    wait = POOL_WAIT_SECONDS.labels(name)
+
+    def on_checkout(*_: Any) -> None:
+        checked_out.inc()
+        # engine.pool, not pool: dispose() replaces the pool, keeping listeners
+        if hasattr(engine.pool, "overflow"):
+            overflow.set(max(engine.pool.overflow(), 0))
+
+    def on_checkin(*_: Any) -> None:
+        checked_out.dec()
+
+    def time_pool(*_: Any) -> None:
+        pool = engine.pool
+        do_get = pool._do_get
+
+        def timed_do_get() -> Any:
+            start = time.perf_counter()
+            try:
+                return do_get()
+            finally:
+                wait.observe(time.perf_counter() - start)
+
+        pool._do_get = timed_do_get
+
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    event.listen(engine, "engine_disposed", time_pool)
+    time_pool()
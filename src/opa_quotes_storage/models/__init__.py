@@ -1,5 +1,8 @@
 """SQLAlchemy models for opa-quotes-storage."""
 
+from .corporate_action import CorporateAction
+from .ohlcv import OhlcvDaily
 from .quote import Base, RealTimeQuote
+from .rollup import RollupWatermark
 
-__all__ = ["Base", "RealTimeQuote"]
+__all__ = ["Base", "RealTimeQuote", "OhlcvDaily", "RollupWatermark", "CorporateAction"]
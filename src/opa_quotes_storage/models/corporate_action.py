@@ -0,0 +1,37 @@
+"""SQLAlchemy model for corporate actions (splits and dividends)."""
+
+from sqlalchemy import DATE, FLOAT, VARCHAR, Column
+
+from .quote import Base
+
+
+class CorporateAction(Base):
+    """
+    Split or cash dividend affecting a ticker's price history.
+
+    Attributes:
+        ticker: Stock ticker symbol (e.g., 'AAPL')
+        ex_date: First trading date without the entitlement
+        action_type: 'split' or 'dividend'
+        value: Split ratio (new shares per old share) or cash amount per share
+        factor: Price adjustment factor applied to bars before ex_date
+            (1 / ratio for splits, 1 - amount / previous close for dividends)
+    """
+
+    __tablename__ = "corporate_actions"
+    __table_args__ = {"schema": "quotes"}
+
+    # Primary key compuesta (ticker, ex_date, action_type)
+    ticker = Column(VARCHAR(10), primary_key=True, nullable=False)
+    ex_date = Column(DATE, primary_key=True, nullable=False)
+    action_type = Column(VARCHAR(16), primary_key=True, nullable=False)
+
+    value = Column(FLOAT, nullable=False)
+    factor = Column(FLOAT, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the action."""
+        return (
+            f"<CorporateAction(ticker={self.ticker}, ex_date={self.ex_date}, "
+            f"action_type={self.action_type}, value={self.value})>"
+        )
@@ -0,0 +1,64 @@
+"""SQLAlchemy model for daily OHLCV bars."""
+
+from sqlalchemy import DATE, FLOAT, VARCHAR, BigInteger, Column, text
+
+from .quote import Base
+
+
+class OhlcvDaily(Base):
+    """
+    Model for daily OHLCV bars stored in TimescaleDB hypertable.
+
+    Attributes:
+        ticker: Stock ticker symbol (e.g., 'AAPL', 'MSFT')
+        date: Trading date
+        open: Opening price
+        high: High price
+        low: Low price
+        close: Closing price
+        adj_close: Close adjusted for splits/dividends
+        volume: Trading volume
+        source: Provenance ('external' provider/file load or 'rollup' from real_time)
+        price_basis: 'raw' prices, or 'adjusted' for bars stored
+            provider-adjusted before raw backfills (never adjusted again)
+    """
+
+    __tablename__ = "ohlcv_daily"
+    __table_args__ = {"schema": "quotes"}
+
+    # Primary key compuesta (ticker, date)
+    ticker = Column(VARCHAR(10), primary_key=True, nullable=False)
+    date = Column(DATE, primary_key=True, nullable=False)
+
+    # OHLC data
+    open = Column(FLOAT, nullable=False)
+    high = Column(FLOAT, nullable=False)
+    low = Column(FLOAT, nullable=False)
+    close = Column(FLOAT, nullable=False)
+    adj_close = Column(FLOAT, nullable=False)
+
+    # Volume
+    volume = Column(BigInteger, nullable=False)
+
+    # Metadata
+    source = Column(VARCHAR(16), nullable=False, server_default=text("'external'"))
+    price_basis = Column(VARCHAR(8), nullable=False, server_default=text("'raw'"))
+
+    def __repr__(self) -> str:
+        """String representation of the bar."""
+        return f"<OhlcvDaily(ticker={self.ticker}, date={self.date}, close={self.close})>"
+
+    def to_dict(self) -> dict:
+        """Convert bar to dictionary."""
+        return {
+            "ticker": self.ticker,
+            "date": self.date.isoformat() if self.date else None,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "adj_close": self.adj_close,
+            "volume": self.volume,
+            "source": self.source,
+            "price_basis": self.price_basis,
+        }
@@ -0,0 +1,27 @@
+"""SQLAlchemy model for rollup job watermarks."""
+
+from sqlalchemy import DATE, TIMESTAMP, Column, Text, func
+
+from .quote import Base
+
+
+class RollupWatermark(Base):
+    """
+    Progress of an incremental rollup job.
+
+    Attributes:
+        job: Job name (e.g., 'real_time_to_ohlcv_daily')
+        watermark: Last local trading day fully rolled up (inclusive)
+        updated_at: Time of the last advance
+    """
+
+    __tablename__ = "rollup_watermarks"
+    __table_args__ = {"schema": "quotes"}
+
+    job = Column(Text, primary_key=True, nullable=False)
+    watermark = Column(DATE, nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        """String representation of the watermark."""
+        return f"<RollupWatermark(job={self.job}, watermark={self.watermark})>"
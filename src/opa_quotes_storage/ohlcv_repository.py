@@ -0,0 +1,301 @@
+"""Repository for daily OHLCV bar access with validation."""
+
+import datetime as dt
+from collections.abc import Sequence
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from sqlalchemy import Date, cast, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from .bulk import copy_upsert, iter_batches, validate_records
+from .compression import CompressionManager
+from .config import get_settings
+from .models import OhlcvDaily
+from .profiles import apply_profile, get_profile
+from .resilience import (
+    WRITE_BREAKER,
+    CircuitBreaker,
+    RetryPolicy,
+    call_with_retry,
+    reset_session,
+    session_policy,
+)
+
+# Column order used for COPY and columnar results
+OHLCV_COLUMNS = ("ticker", "date", "open", "high", "low", "close", "adj_close", "volume")
+
+# Provenance values of ohlcv_daily.source
+SOURCE_EXTERNAL = "external"
+SOURCE_ROLLUP = "rollup"
+
+# Price basis of ohlcv_daily rows: raw, or provider-adjusted legacy rows
+PRICE_BASIS_RAW = "raw"
+PRICE_BASIS_ADJUSTED = "adjusted"
+
+# Constant columns of provider and file loads
+EXTERNAL_CONSTANTS = {"source": SOURCE_EXTERNAL, "price_basis": PRICE_BASIS_RAW}
+
+# Resampling periods accepted by OhlcvDailyRepository.resample
+RESAMPLE_PERIODS = ("week", "month")
+
+
+class OhlcvDailySchema(BaseModel):
+    """Pydantic schema for daily bar validation."""
+
+    model_config = ConfigDict(
+        str_strip_whitespace=True, validate_assignment=True, from_attributes=True
+    )
+
+    ticker: str = Field(..., min_length=1, max_length=10, description="Ticker symbol")
+    date: dt.date = Field(..., description="Trading date")
+    open: float = Field(..., ge=0, description="Opening price")
+    high: float = Field(..., ge=0, description="High price")
+    low: float = Field(..., ge=0, description="Low price")
+    close: float = Field(..., ge=0, description="Closing price")
+    adj_close: Optional[float] = Field(None, ge=0, description="Adjusted close")
+    volume: int = Field(..., ge=0, description="Trading volume")
+
+    @field_validator("ticker")
+    @classmethod
+    def uppercase_ticker(cls, v: str) -> str:
+        """Convert ticker to uppercase."""
+        return v.upper().strip()
+
+    @model_validator(mode="after")
+    def default_adj_close(self) -> "OhlcvDailySchema":
+        """Use close as adjusted close when not provided."""
+        if self.adj_close is None:
+            self.adj_close = self.close
+        return self
+
+
+class OhlcvDailyRepository:
+    """
+    Repository for accessing daily OHLCV bars in TimescaleDB.
+
+    Writes go through COPY into a staging table and a single upsert;
+    reads return columnar lists keyed by ticker. Writes run under the
+    "ingest" session profile, multi-year reads under "analytics".
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        profiles: Optional[bool] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        compression: Optional[CompressionManager] = None,
+    ):
+        """
+        Initialize repository with database session.
+
+        Args:
+            session: SQLAlchemy session
+            profiles: Apply a session profile per method (default: the
+                ``db_session_profiles`` setting)
+            retry: Retries of transient bulk_upsert failures (default:
+                ``db_write_attempts`` attempts with exponential backoff)
+            breaker: Circuit breaker guarding writes (default: the
+                process-wide WRITE_BREAKER)
+            compression: Manager decompressing the chunks bulk_upsert writes
+                to, as in CopyWriter (None when no compressed chunk is in range)
+        """
+        settings = get_settings()
+        self.session = session
+        self.profiles = settings.db_session_profiles if profiles is None else profiles
+        self.retry = retry or RetryPolicy(attempts=settings.db_write_attempts)
+        self.breaker = breaker or WRITE_BREAKER
+        self.compression = compression
+
+    def _apply_profile(self, name: str) -> None:
+        """Run the current transaction under a named session profile."""
+        if self.profiles:
+            apply_profile(self.session, get_profile(name))
+
+    def bulk_upsert(self, bars: list[dict[str, Any]], batch_size: int | None = None) -> int:
+        """
+        Validate and upsert daily bars using COPY.
+
+        Existing (ticker, date) rows are overwritten with the new values,
+        including bars rolled up from real_time (source becomes 'external').
+        The upsert is idempotent, so transient failures roll back and retry
+        the whole call, as in QuoteRepository.bulk_insert. With a
+        CompressionManager, compressed chunks are decompressed on first
+        write like backfills through CopyWriter.
+
+        Args:
+            bars: List of dicts with keys: ticker, date, open, high, low,
+                close, adj_close (optional, defaults to close), volume
+            batch_size: Number of records per COPY batch (None for all)
+
+        Returns:
+            Number of bars inserted or updated
+
+        Raises:
+            ValidationError: If bar data is invalid
+            CircuitOpenError: If the write circuit breaker is open
+
+        Example:
+            >>> count = repo.bulk_upsert([{
+            ...     "ticker": "AAPL", "date": dt.date(2024, 1, 2),
+            ...     "open": 187.15, "high": 188.44, "low": 183.89,
+            ...     "close": 185.64, "volume": 82488700,
+            ... }])
+            >>> print(count)
+            1
+        """
+        if not bars:
+            return 0
+
+        validated = validate_records(OhlcvDailySchema, bars)
+        rows = [tuple(bar[c] for c in OHLCV_COLUMNS) for bar in validated]
+
+        return call_with_retry(
+            lambda: self._write(rows, batch_size),
+            "bulk_upsert",
+            session_policy(self.session, self.retry),
+            self.breaker,
+            on_retry=lambda _: reset_session(self.session),
+        )
+
+    def _write(self, rows: list[tuple[Any, ...]], batch_size: int | None) -> int:
+        """Upsert rows, decompressing the compressed chunks they fall into first."""
+        if self.compression is not None:
+            return self.compression.merge(rows, lambda merged: self._upsert(merged, batch_size))
+        return self._upsert(rows, batch_size)
+
+    def _upsert(self, rows: Sequence[tuple[Any, ...]], batch_size: int | None) -> int:
+        """Upsert rows in one transaction and commit."""
+        self._apply_profile("ingest")
+        cursor = self.session.connection().connection.cursor()
+        try:
+            written = 0
+            for batch in iter_batches(rows, batch_size):
+                written += copy_upsert(
+                    cursor,
+                    OhlcvDaily.__table__,
+                    OHLCV_COLUMNS,
+                    batch,
+                    ("ticker", "date"),
+                    constants=EXTERNAL_CONSTANTS,
+                )
+        finally:
+            cursor.close()
+
+        self.session.commit()
+
+        return written
+
+    def get_bars(
+        self, tickers: str | list[str], start_date: dt.date, end_date: dt.date
+    ) -> dict[str, dict[str, list[Any]]]:
+        """
+        Retrieve daily bars for one or many tickers in a date range.
+
+        Args:
+            tickers: Ticker symbol or list of symbols
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+
+        Returns:
+            Dict keyed by ticker with columnar lists: date, open, high, low,
+            close, adj_close, volume (ordered by date ASC)
+
+        Example:
+            >>> bars = repo.get_bars(["AAPL", "MSFT"], dt.date(2024, 1, 1), dt.date(2024, 12, 31))
+            >>> len(bars["AAPL"]["close"])
+            252
+        """
+        if isinstance(tickers, str):
+            tickers = [tickers]
+
+        self._apply_profile("analytics")
+        stmt = (
+            select(*(getattr(OhlcvDaily, c) for c in OHLCV_COLUMNS))
+            .where(
+                OhlcvDaily.ticker.in_([t.upper() for t in tickers]),
+                OhlcvDaily.date >= start_date,
+                OhlcvDaily.date <= end_date,
+            )
+            .order_by(OhlcvDaily.ticker.asc(), OhlcvDaily.date.asc())
+        )
+
+        return self._to_columns(self.session.execute(stmt))
+
+    def get_latest_bar(self, ticker: str) -> Optional[OhlcvDaily]:
+        """
+        Get most recent daily bar for ticker.
+
+        Args:
+            ticker: Ticker symbol
+
+        Returns:
+            Most recent bar or None if not found
+        """
+        self._apply_profile("interactive")
+        stmt = (
+            select(OhlcvDaily)
+            .where(OhlcvDaily.ticker == ticker.upper())
+            .order_by(OhlcvDaily.date.desc())
+            .limit(1)
+        )
+
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def resample(
+        self, tickers: str | list[str], start_date: dt.date, end_date: dt.date, period: str = "week"
+    ) -> dict[str, dict[str, list[Any]]]:
+        """
+        Aggregate daily bars into weekly or monthly bars in the database.
+
+        Args:
+            tickers: Ticker symbol or list of symbols
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            period: "week" (ISO weeks starting Monday) or "month"
+
+        Returns:
+            Same columnar shape as get_bars; ``date`` is the period start
+
+        Raises:
+            ValueError: If period is unknown
+        """
+        if period not in RESAMPLE_PERIODS:
+            raise ValueError(f"Unknown period {period!r}, expected one of {list(RESAMPLE_PERIODS)}")
+        if isinstance(tickers, str):
+            tickers = [tickers]
+
+        self._apply_profile("analytics")
+        bar = OhlcvDaily
+        stmt = (
+            select(
+                bar.ticker,
+                cast(func.date_trunc(period, bar.date), Date).label("period"),
+                func.first(bar.open, bar.date),
+                func.max(bar.high),
+                func.min(bar.low),
+                func.last(bar.close, bar.date),
+                func.last(bar.adj_close, bar.date),
+                func.sum(bar.volume),
+            )
+            .where(
+                bar.ticker.in_([t.upper() for t in tickers]),
+                bar.date >= start_date,
+                bar.date <= end_date,
+            )
+            .group_by(bar.ticker, literal_column("period"))
+            .order_by(bar.ticker.asc(), literal_column("period").asc())
+        )
+
+        return self._to_columns(self.session.execute(stmt))
+
+    def _to_columns(self, rows: Any) -> dict[str, dict[str, list[Any]]]:
+        """Pivot (ticker, date, open, ..., volume) rows into columnar lists."""
+        series: dict[str, dict[str, list[Any]]] = {}
+        names = OHLCV_COLUMNS[1:]
+        for ticker, *values in rows:
+            columns = series.setdefault(ticker, {name: [] for name in names})
+            for name, value in zip(names, values, strict=True):
+                columns[name].append(value)
+        return series
@@ -0,0 +1,152 @@
+"""Capture and summarize PostgreSQL query plans of repository calls."""
+
+import json
+from collections.abc import Callable, Iterator
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy.engine import Connection, Engine
+
+from .slowlog import SlowQueryRecorder
+
+# Plan nodes reading a relation directly
+SCAN_NODES = ("Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+
+
+class PlanSummary(BaseModel):
+    """
+    Properties of one query plan checked by plan regression tests.
+
+    Attributes:
+        node_types: Node types in depth-first order
+        scanned: Relations scanned (with ANALYZE: only those actually executed)
+        seq_scanned: Relations read by a sequential scan
+        indexes: Indexes used
+        has_sort: Whether the plan sorts
+        planning_ms: Planning time (None without ANALYZE)
+        execution_ms: Execution time (None without ANALYZE)
+        shared_hit_blocks: Buffer hits of the top node (None without BUFFERS)
+        shared_read_blocks: Buffer reads of the top node (None without BUFFERS)
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    node_types: tuple[str, ...] = ()
+    scanned: tuple[str, ...] = ()
+    seq_scanned: tuple[str, ...] = ()
+    indexes: tuple[str, ...] = ()
+    has_sort: bool = False
+    planning_ms: Optional[float] = None
+    execution_ms: Optional[float] = None
+    shared_hit_blocks: Optional[int] = None
+    shared_read_blocks: Optional[int] = None
+
+
+def walk(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    Iterate over a plan node and its descendants, depth first.
+
+    Args:
+        node: Plan node from EXPLAIN (FORMAT JSON)
+
+    Yields:
+        Plan nodes
+    """
+    yield node
+    for child in node.get("Plans", ()):
+        yield from walk(child)
+
+
+def summarize(explain: Any) -> PlanSummary:
+    """
+    Summarize EXPLAIN (FORMAT JSON) output.
+
+    Scan nodes never executed under ANALYZE (``Actual Loops`` = 0, chunks
+    excluded at run time) are not counted as scanned.
+
+    Args:
+        explain: EXPLAIN output as JSON text or parsed list
+
+    Returns:
+        PlanSummary
+    """
+    if isinstance(explain, str):
+        explain = json.loads(explain)
+    root = explain[0]
+    nodes = list(walk(root["Plan"]))
+
+    scanned, seq_scanned, indexes = [], [], []
+    for node in nodes:
+        if node["Node Type"] in SCAN_NODES and node.get("Actual Loops", 1) > 0:
+            scanned.append(node["Relation Name"])
+            if node["Node Type"] == "Seq Scan":
+                seq_scanned.append(node["Relation Name"])
+        if "Index Name" in node:
+            indexes.append(node["Index Name"])
+
+    return PlanSummary(
+        node_types=tuple(node["Node Type"] for node in nodes),
+        scanned=tuple(scanned),
+        seq_scanned=tuple(seq_scanned),
+        indexes=tuple(dict.fromkeys(indexes)),
+        has_sort=any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes),
+        planning_ms=root.get("Planning Time"),
+        execution_ms=root.get("Execution Time"),
+        shared_hit_blocks=root["Plan"].get("Shared Hit Blocks"),
+        shared_read_blocks=root["Plan"].get("Shared Read Blocks"),
+    )
+
+
+def explain_statement(
+    conn: Connection, statement: str, parameters: Any = None, analyze: bool = True
+) -> list[dict[str, Any]]:
+    """
+    EXPLAIN a driver-level statement in a transaction that is rolled back.
+
+    Args:
+        conn: SQLAlchemy connection
+        statement: SQL as sent to the driver
+        parameters: Bound parameters
+        analyze: Execute the statement (adds timings and buffers)
+
+    Returns:
+        Parsed EXPLAIN (FORMAT JSON) output
+    """
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    try:
+        plan = conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters or ()).scalar()
+    finally:
+        conn.rollback()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+def capture_plans(
+    engine: Engine, call: Callable[[], Any], analyze: bool = True
+) -> list[PlanSummary]:
+    """
+    Run a repository call and EXPLAIN every statement it executed.
+
+    The call runs normally while its statements are recorded through
+    cursor events; each is then replayed under EXPLAIN with the same
+    parameters.
+
+    Args:
+        engine: Engine the call's session is bound to
+        call: Zero-argument callable, e.g. ``lambda: repo.get_quotes(...)``
+        analyze: Execute the statements (adds timings and buffers)
+
+    Returns:
+        One PlanSummary per statement, in execution order
+    """
+    recorder = SlowQueryRecorder(threshold_ms=0)
+    recorder.attach(engine)
+    try:
+        call()
+    finally:
+        recorder.detach(engine)
+
+    with engine.connect() as conn:
+        return [
+            summarize(explain_statement(conn, query.statement, query.parameters, analyze))
+            for query in recorder.queries
+        ]
@@ -0,0 +1,150 @@
+"""Server-side prepared statements for the hot quotes.real_time paths."""
+
+from typing import Any, NamedTuple
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from . import metrics
+from .models import RealTimeQuote
+
+# Connection.info key: names prepared on the underlying DBAPI connection.
+# SQLAlchemy clears info when a connection is invalidated or closed, so the
+# cache never outlives the server session holding the statements.
+_CACHE_KEY = "prepared_statements"
+
+# invalid_sql_statement_name: EXECUTE of a statement the server does not
+# know, e.g. after DISCARD ALL or behind a transaction-pooling PgBouncer
+_UNKNOWN_STATEMENT = "26000"
+
+COLUMNS = tuple(column.name for column in RealTimeQuote.__table__.columns)
+
+_TYPES = {
+    column.name: column.type.compile(dialect=postgresql.dialect())
+    for column in RealTimeQuote.__table__.columns
+}
+
+
+class PreparedStatement(NamedTuple):
+    """
+    A named statement prepared once per connection.
+
+    Attributes:
+        name: Server-side statement name
+        prepare: PREPARE command (no client-side parameters)
+        execute: EXECUTE command with SQLAlchemy bind parameters
+    """
+
+    name: str
+    prepare: str
+    execute: str
+
+
+LATEST_QUOTE = PreparedStatement(
+    "opa_latest_quote",
+    "PREPARE opa_latest_quote (TEXT) AS "
+    f"SELECT {', '.join(COLUMNS)} FROM quotes.real_time "
+    "WHERE symbol = $1 ORDER BY timestamp DESC LIMIT 1",
+    "EXECUTE opa_latest_quote(:symbol)",
+)
+
+# LIMIT NULL returns all rows, so one statement serves calls with and
+# without a limit
+QUOTES_RANGE = PreparedStatement(
+    "opa_quotes_range",
+    "PREPARE opa_quotes_range (TEXT, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE, BIGINT) "
+    f"AS SELECT {', '.join(COLUMNS)} FROM quotes.real_time "
+    "WHERE symbol = $1 AND timestamp >= $2 AND timestamp <= $3 "
+    "ORDER BY timestamp ASC LIMIT $4",
+    "EXECUTE opa_quotes_range(:symbol, :start_date, :end_date, :limit)",
+)
+
+# One array per column, unnested server-side: the statement text (and its
+# cached plan) is the same whatever the batch size
+INSERT_QUOTES = PreparedStatement(
+    "opa_insert_quotes",
+    f"PREPARE opa_insert_quotes ({', '.join(f'{_TYPES[c]}[]' for c in COLUMNS)}) "
+    f"AS INSERT INTO quotes.real_time ({', '.join(COLUMNS)}) "
+    f"SELECT * FROM unnest({', '.join(f'${i}' for i in range(1, len(COLUMNS) + 1))})",
+    # Casts type all-NULL arrays, which the driver sends as text[]
+    f"EXECUTE opa_insert_quotes({', '.join(f'CAST(:{c} AS {_TYPES[c]}[])' for c in COLUMNS)})",
+)
+
+STATEMENTS = (LATEST_QUOTE, QUOTES_RANGE, INSERT_QUOTES)
+
+
+def supports_prepared(conn: Connection) -> bool:
+    """
+    Whether explicit PREPARE/EXECUTE can be used on a connection.
+
+    Args:
+        conn: SQLAlchemy connection
+
+    Returns:
+        True for PostgreSQL through psycopg2
+    """
+    return conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+
+
+def prepare(conn: Connection, statement: PreparedStatement) -> bool:
+    """
+    PREPARE a statement on a connection unless it already is.
+
+    PREPARE is not transactional: the statement stays for the life of the
+    server session even if the surrounding transaction rolls back.
+
+    Args:
+        conn: SQLAlchemy connection
+        statement: Statement to prepare
+
+    Returns:
+        True if PREPARE was issued, False on a cache hit
+    """
+    prepared = conn.info.setdefault(_CACHE_KEY, set())
+    if statement.name in prepared:
+        return False
+    conn.exec_driver_sql(statement.prepare)
+    prepared.add(statement.name)
+    metrics.STATEMENT_PREPARES.labels(statement.name).inc()
+    return True
+
+
+def prepare_all(conn: Connection) -> int:
+    """
+    PREPARE every hot statement on a connection (used by warm-up).
+
+    Args:
+        conn: SQLAlchemy connection
+
+    Returns:
+        Number of statements newly prepared
+    """
+    return sum(prepare(conn, statement) for statement in STATEMENTS)
+
+
+def forget(conn: Connection, error: DBAPIError) -> None:
+    """
+    Drop a connection's cache if the server no longer knows a statement.
+
+    The next call on the connection prepares again.
+
+    Args:
+        conn: SQLAlchemy connection the error was raised on
+        error: Error raised by EXECUTE
+    """
+    if getattr(error.orig, "pgcode", None) == _UNKNOWN_STATEMENT:
+        conn.info.pop(_CACHE_KEY, None)
+
+
+def columns(records: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    """
+    Transpose validated records into INSERT_QUOTES array parameters.
+
+    Args:
+        records: Validated records
+
+    Returns:
+        Dict of column name to values, one per record
+    """
+    return {column: [record.get(column) for record in records] for column in COLUMNS}
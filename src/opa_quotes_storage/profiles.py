@@ -0,0 +1,149 @@
+"""Named session tuning profiles for ingest, analytics and interactive work."""
+
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+# Session.info key: (transaction, profile) last applied with SET LOCAL
+_APPLIED_KEY = "session_profile"
+
+# Connection.info key: profile set at connect time by get_engine(profile=...)
+DEFAULT_PROFILE_KEY = "default_session_profile"
+
+
+class SessionProfile(BaseModel):
+    """
+    Server settings for one kind of work.
+
+    Attributes:
+        name: Profile name
+        settings: PostgreSQL settings (GUC name to value)
+        batch_size: Rows per write batch, for write profiles
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    settings: dict[str, str] = {}
+    batch_size: Optional[int] = None
+
+    def options(self) -> str:
+        """
+        libpq ``options`` applying the settings at connect time.
+
+        Returns:
+            String like ``-c work_mem=64MB -c synchronous_commit=off``
+        """
+        return " ".join(f"-c {name}={_escape(value)}" for name, value in self.settings.items())
+
+
+# Bulk writes: commits return before the WAL is flushed. A crash can lose
+# the last ~3 x wal_writer_delay (600 ms by default) of acknowledged
+# batches but never corrupts data; larger batches and work_mem cut
+# round trips and spills when merging.
+INGEST = SessionProfile(
+    name="ingest",
+    settings={"synchronous_commit": "off", "work_mem": "64MB"},
+    batch_size=5000,
+)
+
+# Scans and aggregations over many chunks
+ANALYTICS = SessionProfile(
+    name="analytics",
+    settings={
+        "work_mem": "256MB",
+        "max_parallel_workers_per_gather": "4",
+        "statement_timeout": "300s",
+    },
+)
+
+# Request-path point and range reads: fail fast instead of queueing
+INTERACTIVE = SessionProfile(
+    name="interactive",
+    settings={"statement_timeout": "2s"},
+)
+
+# Profiles by name; replace entries at startup to tune a deployment
+PROFILES: dict[str, SessionProfile] = {p.name: p for p in (INGEST, ANALYTICS, INTERACTIVE)}
+
+
+def get_profile(name: str) -> SessionProfile:
+    """
+    Look up a profile by name.
+
+    Args:
+        name: Profile name (ingest, analytics, interactive)
+
+    Returns:
+        SessionProfile
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown session profile {name!r}, expected one of {list(PROFILES)}"
+        ) from None
+
+
+def apply_profile(session: Session, profile: SessionProfile) -> bool:
+    """
+    Apply a profile to the session's current transaction.
+
+    Uses ``set_config(name, value, true)`` (``SET LOCAL``) in a single
+    statement, so settings end with the transaction, never leak to the
+    next user of a pooled connection, and work behind PgBouncer in
+    transaction pooling mode. Nothing is sent when the transaction already
+    runs under the profile, or when the connection was opened with it and
+    no other profile was applied in the transaction. Switching profiles
+    mid-transaction resets the settings other profiles changed and this
+    one does not to their connection defaults.
+
+    Args:
+        session: SQLAlchemy session
+        profile: Profile to apply
+
+    Returns:
+        True if the settings were sent
+    """
+    applied = session.info.get(_APPLIED_KEY)
+    if not profile.settings and applied is None:
+        return False
+    conn: Connection = session.connection()
+    if conn.dialect.name != "postgresql":
+        return False
+    transaction = session.get_transaction()
+    if applied is not None and applied[0] is transaction:
+        if applied[1].name == profile.name:
+            return False
+        changed = set(applied[1].settings).union(*(p.settings for p in PROFILES.values()))
+        resets = sorted(changed - set(profile.settings))
+    elif conn.info.get(DEFAULT_PROFILE_KEY) == profile.name or not profile.settings:
+        return False
+    else:
+        resets = []
+
+    names = list(profile.settings)
+    calls = [f"set_config(:name_{i}, :value_{i}, true)" for i in range(len(names))]
+    params = {f"name_{i}": name for i, name in enumerate(names)}
+    params.update({f"value_{i}": profile.settings[name] for i, name in enumerate(names)})
+    # reset_val is the connection default, including libpq options
+    for i, name in enumerate(resets):
+        calls.append(
+            f"set_config(:reset_{i}, "
+            f"(SELECT reset_val FROM pg_settings WHERE name = :reset_{i}), true)"
+        )
+        params[f"reset_{i}"] = name
+    session.execute(text(f"SELECT {', '.join(calls)}"), params)
+    session.info[_APPLIED_KEY] = (transaction, profile)
+    return True
+
+
+def _escape(value: str) -> str:
+    """Escape backslashes and spaces in a libpq ``options`` value."""
+    return value.replace("\\", "\\\\").replace(" ", "\\ ")
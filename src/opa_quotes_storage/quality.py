@@ -0,0 +1,251 @@
+"""Set-based data-quality report for quotes.ohlcv_daily."""
+
+import datetime as dt
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from sqlalchemy.engine import Engine
+
+from .trading_calendar import US_EQUITIES, TradingSession
+
+logger = logging.getLogger(__name__)
+
+# Missing sessions tolerated between two stored bars before a gap is reported
+# (1 absorbs a single exchange holiday absent from the calendar)
+DEFAULT_MAX_MISSING_SESSIONS = 1
+
+# Tickers checked per query
+DEFAULT_CHUNK_SIZE = 200
+
+# One statement per chunk of tickers. Expected sessions are generated once
+# and numbered, so a gap is a jump in session index between consecutive bars;
+# only the per-ticker aggregates (and gap bounds) leave the server.
+QUALITY_SQL = """
+WITH bars AS (
+    SELECT ticker, date, open, high, low, close, volume
+    FROM quotes.ohlcv_daily
+    WHERE ticker = ANY(%(tickers)s)
+      AND (%(start_date)s::date IS NULL OR date >= %(start_date)s::date)
+      AND (%(end_date)s::date IS NULL OR date <= %(end_date)s::date)
+),
+sessions AS (
+    SELECT d::date AS date, ROW_NUMBER() OVER (ORDER BY d) AS idx
+    FROM generate_series(
+        COALESCE(%(start_date)s::date, (SELECT MIN(date) FROM bars)),
+        COALESCE(%(end_date)s::date, (SELECT MAX(date) FROM bars)),
+        INTERVAL '1 day'
+    ) AS d
+    WHERE EXTRACT(ISODOW FROM d) = ANY(%(weekdays)s)
+      AND NOT d::date = ANY(%(holidays)s::date[])
+),
+steps AS (
+    SELECT b.ticker, b.date, s.idx,
+           LAG(b.date) OVER w AS prev_date,
+           LAG(s.idx) OVER w AS prev_idx
+    FROM bars b
+    JOIN sessions s USING (date)
+    WINDOW w AS (PARTITION BY b.ticker ORDER BY b.date)
+),
+gaps AS (
+    SELECT ticker,
+           SUM(idx - prev_idx - 1) AS missing_sessions,
+           ARRAY_AGG(ARRAY[prev_date, date] ORDER BY date) AS gaps
+    FROM steps
+    WHERE idx - prev_idx - 1 > %(max_missing_sessions)s
+    GROUP BY ticker
+),
+stats AS (
+    SELECT b.ticker,
+           COUNT(*) AS record_count,
+           MIN(b.date) AS min_date,
+           MAX(b.date) AS max_date,
+           COUNT(*) - COUNT(DISTINCT b.date) AS duplicate_days,
+           COUNT(*) FILTER (
+               WHERE b.high < GREATEST(b.open, b.close) OR b.low > LEAST(b.open, b.close)
+           ) AS ohlc_violations,
+           COUNT(*) FILTER (WHERE b.volume <= 0) AS bad_volume,
+           COUNT(*) FILTER (WHERE s.date IS NULL) AS off_calendar
+    FROM bars b
+    LEFT JOIN sessions s USING (date)
+    GROUP BY b.ticker
+)
+SELECT t.ticker,
+       COALESCE(st.record_count, 0),
+       st.min_date,
+       st.max_date,
+       COALESCE(g.missing_sessions, 0),
+       COALESCE(g.gaps, '{}'),
+       COALESCE(st.ohlc_violations, 0),
+       COALESCE(st.bad_volume, 0),
+       COALESCE(st.duplicate_days, 0),
+       COALESCE(st.off_calendar, 0)
+FROM unnest(%(tickers)s::text[]) AS t(ticker)
+LEFT JOIN stats st USING (ticker)
+LEFT JOIN gaps g USING (ticker)
+WHERE %(include_clean)s
+   OR st.ticker IS NULL
+   OR g.ticker IS NOT NULL
+   OR st.ohlc_violations > 0
+   OR st.bad_volume > 0
+   OR st.duplicate_days > 0
+   OR st.off_calendar > 0
+ORDER BY t.ticker
+"""
+
+REPORT_COLUMNS = (
+    "ticker",
+    "record_count",
+    "min_date",
+    "max_date",
+    "missing_sessions",
+    "gaps",
+    "ohlc_violations",
+    "bad_volume",
+    "duplicate_days",
+    "off_calendar",
+)
+
+
+def is_anomaly(entry: dict[str, Any]) -> bool:
+    """
+    Check whether a report entry has any anomaly.
+
+    Args:
+        entry: Entry returned by check_tickers
+
+    Returns:
+        True if the ticker has no rows, gaps or any failed check
+    """
+    return entry["record_count"] == 0 or any(
+        entry[key]
+        for key in ("gaps", "ohlc_violations", "bad_volume", "duplicate_days", "off_calendar")
+    )
+
+
+def check_tickers(
+    cursor: Any,
+    tickers: Sequence[str],
+    start_date: Optional[dt.date] = None,
+    end_date: Optional[dt.date] = None,
+    calendar: TradingSession = US_EQUITIES,
+    max_missing_sessions: int = DEFAULT_MAX_MISSING_SESSIONS,
+    anomalies_only: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Run the quality checks for a set of tickers in one query.
+
+    Checks per ticker: record count and date range, gaps of more than
+    ``max_missing_sessions`` expected sessions, OHLC consistency
+    (high >= max(open, close), low <= min(open, close)), zero/negative
+    volume, duplicate days and bars on non-session days. Tickers without
+    any rows are always reported.
+
+    Args:
+        cursor: psycopg2 cursor
+        tickers: Ticker symbols to check
+        start_date: First date checked (None for each chunk's first bar)
+        end_date: Last date checked, inclusive (None for the last bar)
+        calendar: Trading calendar providing session weekdays and holidays
+        max_missing_sessions: Missing sessions tolerated between bars
+        anomalies_only: Return only tickers with at least one anomaly
+
+    Returns:
+        List of dicts keyed by REPORT_COLUMNS, ordered by ticker; ``gaps`` is
+        a list of (last date before, first date after) pairs
+
+    Example:
+        >>> with conn.cursor() as cursor:
+        ...     report = check_tickers(cursor, ["AAPL", "MSFT"])
+        >>> report[0]["gaps"]
+        [(datetime.date(2024, 1, 2), datetime.date(2024, 1, 15))]
+    """
+    if not tickers:
+        return []
+
+    cursor.execute(
+        QUALITY_SQL,
+        {
+            "tickers": list(tickers),
+            "start_date": start_date,
+            "end_date": end_date,
+            "weekdays": sorted(calendar.weekdays),
+            "holidays": sorted(calendar.holidays),
+            "max_missing_sessions": max_missing_sessions,
+            "include_clean": not anomalies_only,
+        },
+    )
+
+    report = []
+    for row in cursor.fetchall():
+        entry = dict(zip(REPORT_COLUMNS, row, strict=True))
+        entry["gaps"] = [tuple(gap) for gap in entry["gaps"]]
+        report.append(entry)
+    return report
+
+
+def quality_report(
+    engine: Engine,
+    tickers: Optional[Sequence[str]] = None,
+    start_date: Optional[dt.date] = None,
+    end_date: Optional[dt.date] = None,
+    calendar: TradingSession = US_EQUITIES,
+    max_missing_sessions: int = DEFAULT_MAX_MISSING_SESSIONS,
+    anomalies_only: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 4,
+) -> list[dict[str, Any]]:
+    """
+    Data-quality report for many tickers, chunks checked in parallel.
+
+    Args:
+        engine: SQLAlchemy engine (one pooled connection per worker)
+        tickers: Tickers to check (None for every ticker in ohlcv_daily)
+        start_date: First date checked (None for each ticker's first bar)
+        end_date: Last date checked, inclusive (None for the last bar)
+        calendar: Trading calendar providing session weekdays and holidays
+        max_missing_sessions: Missing sessions tolerated between bars
+        anomalies_only: Return only tickers with at least one anomaly
+        chunk_size: Tickers per query
+        workers: Chunks checked concurrently
+
+    Returns:
+        Entries as returned by check_tickers, ordered by ticker
+
+    Example:
+        >>> anomalies = quality_report(get_engine(), start_date=dt.date(2017, 1, 1))
+        >>> [a["ticker"] for a in anomalies if a["ohlc_violations"]]
+        ['XYZ']
+    """
+    if tickers is None:
+        with engine.connect() as conn:
+            tickers = list(
+                conn.exec_driver_sql(
+                    "SELECT DISTINCT ticker FROM quotes.ohlcv_daily ORDER BY ticker"
+                ).scalars()
+            )
+
+    chunks = [tickers[i : i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+
+    def check(chunk: Sequence[str]) -> list[dict[str, Any]]:
+        conn = engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                return check_tickers(
+                    cursor,
+                    chunk,
+                    start_date,
+                    end_date,
+                    calendar,
+                    max_missing_sessions,
+                    anomalies_only,
+                )
+        finally:
+            conn.close()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quality") as pool:
+        report = [entry for entries in pool.map(check, chunks) for entry in entries]
+
+    logger.info(f"Quality report: {len(report)} of {len(tickers)} tickers reported")
+    return sorted(report, key=lambda entry: entry["ticker"])
@@ -1,14 +1,78 @@
 """Repository for quote data access with validation."""
 
-from datetime import UTC, datetime
+import logging
+import time
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
-from sqlalchemy import and_, insert, select
-from sqlalchemy.orm import Session
-
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+from sqlalchemy import (
+    Float,
+    Select,
+    and_,
+    cast,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.engine import Connection, Result
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from . import metrics
+from .bulk import iter_batches, validate_records
+from .config import get_settings
+from .freshness import FreshnessMonitor
+from .metrics import instrument
 from .models import RealTimeQuote
+from .prepared import (
+    INSERT_QUOTES,
+    LATEST_QUOTE,
+    QUOTES_RANGE,
+    PreparedStatement,
+    columns,
+    forget,
+    prepare,
+    supports_prepared,
+)
+from .profiles import INGEST, apply_profile, get_profile
+from .resilience import (
+    WRITE_BREAKER,
+    CircuitBreaker,
+    RetryPolicy,
+    call_with_retry,
+    is_transient,
+    reset_session,
+    session_policy,
+)
+from .trading_calendar import TradingSession
+
+logger = logging.getLogger(__name__)
+
+# Bucket widths accepted by interval-based queries
+INTERVALS = {
+    "1m": timedelta(minutes=1),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "30m": timedelta(minutes=30),
+    "1h": timedelta(hours=1),
+}
+
+# Gap fill strategies for get_gapfilled_series
+FILL_STRATEGIES = ("locf", "interpolate", "none")
+
+# EXECUTEs of the prepared reads, mapped onto RealTimeQuote
+_LATEST_QUOTE_STMT = select(RealTimeQuote).from_statement(
+    text(LATEST_QUOTE.execute).columns(*RealTimeQuote.__table__.columns)
+)
+_QUOTES_RANGE_STMT = select(RealTimeQuote).from_statement(
+    text(QUOTES_RANGE.execute).columns(*RealTimeQuote.__table__.columns)
+)
+_INSERT_QUOTES_STMT = text(INSERT_QUOTES.execute)
 
 
 class QuoteSchema(BaseModel):
@@ -50,31 +114,101 @@ class QuoteRepository:
 
     Provides high-performance bulk insert and query operations
     optimized for time-series data.
+
+    On PostgreSQL (psycopg2), get_latest_quote, get_quotes and bulk_insert
+    run as server-side prepared statements, prepared once per pooled
+    connection. Disable them (``DB_PREPARED_STATEMENTS=false`` or
+    ``prepared=False``) behind PgBouncer in transaction pooling mode,
+    where consecutive transactions may run on different server sessions.
+
+    Each method runs its transaction under a session profile (``SET
+    LOCAL``): bulk_insert under "ingest" (asynchronous commit), point and
+    range reads under "interactive" (tight statement timeout), scans and
+    aggregations under "analytics" (parallel workers, more work_mem).
     """
 
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        freshness: Optional[FreshnessMonitor] = None,
+        prepared: Optional[bool] = None,
+        profiles: Optional[bool] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         """
         Initialize repository with database session.
 
         Args:
             session: SQLAlchemy session
+            freshness: Monitor fed with every committed bulk_insert batch
+            prepared: Use server-side prepared statements (default: the
+                ``db_prepared_statements`` setting)
+            profiles: Apply a session profile per method (default: the
+                ``db_session_profiles`` setting)
+            retry: Retries of transient bulk_insert failures (default:
+                ``db_write_attempts`` attempts with exponential backoff)
+            breaker: Circuit breaker guarding writes (default: the
+                process-wide WRITE_BREAKER)
         """
+        settings = get_settings()
         self.session = session
-
-    def bulk_insert(self, quotes: list[dict[str, Any]], batch_size: int | None = 1000) -> int:
+        self.freshness = freshness
+        self.prepared = settings.db_prepared_statements if prepared is None else prepared
+        self.profiles = settings.db_session_profiles if profiles is None else profiles
+        self.retry = retry or RetryPolicy(attempts=settings.db_write_attempts)
+        self.breaker = breaker or WRITE_BREAKER
+
+    def _apply_profile(self, name: str) -> None:
+        """Run the current transaction under a named session profile."""
+        if self.profiles:
+            apply_profile(self.session, get_profile(name))
+
+    def _prepared_connection(self) -> Optional[Connection]:
+        """Session connection to run prepared statements on, or None for plain SQL."""
+        if not self.prepared:
+            return None
+        conn = self.session.connection()
+        return conn if supports_prepared(conn) else None
+
+    def _execute_prepared(
+        self, conn: Connection, statement: PreparedStatement, stmt: Any, params: dict[str, Any]
+    ) -> Result:
+        """Prepare a statement on the connection if needed, then EXECUTE it."""
+        prepare(conn, statement)
+        try:
+            return self.session.execute(stmt, params)
+        except DBAPIError as e:
+            forget(conn, e)
+            raise
+
+    def bulk_insert(
+        self, quotes: list[dict[str, Any]], batch_size: int | None = INGEST.batch_size
+    ) -> int:
         """
         Insert batch of quotes efficiently with validation.
 
+        The whole call is one transaction. Transient failures (lost
+        connection, serialization failure, deadlock) roll it back and
+        retry it with backoff, unless the session also holds other
+        pending changes the rollback would discard; while the database
+        keeps failing, the circuit breaker rejects calls without trying.
+        If the connection is lost during commit and the retry then
+        conflicts, the batch's keys are read back: when all are stored the
+        first commit went through and the call succeeds.
+
         Args:
                  quotes: List of dicts with keys: symbol, timestamp, open, high,
                      low, close, volume, bid, ask, source
-                 batch_size: Number of records per insert batch (None for all)
+                 batch_size: Number of records per insert batch (None for all;
+                     default: the ingest profile's batch size)
 
         Returns:
             Number of quotes inserted
 
         Raises:
             ValidationError: If quote data is invalid
+            CircuitOpenError: If the write circuit breaker is open
 
         Example:
             >>> quotes = [{
@@ -91,23 +225,79 @@ class QuoteRepository:
             return 0
 
         # Validate with Pydantic
-        validated = [QuoteSchema(**q).model_dump() for q in quotes]
+        start = time.perf_counter()
+        try:
+            validated = validate_records(QuoteSchema, quotes)
+        except ValidationError:
+            metrics.REJECTED_RECORDS.labels("bulk_insert").inc(len(quotes))
+            raise
+        validated_at = time.perf_counter()
+        metrics.INSERT_VALIDATION_SECONDS.observe(validated_at - start)
 
         if not validated:
             return 0
 
         stmt = insert(RealTimeQuote)
-
-        if batch_size is None or batch_size <= 0:
-            batch_size = len(validated)
-
-        for i in range(0, len(validated), batch_size):
-            self.session.execute(stmt, validated[i : i + batch_size])
-
-        self.session.commit()
-
+        policy = session_policy(self.session, self.retry)
+        commit_lost = False
+
+        def write() -> None:
+            nonlocal commit_lost
+            self._apply_profile("ingest")
+            conn = self._prepared_connection()
+            for batch in iter_batches(validated, batch_size):
+                if conn is None:
+                    self.session.execute(stmt, batch)
+                else:
+                    self._execute_prepared(conn, INSERT_QUOTES, _INSERT_QUOTES_STMT, columns(batch))
+            try:
+                self.session.commit()
+            except Exception as e:
+                commit_lost = is_transient(e)
+                raise
+
+        try:
+            call_with_retry(
+                write,
+                "bulk_insert",
+                policy,
+                self.breaker,
+                on_retry=lambda _: reset_session(self.session),
+            )
+        except IntegrityError as e:
+            # 23505 = unique_violation (duplicate symbol/timestamp)
+            if getattr(e.orig, "pgcode", None) != "23505":
+                metrics.QUERY_ERRORS.labels("bulk_insert").inc()
+                raise
+            if commit_lost:
+                self.session.rollback()
+            if not commit_lost or not self._stored(validated, batch_size):
+                metrics.CONFLICTS.labels("bulk_insert").inc()
+                metrics.QUERY_ERRORS.labels("bulk_insert").inc()
+                raise
+            # Every row is stored: the commit that lost its connection went through
+            logger.warning("bulk_insert commit outcome was lost; its rows are committed")
+        except Exception:
+            metrics.QUERY_ERRORS.labels("bulk_insert").inc()
+            raise
+
+        metrics.INSERT_DB_SECONDS.observe(time.perf_counter() - validated_at)
+        metrics.INSERT_ROWS.observe(len(validated))
+        if self.freshness is not None:
+            self.freshness.observe(validated)
         return len(validated)
 
+    def _stored(self, quotes: list[dict[str, Any]], batch_size: int | None) -> bool:
+        """Whether a row exists for every (symbol, timestamp) of quotes."""
+        keys = list({(quote["symbol"], quote["timestamp"]) for quote in quotes})
+        key = tuple_(RealTimeQuote.symbol, RealTimeQuote.timestamp)
+        found = 0
+        for batch in iter_batches(keys, batch_size):
+            stmt = select(func.count()).select_from(RealTimeQuote).where(key.in_(batch))
+            found += self.session.execute(stmt).scalar_one()
+        return found == len(keys)
+
+    @instrument("get_quotes")
     def get_quotes(
         self, symbol: str, start_date: datetime, end_date: datetime, limit: Optional[int] = None
     ) -> list[RealTimeQuote]:
@@ -132,6 +322,27 @@ class QuoteRepository:
             >>> len(quotes)
             1000
         """
+        return self._get_quotes(symbol, start_date, end_date, limit)
+
+    def _get_quotes(
+        self, symbol: str, start_date: datetime, end_date: datetime, limit: Optional[int] = None
+    ) -> list[RealTimeQuote]:
+        """get_quotes without instrumentation, for instrumented callers."""
+        self._apply_profile("interactive")
+        conn = self._prepared_connection()
+        if conn is not None:
+            params = {
+                "symbol": symbol.upper(),
+                "start_date": start_date,
+                "end_date": end_date,
+                "limit": limit or None,
+            }
+            return list(
+                self._execute_prepared(conn, QUOTES_RANGE, _QUOTES_RANGE_STMT, params)
+                .scalars()
+                .all()
+            )
+
         stmt = (
             select(RealTimeQuote)
             .where(
@@ -149,6 +360,7 @@ class QuoteRepository:
 
         return list(self.session.execute(stmt).scalars().all())
 
+    @instrument("get_latest_quote")
     def get_latest_quote(self, symbol: str) -> Optional[RealTimeQuote]:
         """
         Get most recent quote for symbol.
@@ -165,6 +377,13 @@ class QuoteRepository:
             ...     print(f"Latest: ${quote.close}")
             Latest: $180.50
         """
+        self._apply_profile("interactive")
+        conn = self._prepared_connection()
+        if conn is not None:
+            return self._execute_prepared(
+                conn, LATEST_QUOTE, _LATEST_QUOTE_STMT, {"symbol": symbol.upper()}
+            ).scalar_one_or_none()
+
         stmt = (
             select(RealTimeQuote)
             .where(RealTimeQuote.symbol == symbol.upper())
@@ -174,6 +393,7 @@ class QuoteRepository:
 
         return self.session.execute(stmt).scalar_one_or_none()
 
+    @instrument("get_intraday_quotes")
     def get_intraday_quotes(
         self, symbol: str, date: datetime, interval: str = "1m"
     ) -> list[RealTimeQuote]:
@@ -203,8 +423,147 @@ class QuoteRepository:
         start = date.replace(hour=0, minute=0, second=0, microsecond=0)
         end = date.replace(hour=23, minute=59, second=59, microsecond=999999)
 
-        return self.get_quotes(symbol, start, end)
+        return self._get_quotes(symbol, start, end)
+
+    @instrument("get_gapfilled_series")
+    def get_gapfilled_series(
+        self,
+        symbols: str | list[str],
+        start_date: datetime,
+        end_date: datetime,
+        interval: str = "1m",
+        fill: str = "locf",
+        trading_session: Optional[TradingSession] = None,
+    ) -> dict[str, dict[str, list[Any]]]:
+        """
+        Get a regular (gap-filled) OHLCV grid for one or many symbols.
+
+        Bucketing and filling run in TimescaleDB via ``time_bucket_gapfill`` so
+        only the dense grid is shipped to the client.
+
+        Args:
+            symbols: Ticker symbol or list of symbols
+            start_date: Start of time range (inclusive)
+            end_date: End of time range (exclusive)
+            interval: Bucket width (1m, 5m, 15m, 30m, 1h)
+            fill: Close fill strategy: "locf" (carry last close forward, seeded
+                with the last close before start_date), "interpolate" (linear)
+                or "none" (leave empty buckets as None)
+            trading_session: Only keep buckets inside this session
+
+        Returns:
+            Dict keyed by symbol with columnar lists: timestamp, open, high,
+            low, close, volume. Filled buckets have open/high/low equal to the
+            filled close and volume 0. Symbols without quotes in the range
+            are omitted.
+
+        Raises:
+            ValueError: If interval or fill strategy is unknown
+
+        Example:
+            >>> grid = repo.get_gapfilled_series(
+            ...     ["AAPL", "MSFT"],
+            ...     datetime(2025, 12, 22, 14, 30, tzinfo=UTC),
+            ...     datetime(2025, 12, 22, 21, 0, tzinfo=UTC),
+            ...     trading_session=US_EQUITIES,
+            ... )
+            >>> len(grid["AAPL"]["close"])
+            390
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+
+        self._apply_profile("analytics")
+        stmt = self._gapfill_statement(
+            [s.upper() for s in symbols], start_date, end_date, interval, fill, trading_session
+        )
+
+        series: dict[str, dict[str, list[Any]]] = {}
+        for symbol, bucket, open_, high, low, close, volume in self.session.execute(stmt):
+            columns = series.setdefault(
+                symbol,
+                {"timestamp": [], "open": [], "high": [], "low": [], "close": [], "volume": []},
+            )
+            columns["timestamp"].append(bucket)
+            columns["open"].append(open_)
+            columns["high"].append(high)
+            columns["low"].append(low)
+            columns["close"].append(close)
+            columns["volume"].append(volume)
+
+        return series
 
+    def _gapfill_statement(
+        self,
+        symbols: list[str],
+        start_date: datetime,
+        end_date: datetime,
+        interval: str,
+        fill: str,
+        trading_session: Optional[TradingSession],
+    ) -> Select:
+        """Build the gap-filling query used by get_gapfilled_series."""
+        if interval not in INTERVALS:
+            raise ValueError(f"Unknown interval {interval!r}, expected one of {list(INTERVALS)}")
+        if fill not in FILL_STRATEGIES:
+            raise ValueError(f"Unknown fill {fill!r}, expected one of {list(FILL_STRATEGIES)}")
+
+        quote = RealTimeQuote
+        last_close = cast(func.last(quote.close, quote.timestamp), Float)
+
+        if fill == "locf":
+            # Seed LOCF with the last close before the window so leading gaps are filled
+            prev = aliased(RealTimeQuote)
+            prev_close = (
+                select(cast(prev.close, Float))
+                .where(prev.symbol == quote.symbol, prev.timestamp < start_date)
+                .order_by(prev.timestamp.desc())
+                .limit(1)
+                .scalar_subquery()
+            )
+            close = func.locf(last_close, prev_close)
+        elif fill == "interpolate":
+            close = func.interpolate(last_close)
+        else:
+            close = last_close
+
+        buckets = (
+            select(
+                quote.symbol.label("symbol"),
+                func.time_bucket_gapfill(
+                    INTERVALS[interval], quote.timestamp, start_date, end_date
+                ).label("bucket"),
+                cast(func.first(quote.open, quote.timestamp), Float).label("open"),
+                cast(func.max(quote.high), Float).label("high"),
+                cast(func.min(quote.low), Float).label("low"),
+                close.label("close"),
+                func.sum(quote.volume).label("volume"),
+            )
+            .where(
+                quote.symbol.in_(symbols),
+                quote.timestamp >= start_date,
+                quote.timestamp < end_date,
+            )
+            .group_by(quote.symbol, literal_column("bucket"))
+            .subquery()
+        )
+
+        stmt = select(
+            buckets.c.symbol,
+            buckets.c.bucket,
+            func.coalesce(buckets.c.open, buckets.c.close),
+            func.coalesce(buckets.c.high, buckets.c.close),
+            func.coalesce(buckets.c.low, buckets.c.close),
+            buckets.c.close,
+            func.coalesce(buckets.c.volume, 0),
+        )
+
+        if trading_session is not None:
+            stmt = stmt.where(*trading_session.sql_conditions(buckets.c.bucket))
+
+        return stmt.order_by(buckets.c.symbol, buckets.c.bucket)
+
+    @instrument("get_symbols")
     def get_symbols(self, limit: Optional[int] = None) -> list[str]:
         """
         Get list of distinct symbols in database.
@@ -220,6 +579,7 @@ class QuoteRepository:
             >>> print(symbols)
             ['AAPL', 'MSFT', 'GOOGL', ...]
         """
+        self._apply_profile("analytics")
         stmt = select(RealTimeQuote.symbol).distinct().order_by(RealTimeQuote.symbol.asc())
 
         if limit:
@@ -227,6 +587,7 @@ class QuoteRepository:
 
         return list(self.session.execute(stmt).scalars().all())
 
+    @instrument("count_quotes")
     def count_quotes(
         self,
         symbol: Optional[str] = None,
@@ -249,8 +610,7 @@ class QuoteRepository:
             >>> print(f"Total AAPL quotes: {count}")
             Total AAPL quotes: 50000
         """
-        from sqlalchemy import func
-
+        self._apply_profile("analytics")
         stmt = select(func.count()).select_from(RealTimeQuote)
 
         conditions = []
@@ -0,0 +1,333 @@
+"""Transient-failure retry with backoff and a circuit breaker for database writes."""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, Optional, TypeVar
+
+import psycopg2
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import exc
+from sqlalchemy.orm import Session
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SQLSTATEs worth retrying: the same statement can succeed moments later
+TRANSIENT_PGCODES = frozenset(
+    {
+        "40001",  # serialization_failure
+        "40P01",  # deadlock_detected
+        "55P03",  # lock_not_available
+        "53300",  # too_many_connections
+        "57P01",  # admin_shutdown
+        "57P02",  # crash_shutdown
+        "57P03",  # cannot_connect_now
+    }
+)
+
+# SQLSTATE class of connection exceptions (08000, 08006, ...)
+_CONNECTION_CLASS = "08"
+
+# Breaker states, exported as the gauge value
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the breaker is open."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether a database error may succeed if the call is retried.
+
+    Transient: lost or refused connections, pool checkout timeouts,
+    serialization failures, deadlocks and lock timeouts, server restarts.
+    Everything else (constraint violations, bad data, SQL errors,
+    statement timeouts) is permanent: retrying repeats the failure and
+    adds load. Both SQLAlchemy errors and raw psycopg2 errors (from COPY
+    on a DBAPI cursor) are classified.
+
+    Args:
+        error: Raised exception
+
+    Returns:
+        True if transient
+    """
+    if isinstance(error, exc.TimeoutError):  # Pool checkout timeout
+        return True
+    if isinstance(error, exc.DBAPIError):
+        if error.connection_invalidated:
+            return True
+        orig = error.orig
+    elif isinstance(error, psycopg2.Error):
+        orig = error
+    else:
+        return False
+    pgcode = getattr(orig, "pgcode", None)
+    if not isinstance(pgcode, str):
+        # Connection losses carry no SQLSTATE
+        return isinstance(error, exc.OperationalError) or isinstance(
+            orig, (psycopg2.OperationalError, psycopg2.InterfaceError)
+        )
+    return pgcode in TRANSIENT_PGCODES or pgcode.startswith(_CONNECTION_CLASS)
+
+
+class RetryPolicy(BaseModel):
+    """
+    Exponential backoff with full jitter.
+
+    Attempt ``n`` (from 0) sleeps a uniform random time in
+    ``[0, min(max_delay, base_delay * 2**n)]``, so clients retrying after
+    the same hiccup spread out instead of returning together.
+
+    Attributes:
+        attempts: Total calls, including the first
+        base_delay: Backoff ceiling of the first retry, in seconds
+        max_delay: Largest backoff ceiling, in seconds
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    attempts: int = Field(default=3, ge=1)
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def delay(self, attempt: int) -> float:
+        """
+        Sleep before the retry following a failed attempt.
+
+        Args:
+            attempt: Index of the failed attempt (0 for the first call)
+
+        Returns:
+            Seconds to sleep
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the database is down.
+
+    Closed, it counts consecutive transient failures; at
+    ``failure_threshold`` it opens and rejects calls with
+    CircuitOpenError for ``reset_timeout`` seconds, so callers shed load
+    instead of blocking threads on connection timeouts. Then one trial
+    call is let through (half-open): success closes the breaker, failure
+    opens it again. Permanent errors prove the database is reachable and
+    count as successes.
+
+    The state is exported as ``opa_quotes_storage_circuit_state``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize breaker (closed).
+
+        Args:
+            name: Value of the ``breaker`` metric label
+            failure_threshold: Consecutive transient failures that open it
+            reset_timeout: Seconds open before a trial call
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = CLOSED
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self._gauge = metrics.CIRCUIT_STATE.labels(name)
+        self._gauge.set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker past reset_timeout reads half-open."""
+        with self._lock:
+            if self._state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self._transition(HALF_OPEN)
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        Admit a call or reject it.
+
+        Raises:
+            CircuitOpenError: While open, or while a half-open trial runs
+        """
+        with self._lock:
+            if self._state == OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    metrics.CIRCUIT_REJECTIONS.labels(self.name).inc()
+                    raise CircuitOpenError(f"Circuit {self.name!r} is open")
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._trial_running:
+                    metrics.CIRCUIT_REJECTIONS.labels(self.name).inc()
+                    raise CircuitOpenError(f"Circuit {self.name!r} is half-open")
+                self._trial_running = True
+
+    def record_success(self) -> None:
+        """Reset the failure count and close the breaker."""
+        with self._lock:
+            self.failures = 0
+            self._trial_running = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        """Count a transient failure, opening the breaker at the threshold."""
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                if self._state != OPEN:
+                    self._transition(OPEN)
+
+    def release_trial(self) -> None:
+        """Let the next half-open call through after a trial that recorded no outcome."""
+        with self._lock:
+            self._trial_running = False
+
+    def _transition(self, state: str) -> None:
+        """Change state and export it (caller holds the lock)."""
+        logger.warning(f"Circuit {self.name!r}: {self._state} -> {state}")
+        self._state = state
+        self._gauge.set(_STATE_VALUES[state])
+
+    def check(self) -> dict[str, Any]:
+        """
+        Health check result.
+
+        Returns:
+            Dict with status (unhealthy when open, degraded when half-open),
+            message, state and consecutive failures
+        """
+        state = self.state
+        status = {CLOSED: "healthy", HALF_OPEN: "degraded", OPEN: "unhealthy"}[state]
+        return {
+            "status": status,
+            "message": f"Circuit {self.name!r} is {state.replace('_', '-')}",
+            "state": state,
+            "consecutive_failures": self.failures,
+        }
+
+
+def reset_session(session: Session) -> None:
+    """
+    Roll back a session before retrying its transaction.
+
+    A rollback on a connection lost under a raw DBAPI cursor raises;
+    the session's connections are then invalidated, so the retry checks
+    out a fresh one.
+
+    Args:
+        session: SQLAlchemy session
+    """
+    try:
+        session.rollback()
+    except Exception as e:
+        logger.warning(f"Rollback before retry failed ({e}), invalidating connection")
+        session.invalidate()
+
+
+def session_policy(session: Session, policy: RetryPolicy) -> RetryPolicy:
+    """
+    Retry policy for a write transaction run on a caller's session.
+
+    The rollback before a retry would also discard objects the caller
+    added, changed or deleted on the session, so such sessions get a
+    single attempt.
+
+    Args:
+        session: SQLAlchemy session
+        policy: Policy used when the session holds no other changes
+
+    Returns:
+        policy, or a copy of it with one attempt
+    """
+    if session.new or session.dirty or session.deleted:
+        return policy.model_copy(update={"attempts": 1})
+    return policy
+
+
+def call_with_retry(
+    call: Callable[[], T],
+    method: str,
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    on_retry: Optional[Callable[[BaseException], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """
+    Call with retries of transient failures, guarded by a circuit breaker.
+
+    ``call`` must be safe to repeat: each attempt must start from scratch,
+    e.g. a whole transaction that was rolled back by ``on_retry``.
+
+    Args:
+        call: Zero-argument callable
+        method: Value of the ``method`` label of the retry counter
+        policy: Attempts and backoff
+        breaker: Breaker consulted before each attempt
+        on_retry: Called with the error before sleeping (e.g. rollback)
+        sleep: Sleep function
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        CircuitOpenError: If the breaker rejects an attempt
+        Exception: The permanent error, or the last transient one
+    """
+    for attempt in range(policy.attempts):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = call()
+        except Exception as e:
+            transient = is_transient(e)
+            if breaker is not None:
+                if transient:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if not transient or attempt + 1 >= policy.attempts:
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            delay = policy.delay(attempt)
+            metrics.RETRIES.labels(method).inc()
+            logger.warning(f"{method} failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+            sleep(delay)
+            continue
+        except BaseException:
+            # Interrupts (KeyboardInterrupt, ...) record no outcome; never
+            # leave the half-open trial marked as running
+            if breaker is not None:
+                breaker.release_trial()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return result
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+# Breaker shared by the repositories' write paths
+WRITE_BREAKER = CircuitBreaker("writes")
@@ -0,0 +1,227 @@
+"""Incremental rollup of intraday quotes into daily OHLCV bars."""
+
+import logging
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import Date, Float, Insert, cast, func, literal, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .models import OhlcvDaily, RealTimeQuote, RollupWatermark
+from .ohlcv_repository import OHLCV_COLUMNS, SOURCE_ROLLUP
+from .trading_calendar import US_EQUITIES, TradingSession
+
+logger = logging.getLogger(__name__)
+
+# Watermark key of the real_time -> ohlcv_daily job
+ROLLUP_JOB = "real_time_to_ohlcv_daily"
+
+# TimescaleDB aligns chunk boundaries to multiples of the interval since the Unix epoch
+_EPOCH = date(1970, 1, 1)
+
+# create_hypertable default, used when the interval cannot be read
+_DEFAULT_CHUNK_DAYS = 7
+
+
+class DailyRollup:
+    """
+    Roll completed trading days from quotes.real_time into quotes.ohlcv_daily.
+
+    Aggregation runs in the database (one ``INSERT ... SELECT ... GROUP BY``
+    per batch of days, batches aligned to real_time chunks). A watermark
+    holding the last rolled-up day is advanced in the same transaction, so
+    each run only processes days closed since the previous one. Rolled-up
+    bars are stored with source 'rollup' and never overwrite bars loaded
+    from an external provider.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        calendar: TradingSession = US_EQUITIES,
+        job: str = ROLLUP_JOB,
+        batch_days: Optional[int] = None,
+    ):
+        """
+        Initialize rollup job.
+
+        Args:
+            session: SQLAlchemy session
+            calendar: Trading calendar defining local days and session hours
+            job: Watermark key
+            batch_days: Days per transaction (None for the real_time chunk interval)
+        """
+        self.session = session
+        self.calendar = calendar
+        self.job = job
+        self.batch_days = batch_days
+        self._tz = ZoneInfo(calendar.timezone)
+
+    def closed_through(self, now: datetime) -> date:
+        """
+        Last local trading day whose session has closed at ``now``.
+
+        Args:
+            now: Timezone-aware current time
+
+        Returns:
+            Latest completed session day
+        """
+        local = now.astimezone(self._tz)
+        day = local.date() if local.time() >= self.calendar.close else local.date() - timedelta(1)
+        while not self.calendar.is_session_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def get_watermark(self) -> Optional[date]:
+        """
+        Last day rolled up by this job.
+
+        Returns:
+            Watermark date or None if the job never ran
+        """
+        stmt = select(RollupWatermark.watermark).where(RollupWatermark.job == self.job)
+        return self.session.execute(stmt).scalar_one_or_none()
+
+    def chunk_days(self) -> int:
+        """
+        Chunk interval of quotes.real_time in whole days.
+
+        Returns:
+            Days per chunk (at least 1)
+        """
+        interval = self.session.execute(
+            text(
+                "SELECT time_interval FROM timescaledb_information.dimensions "
+                "WHERE hypertable_schema = 'quotes' AND hypertable_name = 'real_time' "
+                "AND dimension_type = 'Time'"
+            )
+        ).scalar_one_or_none()
+        if not isinstance(interval, timedelta):
+            return _DEFAULT_CHUNK_DAYS
+        return max(interval.days, 1)
+
+    def batches(self, start: date, end: date) -> list[tuple[date, date]]:
+        """
+        Split [start, end] into inclusive day ranges aligned to chunk boundaries.
+
+        Args:
+            start: First day
+            end: Last day (inclusive)
+
+        Returns:
+            List of (first day, last day) pairs
+        """
+        step = self.batch_days or self.chunk_days()
+        bounds = []
+        while start <= end:
+            offset = (start - _EPOCH).days % step
+            last = min(start + timedelta(days=step - offset - 1), end)
+            bounds.append((start, last))
+            start = last + timedelta(days=1)
+        return bounds
+
+    def rollup_statement(self, start: date, end: date) -> Insert:
+        """
+        Build the set-based rollup upsert for local days [start, end].
+
+        Args:
+            start: First local day
+            end: Last local day (inclusive)
+
+        Returns:
+            INSERT ... SELECT ... ON CONFLICT statement
+        """
+        quote = RealTimeQuote
+        # Constant UTC bounds so TimescaleDB can exclude chunks at plan time
+        lower = datetime.combine(start, time(0), self._tz)
+        upper = datetime.combine(end + timedelta(days=1), time(0), self._tz)
+        close = cast(func.last(quote.close, quote.timestamp), Float)
+
+        bars = (
+            select(
+                quote.symbol,
+                cast(func.timezone(self.calendar.timezone, quote.timestamp), Date).label("day"),
+                func.coalesce(
+                    cast(func.first(quote.open, quote.timestamp), Float),
+                    cast(func.first(quote.close, quote.timestamp), Float),
+                ),
+                cast(func.coalesce(func.max(quote.high), func.max(quote.close)), Float),
+                cast(func.coalesce(func.min(quote.low), func.min(quote.close)), Float),
+                close,
+                close,
+                func.coalesce(func.sum(quote.volume), 0),
+                literal(SOURCE_ROLLUP),
+            )
+            .where(
+                quote.timestamp >= lower,
+                quote.timestamp < upper,
+                quote.close.is_not(None),
+                *self.calendar.sql_conditions(quote.timestamp),
+            )
+            .group_by(quote.symbol, literal_column("day"))
+        )
+
+        stmt = pg_insert(OhlcvDaily).from_select([*OHLCV_COLUMNS, "source"], bars)
+        return stmt.on_conflict_do_update(
+            index_elements=["ticker", "date"],
+            set_={c: stmt.excluded[c] for c in OHLCV_COLUMNS[2:]},
+            where=OhlcvDaily.source == SOURCE_ROLLUP,
+        )
+
+    def _watermark_statement(self, day: date) -> Insert:
+        """Upsert the job watermark."""
+        stmt = pg_insert(RollupWatermark).values(job=self.job, watermark=day)
+        return stmt.on_conflict_do_update(
+            index_elements=["job"], set_={"watermark": day, "updated_at": func.now()}
+        )
+
+    def _first_day(self) -> Optional[date]:
+        """Local day of the oldest quote in real_time."""
+        first = self.session.execute(select(func.min(RealTimeQuote.timestamp))).scalar_one_or_none()
+        return first.astimezone(self._tz).date() if first is not None else None
+
+    def run(self, now: Optional[datetime] = None, start_date: Optional[date] = None) -> dict:
+        """
+        Roll up every closed day after the watermark.
+
+        Each batch is committed together with the watermark advance, so an
+        interrupted run resumes after the last committed batch.
+
+        Args:
+            now: Current time (default: now, UTC)
+            start_date: Re-roll from this day instead of the watermark
+                (e.g. after late quotes were loaded)
+
+        Returns:
+            Stats dict with days, bars and watermark
+
+        Example:
+            >>> stats = DailyRollup(session).run()
+            >>> print(stats["bars"])
+            503
+        """
+        through = self.closed_through(now or datetime.now(UTC))
+        watermark = self.get_watermark()
+        start = start_date
+        if start is None:
+            start = watermark + timedelta(days=1) if watermark else self._first_day()
+
+        stats = {"days": 0, "bars": 0, "watermark": watermark}
+        if start is None or start > through:
+            logger.info(f"Rollup {self.job}: nothing to do (watermark {watermark})")
+            return stats
+
+        for first, last in self.batches(start, through):
+            result = self.session.execute(self.rollup_statement(first, last))
+            self.session.execute(self._watermark_statement(last))
+            self.session.commit()
+
+            stats["days"] += (last - first).days + 1
+            stats["bars"] += result.rowcount
+            stats["watermark"] = last
+            logger.info(f"Rollup {self.job}: {first}..{last} -> {result.rowcount} bars")
+
+        return stats
@@ -0,0 +1,231 @@
+"""Lightweight asyncio HTTP server for health probes and Prometheus metrics."""
+
+import asyncio
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+from .health import HealthChecker
+from .slowlog import RECORDER, SlowQueryRecorder
+
+if TYPE_CHECKING:
+    from .warmup import Warmup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 9108
+
+# Largest request head accepted (request line + headers)
+_MAX_HEAD_BYTES = 8192
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
+
+
+class HealthServer:
+    """
+    HTTP endpoints for orchestrator probes and Prometheus scraping.
+
+    - ``/healthz``: liveness; answered from the event loop without I/O
+    - ``/readyz``: cached HealthChecker report, 200 if healthy else 503
+      (503 while a warm-up is still running)
+    - ``/metrics``: Prometheus text exposition
+    - ``/slow-queries``: slow query report of the process (JSON)
+
+    Runs standalone (``python -m opa_quotes_storage serve``) or inside an
+    existing event loop via ``start()``. Database checks run in a worker
+    thread so a slow database never blocks the loop, and HealthChecker's
+    cache makes frequent probes cost a dictionary copy.
+    """
+
+    def __init__(
+        self,
+        checker: Optional[HealthChecker] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        registry: CollectorRegistry = REGISTRY,
+        recorder: SlowQueryRecorder = RECORDER,
+        warmup: Optional["Warmup"] = None,
+    ):
+        """
+        Initialize server.
+
+        Args:
+            checker: Health checker (default: new HealthChecker)
+            host: Interface to bind
+            port: TCP port (0 for any free port)
+            registry: Prometheus registry exposed on /metrics
+            recorder: Slow query recorder exposed on /slow-queries
+            warmup: Warm-up run in a worker thread by ``serve_forever``;
+                readiness fails until it has finished
+        """
+        self.checker = checker or HealthChecker()
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self.recorder = recorder
+        self.warmup = warmup
+        self.warming: Optional[asyncio.Task] = None
+        self.server: Optional[asyncio.Server] = None
+
+    async def start(self) -> asyncio.Server:
+        """
+        Start listening in the running event loop.
+
+        Returns:
+            asyncio Server (``port`` is updated with the bound port)
+        """
+        self.server = await asyncio.start_server(
+            self.handle, self.host, self.port, limit=_MAX_HEAD_BYTES
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Health server listening on {self.host}:{self.port}")
+        return self.server
+
+    async def serve_forever(self) -> None:
+        """Start, run the warm-up (if any) in the background and serve until cancelled."""
+        server = await self.start()
+        if self.warmup is not None:
+            self.warming = asyncio.create_task(asyncio.to_thread(self.warmup.run))
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and close the checker's connection."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        self.checker.close()
+
+    async def route(self, method: str, path: str) -> tuple[int, str, bytes]:
+        """
+        Build the response for a request.
+
+        Args:
+            method: HTTP method
+            path: Request path (query string ignored)
+
+        Returns:
+            Tuple (status, content type, body)
+        """
+        path = path.split("?", 1)[0]
+        if method not in ("GET", "HEAD"):
+            return 405, "text/plain", b"method not allowed\n"
+        if path == "/healthz":
+            return 200, "text/plain", b"ok\n"
+        if path == "/readyz":
+            if self.warmup is not None and not self.warmup.ready:
+                body = {"overall_status": "warming_up", "checks": {}}
+                return 503, "application/json", json.dumps(body).encode()
+            report = await asyncio.to_thread(self.checker.check_all)
+            status = 200 if report["overall_status"] == "healthy" else 503
+            return status, "application/json", json.dumps(report).encode()
+        if path == "/metrics":
+            return 200, CONTENT_TYPE_LATEST, generate_latest(self.registry)
+        if path == "/slow-queries":
+            return 200, "application/json", json.dumps(self.recorder.report()).encode()
+        return 404, "text/plain", b"not found\n"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests of one connection (HTTP/1.1 keep-alive supported)."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 400, "text/plain", b"bad request\n", False)
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                parts = request_line.split()
+                if len(parts) != 3:
+                    await self._respond(writer, 400, "text/plain", b"bad request\n", False)
+                    break
+                method, path, version = parts
+                headers = _parse_headers(header_lines)
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    if version == "HTTP/1.1"
+                    else headers.get("connection", "").lower() == "keep-alive"
+                )
+
+                status, content_type, body = await self.route(method, path)
+                await self._respond(
+                    writer,
+                    status,
+                    content_type,
+                    b"" if method == "HEAD" else body,
+                    keep_alive,
+                    content_length=len(body),
+                )
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        except Exception as e:
+            logger.error(f"Health server request failed: {e}")
+        finally:
+            writer.close()
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        content_type: str,
+        body: bytes,
+        keep_alive: bool,
+        content_length: Optional[int] = None,
+    ) -> None:
+        """Write one response."""
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body) if content_length is None else content_length}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def _parse_headers(lines: list[str]) -> dict[str, Any]:
+    """Lower-cased header names mapped to values."""
+    headers = {}
+    for line in lines:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def serve(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, warmup: bool = False
+) -> None:  # pragma: no cover
+    """
+    Run the health server until interrupted.
+
+    Args:
+        host: Interface to bind
+        port: TCP port
+        warmup: Warm the default engine's pool before reporting ready
+    """
+    warm = None
+    if warmup:
+        from .connection import get_engine
+        from .warmup import Warmup
+
+        warm = Warmup(get_engine())
+    try:
+        asyncio.run(HealthServer(host=host, port=port, warmup=warm).serve_forever())
+    except KeyboardInterrupt:
+        pass
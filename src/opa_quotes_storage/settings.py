@@ -0,0 +1,48 @@
+"""Application settings loaded from the environment."""
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Settings for opa-quotes-storage.
+
+    Every field can be overridden with an environment variable of the same
+    name in upper case (e.g. ``DB_POOL_SIZE=20``) or in a ``.env`` file.
+
+    Attributes:
+        app_name: Service name
+        version: Service version
+        environment: Deployment environment (development, staging, production)
+        db_pool_size: Connections kept open per engine
+        db_max_overflow: Extra connections allowed beyond db_pool_size
+        db_pool_recycle: Seconds after which a pooled connection is replaced
+        db_pool_timeout: Seconds to wait for a pooled connection
+        db_connect_timeout: Seconds to wait for a new database connection
+        db_pool_pre_ping: Test connections on checkout
+        db_prepared_statements: Run hot repository statements as server-side
+            prepared statements (disable behind PgBouncer transaction pooling)
+        db_session_profiles: Apply ingest/analytics/interactive session
+            settings per repository method (SET LOCAL)
+        db_write_attempts: Calls of a bulk write, including retries of
+            transient failures (1 disables retries)
+        slow_query_ms: Queries at least this slow are recorded by the
+            slow query recorder
+    """
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    app_name: str = "opa-quotes-storage"
+    version: str = "0.1.0"
+    environment: str = "development"
+
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_recycle: int = 1800
+    db_pool_timeout: float = 30.0
+    db_connect_timeout: int = 10
+    db_pool_pre_ping: bool = True
+    db_prepared_statements: bool = True
+    db_session_profiles: bool = True
+    db_write_attempts: int = 3
+    slow_query_ms: float = 100.0
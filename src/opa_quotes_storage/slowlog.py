@@ -0,0 +1,258 @@
+"""Application-side slow query recorder based on SQLAlchemy cursor events."""
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+
+from . import metrics
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Queries slower than this are recorded by default (setting: SLOW_QUERY_MS)
+DEFAULT_THRESHOLD_MS = 100.0
+
+# Slow queries kept in the ring buffer
+DEFAULT_CAPACITY = 500
+
+# Longest statement text kept per record
+_MAX_STATEMENT_CHARS = 2000
+
+# Connection.info keys: (execution context, start time) stack and the recorder's own EXPLAINs
+_START_KEY = "slowlog_start"
+_SKIP_KEY = "slowlog_skip"
+
+
+class SlowQuery(BaseModel):
+    """
+    One recorded slow query.
+
+    Attributes:
+        statement: SQL as sent to the driver (truncated)
+        parameters: Bound parameters (None for executemany)
+        duration_ms: Cursor execution time
+        recorded_at: When the query finished
+    """
+
+    statement: str
+    parameters: Optional[Any] = None
+    duration_ms: float
+    recorded_at: datetime
+
+
+class SlowQueryRecorder:
+    """
+    Record queries slower than a threshold, and optionally EXPLAIN the worst.
+
+    Attached to an engine, it times every cursor execution through the
+    ``before_cursor_execute``/``after_cursor_execute`` events (two clock
+    reads per query). Queries over the threshold are sampled into a ring
+    buffer and aggregated per statement, which replaces server-side
+    ``log_statement = 'all'`` for finding slow queries.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: Optional[float] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        sample_rate: float = 1.0,
+    ):
+        """
+        Initialize recorder.
+
+        Args:
+            threshold_ms: Minimum duration recorded (default: the
+                ``slow_query_ms`` setting, read when first attached)
+            capacity: Slow queries kept in the ring buffer
+            sample_rate: Fraction of slow queries kept in the buffer
+                (statistics always count every slow query)
+        """
+        self.threshold_ms = DEFAULT_THRESHOLD_MS if threshold_ms is None else threshold_ms
+        self._threshold_set = threshold_ms is not None
+        self.sample_rate = sample_rate
+        self.queries: deque[SlowQuery] = deque(maxlen=capacity)
+        self.stats: dict[str, dict[str, Any]] = {}
+        self.plans: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        """
+        Start timing the cursor executions of an engine.
+
+        Args:
+            engine: SQLAlchemy engine
+        """
+        if not self._threshold_set:
+            self.threshold_ms = get_settings().slow_query_ms
+            self._threshold_set = True
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+    def detach(self, engine: Engine) -> None:
+        """
+        Stop timing an engine.
+
+        Args:
+            engine: SQLAlchemy engine
+        """
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+        event.remove(engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        """Push the start time (a stack, as executions can nest)."""
+        conn.info.setdefault(_START_KEY, []).append((context, time.perf_counter()))
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        """Record the execution if it was slow."""
+        duration_ms = (time.perf_counter() - conn.info[_START_KEY].pop()[1]) * 1000
+        if duration_ms >= self.threshold_ms and not conn.info.get(_SKIP_KEY):
+            self.record(statement, None if executemany else parameters, duration_ms)
+
+    def _error(self, context: ExceptionContext) -> None:
+        """Drop the start time of a failed execution (after_cursor_execute never fires)."""
+        conn = context.connection
+        starts = conn.info.get(_START_KEY) if conn is not None else None
+        # Errors raised before the cursor ran have no start time of their own
+        if starts and starts[-1][0] is context.execution_context:
+            starts.pop()
+
+    def record(self, statement: str, parameters: Any, duration_ms: float) -> None:
+        """
+        Record one slow query.
+
+        Args:
+            statement: Driver-level SQL
+            parameters: Bound parameters (None if not replayable)
+            duration_ms: Execution time
+        """
+        statement = statement[:_MAX_STATEMENT_CHARS]
+        metrics.SLOW_QUERIES.inc()
+        with self._lock:
+            stats = self.stats.setdefault(
+                statement,
+                {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "parameters": None},
+            )
+            stats["calls"] += 1
+            stats["total_ms"] += duration_ms
+            if duration_ms >= stats["max_ms"]:
+                # Parameters of the slowest call, replayed by explain()
+                stats["max_ms"] = duration_ms
+                stats["parameters"] = parameters
+            if self.sample_rate >= 1 or random.random() < self.sample_rate:
+                self.queries.append(
+                    SlowQuery(
+                        statement=statement,
+                        parameters=parameters,
+                        duration_ms=round(duration_ms, 3),
+                        recorded_at=datetime.now(UTC),
+                    )
+                )
+
+    def top(self, limit: int = 10) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Statements with the largest total slow time.
+
+        Args:
+            limit: Number of statements
+
+        Returns:
+            List of (statement, stats) pairs, worst first
+        """
+        with self._lock:
+            items = [(statement, dict(stats)) for statement, stats in self.stats.items()]
+        items.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+        return items[:limit]
+
+    def explain(self, engine: Engine, limit: int = 5, analyze: bool = True) -> int:
+        """
+        Capture plans of the worst read statements.
+
+        Each statement is replayed with the parameters of its slowest call
+        as ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` inside a transaction
+        that is rolled back. Only SELECT/WITH statements are replayed, since
+        ANALYZE executes the statement.
+
+        Args:
+            engine: Engine to run EXPLAIN on
+            limit: Number of top statements considered
+            analyze: Execute the statement (False for plan only)
+
+        Returns:
+            Number of plans captured
+        """
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        captured = 0
+        for statement, stats in self.top(limit):
+            if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                continue
+            if statement in self.plans or len(statement) >= _MAX_STATEMENT_CHARS:
+                continue  # Already explained, or truncated
+            try:
+                with engine.connect() as conn:
+                    conn.info[_SKIP_KEY] = True
+                    try:
+                        plan = conn.exec_driver_sql(
+                            f"EXPLAIN ({options}) {statement}", stats["parameters"] or ()
+                        ).scalar()
+                        conn.rollback()
+                    finally:
+                        conn.info.pop(_SKIP_KEY, None)
+            except Exception as e:
+                logger.warning(f"EXPLAIN failed for slow query: {e}")
+                continue
+            with self._lock:
+                self.plans[statement] = json.loads(plan) if isinstance(plan, str) else plan
+            captured += 1
+        return captured
+
+    def report(self, limit: int = 10) -> dict[str, Any]:
+        """
+        JSON-serializable report of the worst statements and recent queries.
+
+        Args:
+            limit: Number of statements and recent queries
+
+        Returns:
+            Dict with threshold, per-statement stats (with plans when
+            captured) and the most recent slow queries
+        """
+        with self._lock:
+            recent = list(self.queries)[-limit:]
+            plans = dict(self.plans)
+        return {
+            "threshold_ms": self.threshold_ms,
+            "statements": [
+                {
+                    "statement": statement,
+                    "calls": stats["calls"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "mean_ms": round(stats["total_ms"] / stats["calls"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "plan": plans.get(statement),
+                }
+                for statement, stats in self.top(limit)
+            ],
+            "recent": [query.model_dump(mode="json") for query in reversed(recent)],
+        }
+
+    def reset(self) -> None:
+        """Forget all recorded queries, statistics and plans."""
+        with self._lock:
+            self.queries.clear()
+            self.stats.clear()
+            self.plans.clear()
+
+
+# Recorder attached by get_engine
+RECORDER = SlowQueryRecorder()
@@ -0,0 +1,421 @@
+"""Storage and compression observability for the quotes hypertables."""
+
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Compression ratio targeted by the roadmap (README, Performance)
+TARGET_COMPRESSION_RATIO = 10.0
+
+# Schema holding the hypertables managed by this repository
+SCHEMA = "quotes"
+
+# Per-chunk sizes of every hypertable in SCHEMA. Compressed chunks report
+# their size before and after compression; uncompressed chunks report their
+# current size for both. Parameter-free so it runs on SQLAlchemy sessions
+# and raw psycopg2 cursors alike.
+CHUNKS_SQL = f"""
+    WITH h AS (
+        SELECT hypertable_name,
+               (quote_ident(hypertable_schema) || '.' || quote_ident(hypertable_name))::regclass
+                   AS rel
+        FROM timescaledb_information.hypertables
+        WHERE hypertable_schema = '{SCHEMA}'
+    ),
+    sizes AS (
+        SELECT h.hypertable_name, d.chunk_name, d.total_bytes
+        FROM h, chunks_detailed_size(h.rel) d
+    ),
+    stats AS (
+        SELECT h.hypertable_name, s.chunk_name,
+               s.before_compression_total_bytes, s.after_compression_total_bytes
+        FROM h, chunk_compression_stats(h.rel) s
+    )
+    SELECT c.hypertable_name, c.chunk_name, c.range_start, c.range_end, c.is_compressed,
+           COALESCE(stats.before_compression_total_bytes, sizes.total_bytes, 0),
+           COALESCE(stats.after_compression_total_bytes, sizes.total_bytes, 0)
+    FROM timescaledb_information.chunks c
+    JOIN h USING (hypertable_name)
+    LEFT JOIN sizes USING (hypertable_name, chunk_name)
+    LEFT JOIN stats USING (hypertable_name, chunk_name)
+    WHERE c.hypertable_schema = '{SCHEMA}'
+    ORDER BY c.hypertable_name, c.range_start
+"""
+
+# Background jobs of the hypertables with their latest run statistics
+JOBS_SQL = f"""
+    SELECT j.hypertable_name, j.job_id, j.proc_name, j.scheduled,
+           CASE WHEN j.proc_name = 'policy_compression'
+                THEN (j.config ->> 'compress_after')::interval END,
+           s.last_run_started_at, s.last_successful_finish, s.last_run_status,
+           s.next_start, COALESCE(s.total_runs, 0), COALESCE(s.total_failures, 0)
+    FROM timescaledb_information.jobs j
+    LEFT JOIN timescaledb_information.job_stats s USING (job_id)
+    WHERE j.hypertable_schema = '{SCHEMA}'
+    ORDER BY j.hypertable_name, j.job_id
+"""
+
+
+class ChunkStorage(BaseModel):
+    """
+    Size of one chunk.
+
+    Attributes:
+        hypertable: Qualified hypertable name ('schema.table')
+        chunk: Chunk table name
+        range_start: Start of the chunk's time range
+        range_end: End of the chunk's time range
+        is_compressed: Whether the chunk is compressed
+        uncompressed_bytes: Size before compression (current size if uncompressed)
+        total_bytes: Current size including indexes and TOAST
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    hypertable: str
+    chunk: str
+    range_start: Optional[datetime] = None
+    range_end: Optional[datetime] = None
+    is_compressed: bool = False
+    uncompressed_bytes: int = 0
+    total_bytes: int = 0
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """Before/after size (None unless compressed)."""
+        if not self.is_compressed or not self.total_bytes:
+            return None
+        return self.uncompressed_bytes / self.total_bytes
+
+
+class JobStatus(BaseModel):
+    """
+    Background job of a hypertable and its latest run.
+
+    Attributes:
+        hypertable: Qualified hypertable name
+        job_id: TimescaleDB job id
+        proc_name: Job procedure (e.g. 'policy_compression')
+        scheduled: Whether the job is scheduled
+        compress_after: Policy horizon (compression jobs only)
+        last_run_started_at: Start of the last run
+        last_successful_finish: End of the last successful run
+        last_run_status: 'Success' or 'Failed' (None if never run)
+        next_start: Next scheduled start
+        total_runs: Runs since the job was created
+        total_failures: Failed runs since the job was created
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    hypertable: str
+    job_id: int
+    proc_name: str
+    scheduled: bool = True
+    compress_after: Optional[timedelta] = None
+    last_run_started_at: Optional[datetime] = None
+    last_successful_finish: Optional[datetime] = None
+    last_run_status: Optional[str] = None
+    next_start: Optional[datetime] = None
+    total_runs: int = 0
+    total_failures: int = 0
+
+    @property
+    def failed(self) -> bool:
+        """Whether the last run failed."""
+        return self.last_run_status == "Failed"
+
+
+class StorageReport(BaseModel):
+    """
+    Storage and compression state of one hypertable.
+
+    Attributes:
+        hypertable: Qualified hypertable name
+        chunks: Chunks ordered by time
+        jobs: Background jobs of the hypertable
+        checked_at: Time the report was taken
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    hypertable: str
+    chunks: tuple[ChunkStorage, ...] = ()
+    jobs: tuple[JobStatus, ...] = ()
+    checked_at: datetime
+
+    @property
+    def total_bytes(self) -> int:
+        """Current size of all chunks."""
+        return sum(chunk.total_bytes for chunk in self.chunks)
+
+    @property
+    def uncompressed_bytes(self) -> int:
+        """Size of all chunks as if none were compressed."""
+        return sum(chunk.uncompressed_bytes for chunk in self.chunks)
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """Before/after size of compressed chunks (None if nothing is compressed)."""
+        compressed = [chunk for chunk in self.chunks if chunk.is_compressed]
+        after = sum(chunk.total_bytes for chunk in compressed)
+        if not after:
+            return None
+        return sum(chunk.uncompressed_bytes for chunk in compressed) / after
+
+    @property
+    def compress_after(self) -> Optional[timedelta]:
+        """Horizon of the compression policy (None without a policy)."""
+        for job in self.jobs:
+            if job.compress_after is not None:
+                return job.compress_after
+        return None
+
+    @property
+    def backlog(self) -> tuple[ChunkStorage, ...]:
+        """Uncompressed chunks the compression policy should already have compressed."""
+        if self.compress_after is None:
+            return ()
+        horizon = self.checked_at - self.compress_after
+        return tuple(
+            chunk
+            for chunk in self.chunks
+            if not chunk.is_compressed
+            and chunk.range_end is not None
+            and chunk.range_end <= horizon
+        )
+
+    @property
+    def failing_jobs(self) -> tuple[JobStatus, ...]:
+        """Jobs whose last run failed."""
+        return tuple(job for job in self.jobs if job.failed)
+
+    @property
+    def span_days(self) -> float:
+        """Days of data covered, up to checked_at."""
+        starts = [chunk.range_start for chunk in self.chunks if chunk.range_start]
+        ends = [chunk.range_end for chunk in self.chunks if chunk.range_end]
+        if not starts or not ends:
+            return 0.0
+        span = min(max(ends), self.checked_at) - min(starts)
+        return max(span.total_seconds() / 86400, 0.0)
+
+    @property
+    def ingest_bytes_per_day(self) -> float:
+        """Uncompressed bytes written per day of data."""
+        span = self.span_days
+        return self.uncompressed_bytes / span if span >= 1 else 0.0
+
+    @property
+    def projected_bytes_per_day(self) -> float:
+        """
+        Disk growth per day once new data is compressed.
+
+        The ingest rate divided by the observed compression ratio when a
+        compression policy exists, else the raw ingest rate.
+        """
+        ratio = self.compression_ratio
+        if self.compress_after is None or not ratio:
+            return self.ingest_bytes_per_day
+        return self.ingest_bytes_per_day / ratio
+
+    def problems(self, target_ratio: float = TARGET_COMPRESSION_RATIO) -> list[str]:
+        """
+        Human-readable list of storage problems.
+
+        Args:
+            target_ratio: Minimum acceptable compression ratio
+
+        Returns:
+            One message per problem (empty if none)
+        """
+        problems = []
+        if self.backlog:
+            problems.append(
+                f"{self.hypertable}: {len(self.backlog)} chunk(s) older than "
+                f"{self.compress_after} not compressed"
+            )
+        for job in self.failing_jobs:
+            problems.append(
+                f"{self.hypertable}: job {job.job_id} ({job.proc_name}) last run failed"
+            )
+        ratio = self.compression_ratio
+        if ratio is not None and ratio < target_ratio:
+            problems.append(
+                f"{self.hypertable}: compression ratio {ratio:.1f}:1 below {target_ratio:g}:1"
+            )
+        return problems
+
+    def summary(self) -> dict[str, Any]:
+        """
+        JSON-serializable summary (without per-chunk detail).
+
+        Returns:
+            Dict of sizes, ratio, backlog, projected growth and job runs
+        """
+        ratio = self.compression_ratio
+        return {
+            "chunks": len(self.chunks),
+            "compressed_chunks": sum(chunk.is_compressed for chunk in self.chunks),
+            "total_bytes": self.total_bytes,
+            "uncompressed_bytes": self.uncompressed_bytes,
+            "compression_ratio": round(ratio, 2) if ratio is not None else None,
+            "backlog_chunks": len(self.backlog),
+            "backlog_bytes": sum(chunk.total_bytes for chunk in self.backlog),
+            "projected_bytes_per_day": round(self.projected_bytes_per_day),
+            "jobs": [
+                {
+                    "job_id": job.job_id,
+                    "proc_name": job.proc_name,
+                    "scheduled": job.scheduled,
+                    "last_run_status": job.last_run_status,
+                    "last_successful_finish": _isoformat(job.last_successful_finish),
+                    "next_start": _isoformat(job.next_start),
+                    "total_failures": job.total_failures,
+                }
+                for job in self.jobs
+            ],
+        }
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """ISO timestamp or None."""
+    return value.isoformat() if value is not None else None
+
+
+def build_reports(
+    chunk_rows: Iterable[tuple],
+    job_rows: Iterable[tuple],
+    checked_at: Optional[datetime] = None,
+) -> dict[str, StorageReport]:
+    """
+    Assemble reports from the rows of CHUNKS_SQL and JOBS_SQL.
+
+    Args:
+        chunk_rows: Rows of CHUNKS_SQL
+        job_rows: Rows of JOBS_SQL
+        checked_at: Report time (default: now)
+
+    Returns:
+        Dict of StorageReport keyed by qualified hypertable name
+    """
+    checked_at = checked_at or datetime.now(UTC)
+    chunks: dict[str, list[ChunkStorage]] = {}
+    jobs: dict[str, list[JobStatus]] = {}
+
+    for name, chunk, start, end, compressed, before, after in chunk_rows:
+        hypertable = f"{SCHEMA}.{name}"
+        chunks.setdefault(hypertable, []).append(
+            ChunkStorage(
+                hypertable=hypertable,
+                chunk=chunk,
+                range_start=start,
+                range_end=end,
+                is_compressed=bool(compressed),
+                uncompressed_bytes=int(before or 0),
+                total_bytes=int(after or 0),
+            )
+        )
+
+    for (
+        name,
+        job_id,
+        proc_name,
+        scheduled,
+        compress_after,
+        last_start,
+        last_success,
+        last_status,
+        next_start,
+        runs,
+        failures,
+    ) in job_rows:
+        hypertable = f"{SCHEMA}.{name}"
+        jobs.setdefault(hypertable, []).append(
+            JobStatus(
+                hypertable=hypertable,
+                job_id=job_id,
+                proc_name=proc_name,
+                scheduled=bool(scheduled),
+                compress_after=compress_after,
+                last_run_started_at=last_start,
+                last_successful_finish=last_success,
+                last_run_status=last_status,
+                next_start=next_start,
+                total_runs=runs,
+                total_failures=failures,
+            )
+        )
+
+    return {
+        hypertable: StorageReport(
+            hypertable=hypertable,
+            chunks=tuple(chunks.get(hypertable, ())),
+            jobs=tuple(jobs.get(hypertable, ())),
+            checked_at=checked_at,
+        )
+        for hypertable in sorted(chunks.keys() | jobs.keys())
+    }
+
+
+def export_metrics(reports: dict[str, StorageReport]) -> None:
+    """
+    Publish reports as Prometheus gauges labelled by hypertable.
+
+    Args:
+        reports: Reports keyed by hypertable
+    """
+    for hypertable, report in reports.items():
+        metrics.HYPERTABLE_BYTES.labels(hypertable).set(report.total_bytes)
+        metrics.HYPERTABLE_UNCOMPRESSED_BYTES.labels(hypertable).set(report.uncompressed_bytes)
+        metrics.COMPRESSION_RATIO.labels(hypertable).set(report.compression_ratio or 0)
+        metrics.COMPRESSION_BACKLOG_CHUNKS.labels(hypertable).set(len(report.backlog))
+        metrics.PROJECTED_GROWTH_BYTES.labels(hypertable).set(report.projected_bytes_per_day)
+        for job in report.jobs:
+            labels = (hypertable, str(job.job_id), job.proc_name)
+            metrics.JOB_FAILURES.labels(*labels).set(job.total_failures)
+            metrics.JOB_LAST_RUN_FAILED.labels(*labels).set(int(job.failed))
+            if job.last_successful_finish is not None:
+                metrics.JOB_LAST_SUCCESS.labels(*labels).set(job.last_successful_finish.timestamp())
+            if job.next_start is not None:
+                metrics.JOB_NEXT_START.labels(*labels).set(job.next_start.timestamp())
+
+
+class StorageMonitor:
+    """
+    Report chunk sizes, compression progress and job health of the hypertables.
+
+    Two catalog queries cover every hypertable in the schema; the results are
+    returned as StorageReport objects and exported as Prometheus gauges.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize monitor with database session.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        self.session = session
+
+    def reports(self) -> dict[str, StorageReport]:
+        """
+        Measure all hypertables and export the metrics.
+
+        Returns:
+            Dict of StorageReport keyed by qualified hypertable name
+        """
+        chunk_rows = self.session.execute(text(CHUNKS_SQL)).all()
+        job_rows = self.session.execute(text(JOBS_SQL)).all()
+        reports = build_reports(chunk_rows, job_rows)
+        export_metrics(reports)
+        return reports
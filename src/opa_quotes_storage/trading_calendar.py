@@ -0,0 +1,79 @@
+"""Trading session calendars used to shape regular time series."""
+
+from datetime import date, datetime, time
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Date, Time, cast, extract, func
+
+
+class TradingSession(BaseModel):
+    """
+    Regular trading hours of an exchange.
+
+    Times are wall-clock times in ``timezone`` so daylight-saving shifts are
+    handled by the database when buckets are converted to local time.
+
+    Attributes:
+        name: Calendar identifier (e.g., 'XNYS')
+        timezone: IANA timezone of the exchange
+        open: Session open (inclusive, local time)
+        close: Session close (exclusive, local time)
+        weekdays: ISO weekdays with a session (1=Monday ... 7=Sunday)
+        holidays: Local dates without a session
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str = Field(..., min_length=1, description="Calendar identifier")
+    timezone: str = Field("UTC", description="IANA timezone of the exchange")
+    open: time = Field(time(0, 0), description="Session open (local, inclusive)")
+    close: time = Field(time(23, 59, 59, 999999), description="Session close (local, exclusive)")
+    weekdays: frozenset[int] = Field(
+        frozenset({1, 2, 3, 4, 5}), description="ISO weekdays with a session"
+    )
+    holidays: frozenset[date] = Field(frozenset(), description="Local dates without a session")
+
+    def is_session_day(self, day: date) -> bool:
+        """Check whether a local date has a regular session."""
+        return day.isoweekday() in self.weekdays and day not in self.holidays
+
+    def is_open(self, at: datetime) -> bool:
+        """
+        Check whether a moment falls inside a regular session.
+
+        Args:
+            at: Timezone-aware timestamp
+
+        Returns:
+            True between open (inclusive) and close (exclusive) on a session day
+        """
+        local = at.astimezone(ZoneInfo(self.timezone))
+        return self.is_session_day(local.date()) and self.open <= local.time() < self.close
+
+    def sql_conditions(self, timestamp: Any) -> list[Any]:
+        """
+        SQL conditions keeping timestamps inside regular sessions.
+
+        Args:
+            timestamp: SQLAlchemy TIMESTAMPTZ expression
+
+        Returns:
+            List of conditions for ``Select.where``
+        """
+        local = func.timezone(self.timezone, timestamp)
+        conditions = [
+            cast(local, Time) >= self.open,
+            cast(local, Time) < self.close,
+            extract("isodow", local).in_(sorted(self.weekdays)),
+        ]
+        if self.holidays:
+            conditions.append(cast(local, Date).not_in(sorted(self.holidays)))
+        return conditions
+
+
+# NYSE / NASDAQ regular hours (holidays must be supplied by the caller)
+US_EQUITIES = TradingSession(
+    name="XNYS", timezone="America/New_York", open=time(9, 30), close=time(16, 0)
+)
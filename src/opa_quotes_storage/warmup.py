@@ -0,0 +1,252 @@
+"""Connection pool and statement warm-up at service start."""
+
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from . import metrics
+from .freshness import FreshnessMonitor
+from .prepared import prepare_all, supports_prepared
+from .repository import QuoteRepository
+
+logger = logging.getLogger(__name__)
+
+# Chunks newer than this have their indexes loaded into shared buffers
+DEFAULT_CHUNK_LOOKBACK = timedelta(days=7)
+
+# Symbol the hot statements are run with; matches no rows, so each read
+# only descends the newest chunks' indexes
+WARMUP_SYMBOL = "$WARMUP"
+
+
+def recent_indexes_sql(lookback: timedelta = DEFAULT_CHUNK_LOOKBACK) -> str:
+    """
+    Query returning the indexes of recent quotes.real_time chunks.
+
+    Args:
+        lookback: Age of the oldest chunk included
+
+    Returns:
+        SQL text yielding one qualified index name per row
+    """
+    return (
+        "SELECT i.indexrelid::regclass::text "
+        "FROM show_chunks('quotes.real_time', newer_than => now() - "
+        f"INTERVAL '{int(lookback.total_seconds())} seconds') AS chunk "
+        "JOIN pg_index i ON i.indrelid = chunk::oid"
+    )
+
+
+def warm_connection(conn: Connection) -> int:
+    """
+    Run the hot QuoteRepository reads once on a connection.
+
+    The backend plans each statement and fills its catalog caches for the
+    hypertable and its newest chunks, and SQLAlchemy caches the compiled
+    SQL, so the first real request pays neither cost. With prepared
+    statements enabled, every hot statement (including the insert) is
+    prepared on the connection.
+
+    Args:
+        conn: Connection checked out of the pool
+
+    Returns:
+        Number of statements run
+    """
+    now = datetime.now(UTC)
+    session = Session(bind=conn)
+    try:
+        repo = QuoteRepository(session)
+        repo.get_latest_quote(WARMUP_SYMBOL)
+        repo.get_quotes(WARMUP_SYMBOL, now - timedelta(hours=1), now)
+        if repo.prepared and supports_prepared(conn):
+            prepare_all(conn)
+    finally:
+        session.close()
+        conn.rollback()
+    return 2
+
+
+class WarmupReport(BaseModel):
+    """
+    Outcome of a warm-up run.
+
+    Attributes:
+        connections: Pool connections opened and warmed
+        statements: Hot statements run across all connections
+        indexes: Recent chunk indexes loaded with pg_prewarm
+        primed_symbols: Symbols whose latest quote was read
+        duration_ms: Wall time of the whole warm-up
+        errors: Failed steps (warm-up continues past failures)
+    """
+
+    connections: int = 0
+    statements: int = 0
+    indexes: int = 0
+    primed_symbols: int = 0
+    duration_ms: float = 0.0
+    errors: list[str] = []
+
+
+class Warmup:
+    """
+    Warm an engine's pool before the service reports ready.
+
+    After a deploy the first requests otherwise open connections, plan
+    statements and fill catalog caches on the request path. ``run``:
+
+    1. Opens ``connections`` pool connections in parallel and runs (and,
+       when enabled, prepares) the hot QuoteRepository statements on each
+       (``warm_connection``)
+    2. Loads the indexes of recent chunks into shared buffers with
+       pg_prewarm, when the extension is installed
+    3. Optionally reads the latest quote of the given symbols and seeds a
+       FreshnessMonitor with every symbol's latest timestamp
+
+    Failures are logged and reported, never raised: a cold start is slow,
+    not broken. ``ready`` is set once the run finishes.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        connections: Optional[int] = None,
+        symbols: Iterable[str] = (),
+        freshness: Optional[FreshnessMonitor] = None,
+        chunk_lookback: timedelta = DEFAULT_CHUNK_LOOKBACK,
+    ):
+        """
+        Initialize warm-up.
+
+        Args:
+            engine: Engine whose pool is warmed
+            connections: Connections to open (default: the pool size)
+            symbols: Symbols whose latest quote is read
+            freshness: Monitor loaded with each symbol's latest quote
+            chunk_lookback: Age of the oldest chunk whose indexes are loaded
+        """
+        self.engine = engine
+        self.connections = connections or _pool_size(engine)
+        self.symbols = [s.upper() for s in symbols]
+        self.freshness = freshness
+        self.chunk_lookback = chunk_lookback
+        self.report: Optional[WarmupReport] = None
+        self._done = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the warm-up has finished."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the warm-up has finished.
+
+        Args:
+            timeout: Seconds to wait (None: forever)
+
+        Returns:
+            Whether the warm-up finished
+        """
+        return self._done.wait(timeout)
+
+    def run(self) -> WarmupReport:
+        """
+        Warm the pool, statements, indexes and caches.
+
+        Returns:
+            WarmupReport
+        """
+        start = time.perf_counter()
+        report = WarmupReport()
+        try:
+            self._warm_pool(report)
+            self._step(report, "prewarm indexes", self._prewarm_indexes)
+            if self.symbols or self.freshness is not None:
+                self._step(report, "prime latest quotes", self._prime)
+        finally:
+            report.duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            metrics.WARMUP_SECONDS.set(report.duration_ms / 1000)
+            self.report = report
+            self._done.set()
+        logger.info(
+            f"Warm-up finished in {report.duration_ms:.0f} ms: "
+            f"{report.connections} connections, {report.statements} statements, "
+            f"{report.indexes} indexes, {report.primed_symbols} symbols"
+        )
+        return report
+
+    def _warm_pool(self, report: WarmupReport) -> None:
+        """Open and warm connections in parallel, then return them to the pool."""
+        opened: list[Connection] = []
+
+        def open_and_warm() -> int:
+            conn = self.engine.connect()
+            opened.append(conn)  # Held until all are open, so each is distinct
+            return warm_connection(conn)
+
+        try:
+            with ThreadPoolExecutor(self.connections, thread_name_prefix="warmup") as pool:
+                futures = [pool.submit(open_and_warm) for _ in range(self.connections)]
+            for future in futures:
+                try:
+                    report.statements += future.result()
+                    report.connections += 1
+                except Exception as e:
+                    report.errors.append(f"warm connection: {e}")
+                    logger.warning(f"Warm-up of a pool connection failed: {e}")
+        finally:
+            for conn in opened:
+                conn.close()
+
+    def _step(self, report: WarmupReport, name: str, step) -> None:
+        """Run one step on a pooled connection, recording failures."""
+        try:
+            with self.engine.connect() as conn:
+                step(conn, report)
+        except Exception as e:
+            report.errors.append(f"{name}: {e}")
+            logger.warning(f"Warm-up step {name!r} failed: {e}")
+
+    def _prewarm_indexes(self, conn: Connection, report: WarmupReport) -> None:
+        """Load recent chunk indexes into shared buffers."""
+        installed = conn.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_prewarm'")
+        ).scalar()
+        if not installed:
+            logger.info("pg_prewarm not installed, skipping index warm-up")
+            return
+        indexes = conn.execute(text(recent_indexes_sql(self.chunk_lookback))).scalars().all()
+        for index in indexes:
+            conn.execute(text("SELECT pg_prewarm(CAST(:index AS regclass))"), {"index": index})
+            report.indexes += 1
+        conn.rollback()
+
+    def _prime(self, conn: Connection, report: WarmupReport) -> None:
+        """Read the symbols' latest quotes and seed the freshness monitor."""
+        session = Session(bind=conn)
+        try:
+            repo = QuoteRepository(session)
+            for symbol in self.symbols:
+                repo.get_latest_quote(symbol)
+                report.primed_symbols += 1
+            if self.freshness is not None:
+                self.freshness.load(session, self.chunk_lookback)
+        finally:
+            session.close()
+            conn.rollback()
+
+
+def _pool_size(engine: Engine) -> int:
+    """Configured size of an engine's pool (1 for pools without one)."""
+    size = getattr(engine.pool, "size", None)
+    return size() if callable(size) else 1
@@ -4,6 +4,7 @@ from datetime import UTC, datetime
 
 import pytest
 from opa_quotes_storage.repository import QuoteRepository
+from opa_quotes_storage.resilience import CircuitBreaker, RetryPolicy
 from sqlalchemy import text
 
 pytestmark = pytest.mark.integration
@@ -281,6 +282,47 @@ class TestQuoteRepositoryIntegration:
         db_session.commit()
 
 
+class TestSessionProfilesIntegration:
+    """Session profiles against a live server."""
+
+    def test_profiles_are_transaction_local(self, db_session):
+        """Test each method's settings apply to its transaction only."""
+        repo = QuoteRepository(session=db_session, profiles=True)
+
+        repo.get_latest_quote("AAPL")
+        assert db_session.execute(text("SHOW statement_timeout")).scalar() == "2s"
+
+        repo.count_quotes("AAPL")
+        assert db_session.execute(text("SHOW max_parallel_workers_per_gather")).scalar() == "4"
+
+        db_session.rollback()
+        assert db_session.execute(text("SHOW statement_timeout")).scalar() == "0"
+
+
+class TestWriteRetryIntegration:
+    """Write retries against a live server."""
+
+    def test_bulk_insert_survives_terminated_backend(self, db_session):
+        """Test a write on a connection killed by the server is retried on a new one."""
+        pid = db_session.execute(text("SELECT pg_backend_pid()")).scalar()
+        with db_session.get_bind().connect() as admin:
+            admin.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+        breaker = CircuitBreaker("integration")
+        repo = QuoteRepository(
+            session=db_session, retry=RetryPolicy(base_delay=0.01), breaker=breaker
+        )
+        quote = {"symbol": "RTRY", "timestamp": datetime(2025, 12, 22, 10, 0, tzinfo=UTC)}
+
+        try:
+            assert repo.bulk_insert([{**quote, "close": 1.0}]) == 1
+            assert db_session.execute(text("SELECT pg_backend_pid()")).scalar() != pid
+            assert breaker.failures == 0
+        finally:
+            db_session.rollback()
+            db_session.execute(text("DELETE FROM quotes.real_time WHERE symbol = 'RTRY'"))
+            db_session.commit()
+
+
 @pytest.fixture
 def db_session():
     """Provide database session for integration tests."""
@@ -0,0 +1,8 @@
+"""Shared helpers for unit tests."""
+
+from prometheus_client import REGISTRY
+
+
+def sample(name, **labels):
+    """Current value of a metric sample (0 if absent)."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
@@ -0,0 +1,123 @@
+"""Unit tests for corporate-action adjustments."""
+
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+from opa_quotes_storage.adjustments import CorporateActionRepository, FactorIndex
+
+SPLIT = (date(2024, 1, 4), "split", 4.0, 0.25)
+DIVIDEND = (date(2024, 1, 3), "dividend", 1.0, 0.99)
+
+
+def _bars():
+    return {
+        "date": [date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)],
+        "open": [400.0, 396.0, 100.0],
+        "high": [404.0, 400.0, 101.0],
+        "low": [396.0, 392.0, 99.0],
+        "close": [400.0, 396.0, 100.0],
+        "adj_close": [400.0, 396.0, 100.0],
+        "volume": [1000, 1000, 4000],
+    }
+
+
+class TestFactorIndex:
+    """Tests for FactorIndex."""
+
+    def test_cumulative_factors(self):
+        """Test bars get the product of all later actions."""
+        index = FactorIndex([SPLIT, DIVIDEND])
+
+        price, volume = index.factors([date(2024, 1, 2), date(2024, 1, 3), date(2024, 1, 4)])
+
+        assert price.tolist() == pytest.approx([0.25 * 0.99, 0.25, 1.0])
+        assert volume.tolist() == [4.0, 4.0, 1.0]
+
+    def test_no_actions_is_identity(self):
+        """Test tickers without actions are unadjusted."""
+        price, volume = FactorIndex([]).factors([date(2024, 1, 2)])
+
+        assert price.tolist() == [1.0]
+        assert volume.tolist() == [1.0]
+
+
+class TestCorporateActionRepository:
+    """Tests for CorporateActionRepository."""
+
+    def test_adjust_prices_and_volume(self):
+        """Test raw bars are adjusted on read."""
+        session = Mock()
+        session.execute.return_value = [SPLIT, DIVIDEND]
+        repo = CorporateActionRepository(session)
+
+        adjusted = repo.adjust("AAPL", _bars())
+
+        assert adjusted["close"] == pytest.approx([99.0, 99.0, 100.0])
+        assert adjusted["adj_close"] == adjusted["close"]
+        assert adjusted["volume"] == [4000, 4000, 4000]
+        assert adjusted["date"] == _bars()["date"]
+
+    def test_factor_cache(self):
+        """Test factors are loaded once per ticker and dropped on writes."""
+        session = Mock()
+        session.execute.return_value = [SPLIT]
+        repo = CorporateActionRepository(session)
+
+        repo.adjust("AAPL", _bars())
+        repo.adjust("aapl", _bars())
+        assert session.execute.call_count == 1
+
+        repo.add_split("AAPL", date(2024, 6, 10), 2.0)
+        assert "AAPL" not in repo.cache
+        assert session.commit.called
+
+    def test_add_split_validates_ratio(self):
+        """Test non-positive split ratios are rejected."""
+        with pytest.raises(ValueError):
+            CorporateActionRepository(Mock()).add_split("AAPL", date(2024, 1, 4), 0)
+
+    def test_add_dividend_uses_previous_close(self):
+        """Test dividend factor uses the last raw close before the ex-date."""
+        session = Mock()
+        session.execute.return_value.scalar_one_or_none.return_value = 100.0
+        repo = CorporateActionRepository(session)
+
+        repo.add_dividend("AAPL", date(2024, 1, 3), 1.0)
+
+        upsert = session.execute.call_args.args[0]
+        assert upsert.compile().params["factor"] == pytest.approx(0.99)
+
+    def test_add_dividend_without_history(self):
+        """Test dividends need a previous close."""
+        session = Mock()
+        session.execute.return_value.scalar_one_or_none.return_value = None
+
+        with pytest.raises(ValueError):
+            CorporateActionRepository(session).add_dividend("AAPL", date(2024, 1, 3), 1.0)
+
+    def test_get_adjusted_bars(self):
+        """Test raw bars are read and adjusted per ticker."""
+        session = Mock()
+        rows = [("AAPL", d, *v) for d, *v in zip(*_bars().values(), strict=True)]
+        no_adjusted = Mock()
+        no_adjusted.scalars.return_value.all.return_value = []
+        session.execute.side_effect = [no_adjusted, rows, [SPLIT]]
+
+        bars = CorporateActionRepository(session).get_adjusted_bars(
+            "AAPL", date(2024, 1, 1), date(2024, 1, 31)
+        )
+
+        assert bars["AAPL"]["close"] == [100.0, 99.0, 100.0]
+
+    def test_get_adjusted_bars_refuses_adjusted_rows(self):
+        """Test provider-adjusted legacy bars are not adjusted a second time."""
+        session = Mock()
+        session.execute.return_value.scalars.return_value.all.return_value = ["AAPL"]
+
+        with pytest.raises(ValueError, match="provider-adjusted"):
+            CorporateActionRepository(session).get_adjusted_bars(
+                "aapl", date(2017, 1, 1), date(2024, 1, 31)
+            )
+
+        assert session.execute.call_count == 1
@@ -0,0 +1,151 @@
+"""Unit tests for the hypertable layout advisor."""
+
+import ast
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from opa_quotes_storage.advisor import (
+    HypertableAdvisor,
+    HypertableProfile,
+    recommend_chunk_days,
+    recommend_segmentby,
+    render_migration,
+)
+
+MIB = 1024**2
+
+# ~5000 tickers x 252 sessions/year of daily bars in 7-day chunks
+OHLCV_PROFILE = HypertableProfile(
+    hypertable="quotes.ohlcv_daily",
+    time_column="date",
+    chunk_interval=timedelta(days=7),
+    num_chunks=470,
+    span_days=3290,
+    total_bytes=2_000 * MIB,
+    row_estimate=11_340_000,
+    distinct_values={"ticker": 5000.0},
+)
+
+
+class TestRecommendChunkDays:
+    """Tests for recommend_chunk_days."""
+
+    def test_largest_fitting_interval(self):
+        """Test the interval is rounded down to a standard value."""
+        assert recommend_chunk_days(0.6 * MIB, 256 * MIB) == 365
+        assert recommend_chunk_days(100 * MIB, 256 * MIB) == 1
+
+    def test_no_data(self):
+        """Test empty tables keep their interval."""
+        assert recommend_chunk_days(0, 256 * MIB) is None
+
+
+class TestRecommendSegmentby:
+    """Tests for recommend_segmentby."""
+
+    def test_highest_cardinality_with_full_segments(self):
+        """Test the most selective column leaving full batches wins."""
+        distinct = {"ticker": 5000.0, "exchange": 10.0}
+
+        assert recommend_segmentby(distinct, 1_260_000) == ("ticker",)
+        # 7-day chunks: 5 rows per ticker, only exchange leaves full segments
+        assert recommend_segmentby(distinct, 25_000) == ("exchange",)
+
+    def test_no_qualifying_column(self):
+        """Test tiny chunks get no segmentby."""
+        assert recommend_segmentby({"ticker": 5000.0}, 1000) == ()
+
+
+class TestHypertableAdvisor:
+    """Tests for HypertableAdvisor."""
+
+    def test_recommend_daily_bars(self):
+        """Test daily bars get yearly chunks segmented by ticker, newest first."""
+        advisor = HypertableAdvisor(Mock(), target_chunk_bytes=256 * MIB)
+
+        rec = advisor.recommend(OHLCV_PROFILE)
+
+        assert rec.chunk_interval == timedelta(days=365)
+        assert rec.segmentby == ("ticker",)
+        assert rec.orderby == ("date DESC",)
+        assert rec.chunk_interval_changed
+        assert rec.compression_changed
+
+    def test_recommend_keeps_time_led_orderby(self):
+        """Test an existing orderby led by the time column is kept."""
+        profile = OHLCV_PROFILE.model_copy(
+            update={"compression_enabled": True, "segmentby": ("ticker",), "orderby": ("date ASC",)}
+        )
+
+        rec = HypertableAdvisor(Mock(), target_chunk_bytes=256 * MIB).recommend(profile)
+
+        assert rec.orderby == ("date ASC",)
+        assert not rec.compression_changed
+
+    def test_target_bytes_from_shared_buffers(self):
+        """Test the default target is shared_buffers."""
+        session = Mock()
+        session.execute.return_value.scalar_one_or_none.return_value = 512 * MIB
+
+        assert HypertableAdvisor(session).target_bytes() == 512 * MIB
+
+    def test_profile_rejects_plain_table(self):
+        """Test non-hypertables raise ValueError."""
+        session = Mock()
+        session.execute.return_value.one_or_none.return_value = None
+
+        with pytest.raises(ValueError, match="not a hypertable"):
+            HypertableAdvisor(session).profile("quotes.corporate_actions")
+
+    def test_negative_n_distinct_scaled_by_row_estimate(self):
+        """Test fractional n_distinct is scaled by the hypertable's row estimate."""
+        session = Mock()
+        session.execute.return_value.all.return_value = [
+            ("ticker", -0.5),
+            ("source", 3.0),
+            ("date", -1.0),
+        ]
+        names = {"schema": "quotes", "table": "ohlcv_daily", "relation": "quotes.ohlcv_daily"}
+
+        distinct = HypertableAdvisor(session)._distinct_values(names, "date", 1000)
+
+        assert distinct == {"ticker": 500.0, "source": 3.0}
+        assert "reltuples" not in str(session.execute.call_args[0][0])
+
+    def test_apply_sets_chunk_interval(self):
+        """Test apply only touches changed intervals."""
+        session = Mock()
+        advisor = HypertableAdvisor(session, target_chunk_bytes=256 * MIB)
+        rec = advisor.recommend(OHLCV_PROFILE)
+
+        assert advisor.apply(rec) is True
+        stmt, params = session.execute.call_args[0]
+        assert "set_chunk_time_interval" in str(stmt)
+        assert params == {"relation": "quotes.ohlcv_daily", "interval": timedelta(days=365)}
+        session.commit.assert_called_once()
+
+        unchanged = rec.model_copy(update={"chunk_interval": OHLCV_PROFILE.chunk_interval})
+        assert advisor.apply(unchanged) is False
+
+
+class TestRenderMigration:
+    """Tests for render_migration."""
+
+    def test_renders_valid_reversible_migration(self):
+        """Test the migration is valid Python and the downgrade restores settings."""
+        rec = HypertableAdvisor(Mock(), target_chunk_bytes=256 * MIB).recommend(OHLCV_PROFILE)
+
+        source = render_migration([rec], "abc123def456", "c7a2e5f1d083")
+
+        ast.parse(source)
+        upgrade, downgrade = source.split("def downgrade")
+        assert "revision: str = 'abc123def456'" in source
+        assert "down_revision: Union[str, Sequence[str], None] = 'c7a2e5f1d083'" in source
+        assert "set_chunk_time_interval('quotes.ohlcv_daily', INTERVAL '365 days')" in upgrade
+        assert "compress_segmentby = 'ticker'" in upgrade
+        assert "compress_orderby = 'date DESC'" in upgrade
+        # No policy existed, so none is added
+        assert "add_compression_policy" not in upgrade
+        assert "INTERVAL '7 days'" in downgrade
+        assert "timescaledb.compress = FALSE" in downgrade
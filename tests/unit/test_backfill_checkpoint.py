@@ -0,0 +1,99 @@
+"""Unit tests for the SQLite backfill checkpoint store."""
+
+import json
+
+import pytest
+from opa_quotes_storage.backfill import CheckpointStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Checkpoint store in a temporary directory."""
+    checkpoint = CheckpointStore(tmp_path / "state" / "checkpoint.sqlite")
+    yield checkpoint
+    checkpoint.close()
+
+
+class TestCheckpointStore:
+    """Tests for CheckpointStore."""
+
+    def test_set_semantics(self, store):
+        """Test repeated marks do not duplicate tickers."""
+        store.mark_completed("AAPL")
+        store.mark_completed("AAPL")
+        store.mark_failed("MSFT", "timeout")
+        store.mark_failed("MSFT", "reset")
+
+        assert store.completed_tickers() == {"AAPL"}
+        assert store.failed_tickers() == {"MSFT": "reset"}
+
+    def test_completion_clears_failure(self, store):
+        """Test a retried ticker moves from failed to completed."""
+        store.mark_failed("AAPL", "timeout")
+        store.mark_completed("AAPL")
+
+        assert store.failed_tickers() == {}
+        assert store.completed_tickers() == {"AAPL"}
+
+    def test_pending_preserves_order(self, store):
+        """Test pending filters completed tickers in input order."""
+        store.mark_completed("MSFT")
+
+        assert store.pending(["TSLA", "MSFT", "AAPL"]) == ["TSLA", "AAPL"]
+
+    def test_state_survives_reopen(self, store):
+        """Test committed marks are durable across connections."""
+        store.mark_completed("AAPL")
+        store.close()
+
+        reopened = CheckpointStore(store.path)
+        assert reopened.completed_tickers() == {"AAPL"}
+        reopened.close()
+
+    def test_resume_start_contiguous(self, store):
+        """Test resume starts after contiguous committed segments."""
+        store.mark_range_done("AAPL", "2017-01-01", "2018-01-01")
+        store.mark_range_done("AAPL", "2018-01-01", "2019-01-01")
+
+        assert store.resume_start("AAPL", "2017-01-01", "2025-01-01") == "2019-01-01"
+        assert store.resume_start("MSFT", "2017-01-01", "2025-01-01") == "2017-01-01"
+
+    def test_resume_start_stops_at_hole(self, store):
+        """Test a gap in committed segments is never skipped."""
+        store.mark_range_done("AAPL", "2017-01-01", "2018-01-01")
+        store.mark_range_done("AAPL", "2019-01-01", "2020-01-01")
+
+        assert store.resume_start("AAPL", "2017-01-01", "2025-01-01") == "2018-01-01"
+
+    def test_resume_start_fully_covered(self, store):
+        """Test a fully covered range resumes at its end."""
+        store.mark_range_done("AAPL", "2017-01-01", "2026-01-01")
+
+        assert store.resume_start("AAPL", "2017-01-01", "2025-01-01") == "2025-01-01"
+
+    def test_load_save_legacy_layout(self, store):
+        """Test load/save use the legacy JSON layout."""
+        store.save(
+            {
+                "completed_tickers": ["AAPL", "MSFT"],
+                "failed_tickers": [{"ticker": "XYZ", "error": "No data returned"}],
+            }
+        )
+
+        state = store.load()
+
+        assert state["completed_tickers"] == ["AAPL", "MSFT"]
+        assert state["failed_tickers"] == [{"ticker": "XYZ", "error": "No data returned"}]
+        assert state["last_updated"] is not None
+
+    def test_import_json(self, store, tmp_path):
+        """Test legacy JSON checkpoints are imported once into an empty store."""
+        legacy = tmp_path / "backfill_checkpoint.json"
+        legacy.write_text(
+            json.dumps({"completed_tickers": ["AAPL"], "failed_tickers": [], "last_updated": None})
+        )
+
+        assert store.import_json(legacy) is True
+        assert store.import_json(legacy) is False
+        assert store.import_json(tmp_path / "missing.json") is False
+        assert store.completed_tickers() == {"AAPL"}
@@ -0,0 +1,450 @@
+"""Unit tests for the concurrent backfill engine with a fake data source."""
+
+import random
+import threading
+from datetime import date
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from opa_quotes_storage.backfill import BackfillEngine, CopyWriter, TokenBucket, YFinanceSource
+
+
+class FakeClock:
+    """Manual clock whose sleep advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeSource:
+    """Local data source: fixed rows per ticker, optional transient failures."""
+
+    def __init__(self, rows_per_ticker=3, failures=None, empty=()):
+        self.rows_per_ticker = rows_per_ticker
+        self.failures = dict(failures or {})
+        self.empty = set(empty)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch(self, ticker, start_date, end_date):
+        with self._lock:
+            self.calls.append(ticker)
+            if self.failures.get(ticker, 0) > 0:
+                self.failures[ticker] -= 1
+                raise ConnectionError("provider reset")
+        if ticker in self.empty:
+            return None
+        return [
+            (ticker, date(2024, 1, d + 1), 1.0, 2.0, 0.5, 1.5, 1.5, 100)
+            for d in range(self.rows_per_ticker)
+        ]
+
+
+class RecordingWriter:
+    """Writer that records each batch (one batch = one transaction)."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, rows):
+        if self.fail:
+            raise RuntimeError("disk full")
+        self.batches.append(list(rows))
+        return len(rows)
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_is_immediate(self):
+        """Test burst tokens are available without waiting."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=3, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(3)]
+
+        assert waits == [0.0, 0.0, 0.0]
+        assert clock.sleeps == []
+
+    def test_rate_after_burst(self):
+        """Test requests beyond the burst are spaced by 1/rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=1, clock=clock, sleep=clock.sleep)
+
+        bucket.acquire()
+        waited = bucket.acquire()
+
+        assert waited == pytest.approx(0.5)
+        assert clock.now == pytest.approx(0.5)
+
+    def test_try_acquire(self):
+        """Test non-blocking acquire."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=1, clock=clock, sleep=clock.sleep)
+
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        clock.now += 1.0
+        assert bucket.try_acquire()
+
+    def test_invalid_parameters(self):
+        """Test invalid rate/burst are rejected."""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+        with pytest.raises(ValueError):
+            TokenBucket(rate=1.0, burst=0)
+
+
+class TestBackfillEngine:
+    """Tests for BackfillEngine."""
+
+    def test_batches_many_tickers_per_write(self):
+        """Test rows from several tickers share one write transaction."""
+        source = FakeSource(rows_per_ticker=3)
+        writer = RecordingWriter()
+        completed = []
+        engine = BackfillEngine(source, writer, workers=4, batch_rows=1000)
+
+        stats = engine.run(
+            ["AAPL", "MSFT", "GOOGL", "AMZN"],
+            "2024-01-01",
+            "2024-02-01",
+            on_completed=lambda t, n: completed.append((t, n)),
+        )
+
+        assert stats == {"total_tickers": 4, "completed": 4, "failed": 0, "total_records": 12}
+        assert len(writer.batches) == 1
+        assert sorted(completed) == [("AAPL", 3), ("AMZN", 3), ("GOOGL", 3), ("MSFT", 3)]
+
+    def test_batch_rows_threshold(self):
+        """Test the writer commits once batch_rows is reached."""
+        writer = RecordingWriter()
+        engine = BackfillEngine(FakeSource(rows_per_ticker=5), writer, workers=1, batch_rows=5)
+
+        engine.run(["AAPL", "MSFT"], "2024-01-01", "2024-02-01")
+
+        assert [len(b) for b in writer.batches] == [5, 5]
+
+    def test_retries_transient_errors_with_backoff(self):
+        """Test transient fetch errors are retried with jittered backoff."""
+        source = FakeSource(failures={"AAPL": 2})
+        sleeps = []
+        engine = BackfillEngine(
+            source,
+            RecordingWriter(),
+            workers=1,
+            max_retries=3,
+            backoff_base=1.0,
+            sleep=sleeps.append,
+            rng=random.Random(42),
+        )
+
+        stats = engine.run(["AAPL"], "2024-01-01", "2024-02-01")
+
+        assert stats["completed"] == 1
+        assert source.calls == ["AAPL", "AAPL", "AAPL"]
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 1.0
+        assert 0 <= sleeps[1] <= 2.0
+
+    def test_gives_up_after_max_retries(self):
+        """Test tickers fail after exhausting retries."""
+        failed = []
+        engine = BackfillEngine(
+            FakeSource(failures={"AAPL": 10}),
+            RecordingWriter(),
+            workers=1,
+            max_retries=2,
+            sleep=lambda s: None,
+        )
+
+        stats = engine.run(
+            ["AAPL", "MSFT"], "2024-01-01", "2024-02-01", on_failed=lambda t, e: failed.append(t)
+        )
+
+        assert stats["failed"] == 1
+        assert stats["completed"] == 1
+        assert failed == ["AAPL"]
+
+    def test_empty_result_is_not_retried(self):
+        """Test tickers without data fail immediately."""
+        source = FakeSource(empty={"DELISTED"})
+        failed = []
+        engine = BackfillEngine(source, RecordingWriter(), workers=2)
+
+        engine.run(
+            ["DELISTED"], "2024-01-01", "2024-02-01", on_failed=lambda t, e: failed.append(e)
+        )
+
+        assert source.calls == ["DELISTED"]
+        assert failed == ["No data returned"]
+
+    def test_empty_tail_completes_resumed_ticker(self):
+        """Test a resumed ticker whose remaining range is empty completes."""
+        source = FakeSource(empty={"DELISTED"})
+        completed, failed = [], []
+        engine = BackfillEngine(source, RecordingWriter(), workers=1, segment_days=10)
+
+        stats = engine.run(
+            ["DELISTED"],
+            "2017-01-01",
+            "2024-02-01",
+            on_completed=lambda t, n: completed.append((t, n)),
+            on_failed=lambda t, e: failed.append(e),
+            start_dates={"DELISTED": "2024-01-15"},
+            resumed={"DELISTED"},
+        )
+
+        assert completed == [("DELISTED", 0)]
+        assert failed == []
+        assert stats["completed"] == 1
+
+    def test_write_failure_marks_batch_failed(self):
+        """Test a failed write marks its tickers failed, not completed."""
+        completed, failed = [], []
+        engine = BackfillEngine(FakeSource(), RecordingWriter(fail=True), workers=2)
+
+        stats = engine.run(
+            ["AAPL", "MSFT"],
+            "2024-01-01",
+            "2024-02-01",
+            on_completed=lambda t, n: completed.append(t),
+            on_failed=lambda t, e: failed.append(t),
+        )
+
+        assert stats["failed"] == 2
+        assert completed == []
+        assert sorted(failed) == ["AAPL", "MSFT"]
+
+    def test_rate_limiter_shared_by_workers(self):
+        """Test every fetch attempt takes a token from the shared limiter."""
+        limiter = Mock()
+        engine = BackfillEngine(FakeSource(), RecordingWriter(), limiter=limiter, workers=4)
+
+        engine.run(["A", "B", "C", "D", "E"], "2024-01-01", "2024-02-01")
+
+        assert limiter.acquire.call_count == 5
+
+    def test_per_ticker_start_dates(self):
+        """Test start_dates override the run start date per ticker."""
+        source = Mock()
+        source.fetch.return_value = None
+        engine = BackfillEngine(source, RecordingWriter(), workers=1)
+
+        engine.run(["AAPL", "NEW"], "2017-01-01", "2024-07-02", start_dates={"AAPL": "2024-06-23"})
+
+        calls = sorted(c.args for c in source.fetch.call_args_list)
+        assert calls == [("AAPL", "2024-06-23", "2024-07-02"), ("NEW", "2017-01-01", "2024-07-02")]
+
+    def test_segments_split_range(self):
+        """Test segment_days splits the range into contiguous segments."""
+        engine = BackfillEngine(FakeSource(), RecordingWriter(), segment_days=10)
+
+        assert engine.segments("2024-01-01", "2024-01-25") == [
+            ("2024-01-01", "2024-01-11"),
+            ("2024-01-11", "2024-01-21"),
+            ("2024-01-21", "2024-01-25"),
+        ]
+        assert BackfillEngine(FakeSource(), RecordingWriter()).segments(
+            "2024-01-01", "2024-01-25"
+        ) == [("2024-01-01", "2024-01-25")]
+
+    def test_range_done_per_committed_segment(self):
+        """Test each committed segment is reported, then the ticker completes."""
+        ranges, completed = [], []
+        engine = BackfillEngine(FakeSource(), RecordingWriter(), workers=1, segment_days=15)
+
+        engine.run(
+            ["AAPL"],
+            "2024-01-01",
+            "2024-02-01",
+            on_completed=lambda t, n: completed.append((t, n)),
+            on_range_done=lambda *r: ranges.append(r),
+        )
+
+        assert ranges == [
+            ("AAPL", "2024-01-01", "2024-01-16"),
+            ("AAPL", "2024-01-16", "2024-01-31"),
+            ("AAPL", "2024-01-31", "2024-02-01"),
+        ]
+        assert completed == [("AAPL", 9)]
+
+    def test_failed_segment_stops_ticker(self):
+        """Test a failing segment fails the ticker without fetching later segments."""
+        source = Mock()
+        source.fetch.side_effect = [
+            [("AAPL", date(2024, 1, 2), 1, 2, 0.5, 1.5, 1.5, 9)],
+            ValueError,
+        ]
+        ranges, failed = [], []
+        engine = BackfillEngine(
+            source, RecordingWriter(), workers=1, max_retries=0, segment_days=10
+        )
+
+        stats = engine.run(
+            ["AAPL"],
+            "2024-01-01",
+            "2024-02-01",
+            on_failed=lambda t, e: failed.append(t),
+            on_range_done=lambda *r: ranges.append(r),
+        )
+
+        assert source.fetch.call_count == 2
+        assert ranges == [("AAPL", "2024-01-01", "2024-01-11")]
+        assert failed == ["AAPL"]
+        assert stats["completed"] == 0
+
+    def test_callback_failure_fails_ticker(self):
+        """Test a raising checkpoint callback fails its ticker without stopping the run."""
+        failed = []
+
+        def on_completed(ticker, records):
+            raise RuntimeError("checkpoint database is locked")
+
+        engine = BackfillEngine(FakeSource(), RecordingWriter(), workers=2, batch_rows=1)
+        tickers = [f"T{i}" for i in range(50)]
+
+        stats = engine.run(
+            tickers,
+            "2024-01-01",
+            "2024-02-01",
+            on_completed=on_completed,
+            on_failed=lambda t, e: failed.append(e),
+        )
+
+        assert stats["completed"] == 0
+        assert stats["failed"] == 50
+        assert set(failed) == {"Callback failed: checkpoint database is locked"}
+
+    def test_writer_death_raises(self):
+        """Test workers and run stop instead of blocking when the writer dies."""
+        engine = BackfillEngine(FakeSource(), RecordingWriter(), workers=2)
+        tickers = [f"T{i}" for i in range(50)]
+
+        with patch.object(BackfillEngine, "_write_loop", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError, match="writer failed: boom"):
+                engine.run(tickers, "2024-01-01", "2024-02-01")
+
+    def test_invalid_workers(self):
+        """Test at least one worker is required."""
+        with pytest.raises(ValueError):
+            BackfillEngine(FakeSource(), RecordingWriter(), workers=0)
+
+
+class TestCopyWriter:
+    """Tests for CopyWriter."""
+
+    def test_commits_batch(self):
+        """Test rows are COPY-upserted and committed."""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.rowcount = 1
+
+        written = CopyWriter(conn)([("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)])
+
+        assert written == 1
+        assert cursor.copy_expert.called
+        assert conn.commit.called
+
+    def test_rolls_back_on_error(self):
+        """Test failed writes are rolled back."""
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value.copy_expert.side_effect = RuntimeError
+
+        with pytest.raises(RuntimeError):
+            CopyWriter(conn)([("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)])
+        assert conn.rollback.called
+
+    def test_writes_through_compression_manager(self):
+        """Test writes are routed through the compression manager."""
+        compression = Mock()
+        compression.merge.return_value = 1
+        writer = CopyWriter(MagicMock(), compression)
+        rows = [("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)]
+
+        assert writer(rows) == 1
+        compression.merge.assert_called_once_with(rows, writer._write)
+
+
+class TestYFinanceSource:
+    """Tests for YFinanceSource with a stub client."""
+
+    def test_fetch_converts_rows(self):
+        """Test DataFrame rows become OHLCV tuples."""
+        import pandas as pd
+
+        df = pd.DataFrame(
+            {"Open": [1.0], "High": [2.0], "Low": [0.5], "Close": [1.5], "Volume": [100]},
+            index=pd.DatetimeIndex(["2024-01-02"], tz="America/New_York"),
+        )
+        client = Mock()
+        client.Ticker.return_value.history.return_value = df
+
+        rows = YFinanceSource(client).fetch("AAPL", "2024-01-01", "2024-01-31")
+
+        assert rows == [("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)]
+
+    def test_fetch_raw_prices(self):
+        """Test raw prices are requested and the provider's adjusted close kept."""
+        import pandas as pd
+
+        df = pd.DataFrame(
+            {
+                "Open": [1.0],
+                "High": [2.0],
+                "Low": [0.5],
+                "Close": [1.5],
+                "Adj Close": [1.2],
+                "Volume": [100],
+            },
+            index=pd.DatetimeIndex(["2024-01-02"], tz="America/New_York"),
+        )
+        client = Mock()
+        client.Ticker.return_value.history.return_value = df
+
+        rows = YFinanceSource(client).fetch("AAPL", "2024-01-01", "2024-01-31")
+
+        assert rows == [("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.2, 100)]
+        assert client.Ticker.return_value.history.call_args.kwargs["auto_adjust"] is False
+
+    def test_fetch_uses_exchange_local_dates(self):
+        """Test dates come from local wall time, not UTC, and values are native."""
+        import pandas as pd
+
+        df = pd.DataFrame(
+            {
+                "Open": [1.0, 2.0],
+                "High": [2.0, 3.0],
+                "Low": [0.5, 1.5],
+                "Close": [1.5, 2.5],
+                "Volume": [100, 200],
+            },
+            # Midnight Tokyo is the previous day in UTC
+            index=pd.DatetimeIndex(["2024-01-04", "2024-01-05"], tz="Asia/Tokyo"),
+        )
+        client = Mock()
+        client.Ticker.return_value.history.return_value = df
+
+        rows = YFinanceSource(client).fetch("7203.T", "2024-01-01", "2024-01-31")
+
+        assert [row[1] for row in rows] == [date(2024, 1, 4), date(2024, 1, 5)]
+        assert type(rows[0][2]) is float
+        assert type(rows[0][7]) is int
+
+    def test_fetch_empty(self):
+        """Test empty frames return None."""
+        import pandas as pd
+
+        client = Mock()
+        client.Ticker.return_value.history.return_value = pd.DataFrame()
+
+        assert YFinanceSource(client).fetch("AAPL", "2024-01-01", "2024-01-31") is None
@@ -0,0 +1,163 @@
+"""Unit tests for the offline file backfill source."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from opa_quotes_storage.backfill import FileSource, load_files, normalize_frame
+
+VENDOR_CSV = """Symbol,Date,Open,High,Low,Close,Adj Close,Volume
+aapl,2024-01-02,187.15,188.44,183.89,185.64,184.9,82488700
+MSFT,2024-01-02,373.86,375.90,366.77,370.87,,25258600
+BAD,2024-01-02,-1,2,0.5,1.5,1.5,100
+TOOLONGTICKER,2024-01-02,1,2,0.5,1.5,1.5,100
+XYZ,not-a-date,1,2,0.5,1.5,1.5,100
+"""
+
+
+@pytest.fixture
+def vendor_dir(tmp_path):
+    """Directory with two daily vendor CSV files and an unrelated file."""
+    (tmp_path / "2024").mkdir()
+    (tmp_path / "2024" / "2024-01-02.csv").write_text(VENDOR_CSV)
+    (tmp_path / "2024-01-03.csv").write_text(
+        "ticker,date,open,high,low,close,volume\nAAPL,2024-01-03,1,2,0.5,1.5,100\n"
+    )
+    (tmp_path / "README.txt").write_text("not data")
+    return tmp_path
+
+
+def mock_connection(rowcount_per_call=1):
+    """psycopg2-like connection whose cursor reports a fixed rowcount."""
+    conn = MagicMock()
+    conn.cursor.return_value.__enter__.return_value.rowcount = rowcount_per_call
+    return conn
+
+
+class TestNormalizeFrame:
+    """Tests for column-wise validation."""
+
+    def test_valid_and_rejected_rows(self):
+        """Test invalid rows are dropped and counted."""
+        import io
+
+        frame, rejected = normalize_frame(pd.read_csv(io.StringIO(VENDOR_CSV)))
+
+        assert rejected == 3
+        assert list(frame.columns) == [
+            "ticker",
+            "date",
+            "open",
+            "high",
+            "low",
+            "close",
+            "adj_close",
+            "volume",
+        ]
+        assert list(frame.itertuples(index=False, name=None)) == [
+            ("AAPL", date(2024, 1, 2), 187.15, 188.44, 183.89, 185.64, 184.9, 82488700),
+            ("MSFT", date(2024, 1, 2), 373.86, 375.90, 366.77, 370.87, 370.87, 25258600),
+        ]
+
+    def test_adj_close_optional(self):
+        """Test adj_close defaults to close when the column is absent."""
+        frame, _ = normalize_frame(
+            pd.DataFrame(
+                {
+                    "ticker": ["A"],
+                    "date": ["2024-01-02"],
+                    "open": [1],
+                    "high": [2],
+                    "low": [0.5],
+                    "close": [1.5],
+                    "volume": [10],
+                }
+            )
+        )
+
+        assert frame["adj_close"].tolist() == [1.5]
+
+    def test_missing_columns(self):
+        """Test missing required columns raise."""
+        with pytest.raises(ValueError, match="volume"):
+            normalize_frame(pd.DataFrame({"ticker": ["A"], "date": ["2024-01-02"]}))
+
+
+class TestFileSource:
+    """Tests for FileSource."""
+
+    def test_files_recursive_and_sorted(self, vendor_dir):
+        """Test directories are searched recursively for data files only."""
+        files = FileSource(vendor_dir).files()
+
+        assert [f.name for f in files] == ["2024-01-02.csv", "2024-01-03.csv"]
+
+    def test_single_file(self, vendor_dir):
+        """Test a file path is its own source."""
+        path = vendor_dir / "2024-01-03.csv"
+
+        assert FileSource(path).files() == [path]
+
+    def test_csv_chunks(self, vendor_dir):
+        """Test CSV files are streamed in chunks."""
+        source = FileSource(vendor_dir, chunk_rows=2)
+
+        chunks = list(source.iter_chunks(vendor_dir / "2024" / "2024-01-02.csv"))
+
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+
+class TestLoadFiles:
+    """Tests for load_files."""
+
+    def test_loads_all_files(self, vendor_dir):
+        """Test every file is COPY-loaded and reported."""
+        conns, done = [], []
+
+        def connect():
+            conns.append(mock_connection())
+            return conns[-1]
+
+        stats = load_files(
+            FileSource(vendor_dir), connect, workers=2, on_file_done=lambda p, n: done.append(p)
+        )
+
+        assert stats == {
+            "total_files": 2,
+            "loaded": 2,
+            "failed": 0,
+            "total_records": 2,
+            "rejected": 3,
+        }
+        assert len(done) == 2
+        assert all(c.close.called for c in conns)
+        assert sum(c.commit.call_count for c in conns) == 2
+
+    def test_skips_checkpointed_files(self, vendor_dir):
+        """Test files in skip are not loaded again."""
+        source = FileSource(vendor_dir)
+
+        stats = load_files(source, mock_connection, skip={str(source.files()[0])})
+
+        assert stats["total_files"] == 1
+
+    def test_failed_file_reported(self, vendor_dir):
+        """Test a file failing to write is reported as failed."""
+        conn = mock_connection()
+        conn.cursor.return_value.__enter__.return_value.copy_expert.side_effect = RuntimeError(
+            "boom"
+        )
+        failed = []
+
+        stats = load_files(
+            FileSource(vendor_dir),
+            lambda: conn,
+            workers=1,
+            on_file_failed=lambda p, e: failed.append(e),
+        )
+
+        assert stats["failed"] == 2
+        assert stats["loaded"] == 0
+        assert failed == ["RuntimeError: boom", "RuntimeError: boom"]
+        assert conn.rollback.called
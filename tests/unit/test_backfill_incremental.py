@@ -0,0 +1,71 @@
+"""Unit tests for incremental backfill planning."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+from opa_quotes_storage.backfill import load_high_water_marks, plan_incremental
+
+
+class TestLoadHighWaterMarks:
+    """Tests for load_high_water_marks."""
+
+    def test_single_query_for_all_tickers(self):
+        """Test marks are loaded with one query and missing tickers omitted."""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [("AAPL", date(2024, 6, 28), "raw"), ("NEW", None, None)]
+
+        marks = load_high_water_marks(conn, ["AAPL", "NEW"])
+
+        assert marks == {"AAPL": date(2024, 6, 28)}
+        assert cursor.execute.call_count == 1
+        sql, params = cursor.execute.call_args.args
+        assert "unnest" in sql
+        assert params == (["AAPL", "NEW"],)
+
+    def test_adjusted_history_omitted(self):
+        """Test tickers still stored provider-adjusted get no mark (full re-download)."""
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = [("AAPL", date(2024, 6, 28), "adjusted")]
+
+        assert load_high_water_marks(conn, ["AAPL"]) == {}
+
+    def test_no_tickers(self):
+        """Test empty ticker list skips the query."""
+        conn = MagicMock()
+
+        assert load_high_water_marks(conn, []) == {}
+        assert not conn.cursor.called
+
+
+class TestPlanIncremental:
+    """Tests for plan_incremental."""
+
+    def test_existing_ticker_fetches_tail_with_overlap(self):
+        """Test tickers resume overlap_days before their latest date."""
+        plan = plan_incremental(
+            ["AAPL"], {"AAPL": date(2024, 6, 28)}, "2017-01-01", "2024-07-02", overlap_days=5
+        )
+
+        assert plan == {"AAPL": "2024-06-23"}
+
+    def test_new_ticker_uses_start_date(self):
+        """Test tickers without data get the full range."""
+        plan = plan_incremental(["NEW"], {}, "2017-01-01", "2024-07-02")
+
+        assert plan == {"NEW": "2017-01-01"}
+
+    def test_up_to_date_ticker_skipped(self):
+        """Test tickers already holding the last day are not fetched."""
+        plan = plan_incremental(["AAPL"], {"AAPL": date(2024, 7, 1)}, "2017-01-01", "2024-07-02")
+
+        assert plan == {}
+
+    def test_overlap_not_before_start_date(self):
+        """Test the overlap window never goes before start_date."""
+        plan = plan_incremental(
+            ["AAPL"], {"AAPL": date(2017, 1, 3)}, "2017-01-01", "2024-07-02", overlap_days=10
+        )
+
+        assert plan == {"AAPL": "2017-01-01"}
@@ -0,0 +1,153 @@
+"""Unit tests for shared write-path helpers."""
+
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+from opa_quotes_storage.bulk import (
+    copy_upsert,
+    encode_csv,
+    frame_to_rows,
+    iter_batches,
+    validate_records,
+)
+from opa_quotes_storage.models import OhlcvDaily
+from opa_quotes_storage.repository import QuoteSchema
+from pydantic import ValidationError
+
+
+class TestValidateRecords:
+    """Tests for validate_records."""
+
+    def test_normalizes_records(self):
+        """Test records are validated and normalized."""
+        validated = validate_records(
+            QuoteSchema, [{"symbol": "aapl", "timestamp": "2025-12-22T10:00:00Z"}]
+        )
+
+        assert validated[0]["symbol"] == "AAPL"
+
+    def test_invalid_record_raises(self):
+        """Test invalid records raise ValidationError."""
+        with pytest.raises(ValidationError):
+            validate_records(QuoteSchema, [{"symbol": "", "timestamp": "2025-12-22T10:00:00Z"}])
+
+
+class TestIterBatches:
+    """Tests for iter_batches."""
+
+    def test_splits_rows(self):
+        """Test rows are split into fixed-size batches."""
+        assert list(iter_batches([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+    def test_none_means_single_batch(self):
+        """Test None batch size yields all rows at once."""
+        assert list(iter_batches([1, 2, 3], None)) == [[1, 2, 3]]
+        assert list(iter_batches([1, 2, 3], 0)) == [[1, 2, 3]]
+
+    def test_empty_rows(self):
+        """Test empty input yields nothing."""
+        assert list(iter_batches([], None)) == []
+
+
+class TestFrameToRows:
+    """Tests for frame_to_rows."""
+
+    def test_column_order_and_native_types(self):
+        """Test columns are zipped in the requested order as native values."""
+        import pandas as pd
+
+        frame = pd.DataFrame({"volume": [100, 200], "ticker": ["A", "B"], "close": [1.5, 2.5]})
+
+        rows = frame_to_rows(frame, ["ticker", "close", "volume"])
+
+        assert rows == [("A", 1.5, 100), ("B", 2.5, 200)]
+        assert type(rows[0][2]) is int
+
+
+class TestCopyUpsert:
+    """Tests for COPY-based upsert."""
+
+    def test_encode_csv_nulls(self):
+        """Test None is encoded as an empty unquoted field."""
+        buffer = encode_csv([("AAPL", date(2024, 1, 2), None, 1.5)])
+
+        assert buffer.read() == "AAPL,2024-01-02,,1.5\n"
+
+    def test_copy_upsert_statements(self):
+        """Test staging, COPY and ON CONFLICT merge are issued."""
+        cursor = Mock()
+        cursor.rowcount = 1
+        columns = ("ticker", "date", "open", "high", "low", "close", "adj_close", "volume")
+        rows = [("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100)]
+
+        written = copy_upsert(cursor, OhlcvDaily.__table__, columns, rows, ("ticker", "date"))
+
+        assert written == 1
+        sql = " ".join(call.args[0] for call in cursor.execute.call_args_list)
+        assert "CREATE TEMP TABLE IF NOT EXISTS _stage_ohlcv_daily" in sql
+        assert "ON CONFLICT (ticker, date) DO UPDATE SET open = EXCLUDED.open" in sql
+        assert "ticker = EXCLUDED.ticker" not in sql
+        copy_sql, buffer = cursor.copy_expert.call_args.args
+        assert copy_sql.startswith("COPY _stage_ohlcv_daily (ticker, date, open")
+        assert buffer.read().startswith("AAPL,2024-01-02,1.0")
+
+    def test_copy_upsert_skips_unchanged_rows(self):
+        """Test identical rows are not rewritten by default."""
+        cursor = Mock()
+        columns = ("ticker", "date", "close")
+
+        copy_upsert(
+            cursor,
+            OhlcvDaily.__table__,
+            columns,
+            [("AAPL", date(2024, 1, 2), 1.0)],
+            ("ticker", "date"),
+        )
+        merge_sql = cursor.execute.call_args.args[0]
+        assert "WHERE (ohlcv_daily.close) IS DISTINCT FROM (EXCLUDED.close)" in merge_sql
+
+        copy_upsert(
+            cursor,
+            OhlcvDaily.__table__,
+            columns,
+            [("AAPL", date(2024, 1, 2), 1.0)],
+            ("ticker", "date"),
+            skip_unchanged=False,
+        )
+        assert "IS DISTINCT FROM" not in cursor.execute.call_args.args[0]
+
+    def test_copy_upsert_constants(self):
+        """Test constant columns are set on insert and update, not copied."""
+        cursor = Mock()
+        columns = ("ticker", "date", "close")
+
+        copy_upsert(
+            cursor,
+            OhlcvDaily.__table__,
+            columns,
+            [("AAPL", date(2024, 1, 2), 1.0)],
+            ("ticker", "date"),
+            constants={"source": "external"},
+        )
+
+        merge_sql, params = cursor.execute.call_args.args
+        assert "(ticker, date, close, source) SELECT ticker, date, close, %s FROM" in merge_sql
+        assert "source = EXCLUDED.source" in merge_sql
+        assert params == ("external",)
+        assert "source" not in cursor.copy_expert.call_args.args[0]
+
+    def test_copy_upsert_deduplicates_keys(self):
+        """Test only the last row per key is staged."""
+        cursor = Mock()
+        columns = ("ticker", "date", "close")
+        rows = [
+            ("AAPL", date(2024, 1, 2), 1.0),
+            ("AAPL", date(2024, 1, 2), 2.0),
+            ("AAPL", date(2024, 1, 3), 3.0),
+        ]
+
+        copy_upsert(cursor, OhlcvDaily.__table__, columns, rows, ("ticker", "date"))
+
+        staged = cursor.copy_expert.call_args.args[1].read().splitlines()
+        assert staged == ["AAPL,2024-01-02,2.0", "AAPL,2024-01-03,3.0"]
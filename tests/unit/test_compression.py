@@ -0,0 +1,108 @@
+"""Unit tests for ohlcv_daily compression management."""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import pytest
+from opa_quotes_storage.compression import CompressionManager
+
+CHUNKS = [
+    ("_timescaledb_internal._hyper_2_1_chunk", date(2022, 12, 1), date(2023, 11, 30), True),
+    ("_timescaledb_internal._hyper_2_2_chunk", date(2023, 11, 30), date(2024, 11, 29), True),
+    ("_timescaledb_internal._hyper_2_3_chunk", date(2024, 11, 29), date(2025, 11, 29), False),
+]
+
+
+def mock_session(chunks=CHUNKS, job_id=None):
+    """Session returning fixed chunks and policy job id."""
+    session = Mock()
+    session.execute.return_value.all.return_value = list(chunks)
+    session.execute.return_value.scalar_one_or_none.return_value = job_id
+    return session
+
+
+def executed(session):
+    """SQL text and params of every executed statement."""
+    return [(str(call.args[0]), call.args[1]) for call in session.execute.call_args_list]
+
+
+class TestCompressionManager:
+    """Tests for CompressionManager."""
+
+    def test_chunks_filtered_by_range(self):
+        """Test only chunks overlapping the range are returned."""
+        manager = CompressionManager(mock_session())
+
+        chunks = manager.chunks(date(2024, 1, 1), date(2024, 6, 30))
+
+        assert [c["name"] for c in chunks] == ["_timescaledb_internal._hyper_2_2_chunk"]
+        assert chunks[0]["is_compressed"] is True
+        assert len(manager.chunks()) == 3
+
+    def test_merge_decompresses_targeted_chunks_once(self):
+        """Test only compressed chunks receiving rows are decompressed, once."""
+        session = mock_session()
+        manager = CompressionManager(session)
+        write = Mock(return_value=2)
+        rows = [("AAPL", date(2024, 3, 1)), ("AAPL", date(2025, 3, 3))]
+
+        assert manager.merge(rows, write) == 2
+        assert manager.merge([("MSFT", date(2024, 3, 4))], write) == 2
+
+        decompressed = [p["chunk"] for sql, p in executed(session) if "decompress_chunk" in sql]
+        assert decompressed == ["_timescaledb_internal._hyper_2_2_chunk"]
+        assert manager.decompressed == ["_timescaledb_internal._hyper_2_2_chunk"]
+        write.assert_called_with([("MSFT", date(2024, 3, 4))])
+
+    def test_recompress(self):
+        """Test chunks decompressed by merge are recompressed."""
+        session = mock_session()
+        manager = CompressionManager(session)
+        manager.merge([("AAPL", date(2023, 1, 3))], Mock())
+
+        assert manager.recompress() == ["_timescaledb_internal._hyper_2_1_chunk"]
+        compressed = [p["chunk"] for sql, p in executed(session) if "SELECT compress_chunk" in sql]
+        assert compressed == ["_timescaledb_internal._hyper_2_1_chunk"]
+        assert manager.decompressed == []
+
+    def test_backfill_pauses_policy_and_recompresses_on_error(self):
+        """Test the policy is paused during a backfill and restored even on failure."""
+        session = mock_session(job_id=1001)
+        manager = CompressionManager(session)
+
+        with pytest.raises(RuntimeError):
+            with manager.backfill():
+                manager.merge([("AAPL", date(2023, 1, 3))], Mock())
+                raise RuntimeError("load failed")
+
+        alter = [p for sql, p in executed(session) if "alter_job" in sql]
+        assert alter == [
+            {"job_id": 1001, "scheduled": False},
+            {"job_id": 1001, "scheduled": True},
+        ]
+        assert any("SELECT compress_chunk" in sql for sql, _ in executed(session))
+
+    def test_backfill_without_policy(self):
+        """Test backfills work on hypertables without a compression policy."""
+        session = mock_session(chunks=[])
+        manager = CompressionManager(session)
+        write = Mock(return_value=1)
+
+        with manager.backfill():
+            assert manager.merge([("AAPL", date(2024, 1, 2))], write) == 1
+
+        assert not any("alter_job" in sql for sql, _ in executed(session))
+
+    def test_compress_range_respects_age(self):
+        """Test only uncompressed chunks older than the cutoff are compressed."""
+        recent = (
+            "_timescaledb_internal._hyper_2_4_chunk",
+            date.today() - timedelta(days=10),
+            date.today() + timedelta(days=355),
+            False,
+        )
+        manager = CompressionManager(mock_session(chunks=[*CHUNKS, recent]))
+
+        assert manager.compress_range(older_than=timedelta(days=30)) == [
+            "_timescaledb_internal._hyper_2_3_chunk"
+        ]
@@ -0,0 +1,107 @@
+"""Unit tests for ingest freshness monitoring."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+from opa_quotes_storage.freshness import FreshnessMonitor, last_seen_sql, quantile
+from opa_quotes_storage.repository import QuoteRepository
+from prometheus_client import REGISTRY
+
+# Monday 2025-12-22 11:00 New York time, during the regular session
+OPEN = datetime(2025, 12, 22, 16, 0, tzinfo=UTC)
+# Same Monday 20:00 New York time, after the close
+CLOSED = datetime(2025, 12, 23, 1, 0, tzinfo=UTC)
+
+
+def quote(symbol, age_s, now=OPEN):
+    """Validated record age_s seconds before now."""
+    return {"symbol": symbol, "timestamp": now - timedelta(seconds=age_s)}
+
+
+class TestFreshnessMonitor:
+    """Tests for FreshnessMonitor."""
+
+    def test_observe_tracks_latest_per_symbol(self):
+        """Test the newest timestamp per symbol is kept."""
+        monitor = FreshnessMonitor()
+        monitor.observe([quote("AAPL", 60), quote("AAPL", 10), quote("MSFT", 30)], OPEN)
+        monitor.observe([quote("AAPL", 120)], OPEN)
+
+        assert monitor.fed
+        assert monitor.last_seen["AAPL"] == OPEN - timedelta(seconds=10)
+        assert monitor.last_seen["MSFT"] == OPEN - timedelta(seconds=30)
+
+    def test_stale_during_session_only(self):
+        """Test symbols are stale past max_age, and only while the market is open."""
+        monitor = FreshnessMonitor(max_age=timedelta(minutes=5), symbols=["aapl", "msft", "tsla"])
+        monitor.observe([quote("AAPL", 10), quote("MSFT", 600)], OPEN)
+
+        stale = monitor.stale(OPEN)
+
+        assert stale == {"TSLA": None, "MSFT": 600.0}
+        assert monitor.stale(CLOSED) == {}
+
+    def test_no_trading_session_always_checks(self):
+        """Test a monitor without a session checks around the clock."""
+        monitor = FreshnessMonitor(trading_session=None)
+        monitor.update_last_seen([("AAPL", CLOSED - timedelta(hours=1))])
+
+        assert list(monitor.stale(CLOSED)) == ["AAPL"]
+
+    def test_lag_quantiles(self):
+        """Test lag quantiles come from the most recent written records."""
+        monitor = FreshnessMonitor(sample_size=100)
+        monitor.observe([quote("AAPL", age) for age in range(1, 102)], OPEN)
+
+        lags = monitor.lag_quantiles()
+
+        # The first sample (1s) was evicted, leaving 2..101
+        assert lags[0.5] == 51.5
+        assert lags[0.99] == pytest.approx(100.01)
+        assert FreshnessMonitor().lag_quantiles() == {}
+
+    def test_quantile_interpolates(self):
+        """Test linear interpolation between ranks."""
+        assert quantile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+        assert quantile([5.0], 0.99) == 5.0
+
+    def test_check_reports_and_exports(self):
+        """Test the health result and gauges."""
+        monitor = FreshnessMonitor(symbols=["TSLA"])
+        monitor.observe([quote("AAPL", 2)], OPEN)
+
+        result = monitor.check(OPEN)
+
+        assert result["status"] == "degraded"
+        assert result["stale_symbols"] == {"TSLA": None}
+        assert result["lag_seconds"]["p50"] == 2.0
+        assert REGISTRY.get_sample_value("opa_quotes_storage_stale_symbols") == 1
+        assert monitor.check(CLOSED)["status"] == "healthy"
+
+    def test_load_polls_time_bounded_query(self):
+        """Test polling merges the latest timestamps from the database."""
+        session = Mock()
+        session.execute.return_value.all.return_value = [("AAPL", OPEN)]
+        monitor = FreshnessMonitor()
+
+        monitor.load(session, lookback=timedelta(days=1))
+
+        assert monitor.last_seen == {"AAPL": OPEN}
+        assert not monitor.fed
+        assert "INTERVAL '86400 seconds'" in str(session.execute.call_args[0][0])
+        assert "WITH RECURSIVE" in last_seen_sql()
+        assert "GROUP BY" not in last_seen_sql()
+
+
+class TestRepositoryFeed:
+    """Tests for feeding the monitor from bulk_insert."""
+
+    def test_bulk_insert_observes_committed_records(self):
+        """Test committed batches update the monitor."""
+        monitor = FreshnessMonitor()
+        repo = QuoteRepository(Mock(), freshness=monitor)
+
+        repo.bulk_insert([{"symbol": "aapl", "timestamp": OPEN, "close": 1.0}])
+
+        assert monitor.last_seen == {"AAPL": OPEN}
@@ -1,5 +1,6 @@
 """Unit tests for health checks with mocked database."""
 
+from datetime import UTC, datetime, timedelta
 from unittest.mock import Mock, patch
 
 from opa_quotes_storage.health import HealthChecker
@@ -26,7 +27,9 @@ class TestHealthChecker:
             assert "version" in result
             assert mock_cursor.execute.called
             assert mock_cursor.close.called
-            assert mock_conn.close.called
+            # Connection is kept open for the next check
+            assert not mock_conn.close.called
+            assert result["latency_ms"] >= 0
 
     def test_check_database_connection_failure(self):
         """Test database connection failure."""
@@ -152,6 +155,130 @@ class TestHealthChecker:
             assert result["checks"]["timescaledb"]["status"] == "unhealthy"
             assert result["checks"]["hypertable"]["status"] == "unhealthy"
 
+    def test_connection_has_timeouts(self):
+        """Test the shared connection is opened with connect and statement timeouts."""
+        with patch("psycopg2.connect") as mock_connect:
+            mock_connect.return_value.cursor.return_value.fetchone.return_value = ["PostgreSQL 16"]
+
+            HealthChecker(
+                "postgresql://x", connect_timeout=2, statement_timeout_ms=500
+            ).check_database_connection()
+
+            kwargs = mock_connect.call_args.kwargs
+            assert kwargs["connect_timeout"] == 2
+            assert kwargs["options"] == "-c statement_timeout=500"
+
+    def test_checks_share_one_connection(self):
+        """Test all checks reuse one open connection."""
+        with patch("psycopg2.connect") as mock_connect:
+            mock_conn = mock_connect.return_value
+            mock_conn.closed = 0
+            mock_conn.cursor.return_value.fetchone.side_effect = [
+                ["PostgreSQL 14.0"],
+                ("timescaledb", "2.12.0"),
+                ("real_time", 3),
+            ]
+
+            result = HealthChecker().check_all()
+
+            assert result["overall_status"] == "healthy"
+            assert mock_connect.call_count == 1
+            assert all("latency_ms" in check for check in result["checks"].values())
+
+    def test_failure_drops_connection(self):
+        """Test a failed check closes the connection so the next one reconnects."""
+        with patch("psycopg2.connect") as mock_connect:
+            mock_conn = mock_connect.return_value
+            mock_conn.closed = 0
+            mock_conn.cursor.return_value.execute.side_effect = [OperationalError("timeout"), None]
+            mock_conn.cursor.return_value.fetchone.return_value = ["PostgreSQL 14.0"]
+            checker = HealthChecker()
+
+            assert checker.check_database_connection()["status"] == "unhealthy"
+            assert checker.check_database_connection()["status"] == "healthy"
+            assert mock_conn.close.called
+            assert mock_connect.call_count == 2
+
+    def test_check_all_cached(self):
+        """Test check_all reuses results within the TTL."""
+        with patch("psycopg2.connect", side_effect=OperationalError("down")) as mock_connect:
+            checker = HealthChecker(cache_ttl=60)
+
+            first = checker.check_all()
+            second = checker.check_all()
+            checker.check_all(max_age=0)
+
+            assert second["timestamp"] == first["timestamp"]
+            assert second["cache_age_s"] >= 0
+            # Extension and hypertable checks are skipped when the database is down
+            assert mock_connect.call_count == 2
+            assert "Skipped" in first["checks"]["hypertable"]["message"]
+            assert first["checks"]["hypertable"]["latency_ms"] == 0.0
+
+    def test_check_all_returns_copy(self):
+        """Test modifying a returned report does not change the cached one."""
+        with patch("psycopg2.connect", side_effect=OperationalError("down")):
+            checker = HealthChecker(cache_ttl=60)
+
+            checker.check_all()["checks"]["database"]["status"] = "healthy"
+
+            assert checker.check_all()["checks"]["database"]["status"] == "unhealthy"
+
+    def test_check_storage_reports_backlog(self):
+        """Test storage check degrades on chunks the policy is behind on."""
+        now = datetime.now(UTC)
+        chunks = [
+            (
+                "real_time",
+                "_hyper_1_1_chunk",
+                now - timedelta(days=41),
+                now - timedelta(days=40),
+                False,
+                1000,
+                1000,
+            ),
+        ]
+        jobs = [
+            (
+                "real_time",
+                1000,
+                "policy_compression",
+                True,
+                timedelta(days=30),
+                None,
+                None,
+                None,
+                now,
+                0,
+                0,
+            ),
+        ]
+        with patch("psycopg2.connect") as mock_connect:
+            mock_cursor = Mock()
+            mock_cursor.fetchall.side_effect = [chunks, jobs]
+            mock_connect.return_value.cursor.return_value = mock_cursor
+
+            result = HealthChecker().check_storage()
+
+            assert result["status"] == "degraded"
+            assert "not compressed" in result["message"]
+            assert result["hypertables"]["quotes.real_time"]["backlog_chunks"] == 1
+            assert result["latency_ms"] >= 0
+
+    def test_check_freshness_polls_without_feed(self):
+        """Test freshness check polls latest timestamps when not fed by writes."""
+        with patch("psycopg2.connect") as mock_connect:
+            mock_cursor = Mock()
+            mock_cursor.fetchall.return_value = [("AAPL", datetime.now(UTC))]
+            mock_connect.return_value.cursor.return_value = mock_cursor
+
+            checker = HealthChecker()
+            result = checker.check_freshness()
+
+            assert result["status"] == "healthy"
+            assert checker.freshness.last_seen["AAPL"] is not None
+            assert "WITH RECURSIVE" in mock_cursor.execute.call_args[0][0]
+
     def test_overall_status_degraded(self):
         """Test degraded status when some checks fail."""
         checks = {
@@ -0,0 +1,72 @@
+"""Import-time budget of the package and the health CLI path."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import opa_quotes_storage
+import pytest
+
+SRC = str(Path(__file__).parent.parent.parent / "src")
+
+# Budget for importing the health CLI (python -m opa_quotes_storage), microseconds
+HEALTH_CLI_BUDGET_US = 100_000
+
+# Modules the health CLI path must not import
+HEAVY_MODULES = ("sqlalchemy", "pydantic", "pydantic_settings", "prometheus_client", "numpy")
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    """Run code in a fresh interpreter with src on the path."""
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": SRC},
+    )
+
+
+def cumulative_us(importtime: str, module: str) -> int:
+    """Cumulative import time of a module from -X importtime output."""
+    for line in importtime.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} not in importtime output")
+
+
+class TestImportTime:
+    """Tests for lazy exports and the import-time budget."""
+
+    def test_health_cli_avoids_heavy_modules(self):
+        """Test the package and health CLI import neither ORM nor validation libraries."""
+        result = run(
+            "import sys, opa_quotes_storage.__main__; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_health_cli_import_budget(self):
+        """Test the health CLI path imports within budget (best of three)."""
+        best = min(
+            cumulative_us(
+                run("import opa_quotes_storage.__main__", "-X", "importtime").stderr,
+                "opa_quotes_storage.__main__",
+            )
+            for _ in range(3)
+        )
+
+        assert best < HEALTH_CLI_BUDGET_US
+
+    def test_lazy_exports(self):
+        """Test public names resolve on access and appear in dir()."""
+        assert set(opa_quotes_storage.__all__) <= set(dir(opa_quotes_storage))
+        assert opa_quotes_storage.QuoteRepository.__name__ == "QuoteRepository"
+        assert "QuoteRepository" in vars(opa_quotes_storage)
+
+    def test_unknown_attribute(self):
+        """Test unknown names raise AttributeError."""
+        with pytest.raises(AttributeError, match="NotAThing"):
+            opa_quotes_storage.NotAThing
@@ -0,0 +1,146 @@
+"""Unit tests for Prometheus instrumentation."""
+
+from datetime import UTC, datetime
+from unittest.mock import Mock
+
+import pytest
+from conftest import sample
+from opa_quotes_storage.metrics import instrument, instrument_engine, row_count
+from opa_quotes_storage.repository import QuoteRepository
+from pydantic import ValidationError
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import QueuePool
+
+
+QUOTE = {"symbol": "AAPL", "timestamp": datetime(2025, 12, 22, 10, 0, tzinfo=UTC), "close": 1.0}
+
+
+class TestRowCount:
+    """Tests for row_count."""
+
+    def test_shapes(self):
+        """Test lists, columnar dicts, scalars and None are counted."""
+        assert row_count([1, 2, 3]) == 3
+        assert row_count({"AAPL": {"timestamp": [1, 2]}, "MSFT": {"timestamp": [1]}}) == 3
+        assert row_count(42) == 1
+        assert row_count(None) == 0
+
+
+class TestInstrument:
+    """Tests for the instrument decorator."""
+
+    def test_records_latency_rows_and_errors(self):
+        """Test successful and failing calls are recorded."""
+
+        @instrument("test_read")
+        def read(fail=False):
+            if fail:
+                raise RuntimeError("boom")
+            return [1, 2]
+
+        count = sample("opa_quotes_storage_query_seconds_count", method="test_read")
+        rows = sample("opa_quotes_storage_query_rows_sum", method="test_read")
+
+        assert read() == [1, 2]
+        with pytest.raises(RuntimeError):
+            read(fail=True)
+
+        assert sample("opa_quotes_storage_query_seconds_count", method="test_read") == count + 1
+        assert sample("opa_quotes_storage_query_rows_sum", method="test_read") == rows + 2
+        assert sample("opa_quotes_storage_query_errors_total", method="test_read") >= 1
+
+    def test_repository_reads_instrumented(self):
+        """Test repository read methods carry their method label."""
+        session = Mock()
+        session.execute.return_value.scalars.return_value.all.return_value = ["AAPL", "MSFT"]
+        before = sample("opa_quotes_storage_query_rows_sum", method="get_symbols")
+
+        QuoteRepository(session).get_symbols()
+
+        assert sample("opa_quotes_storage_query_rows_sum", method="get_symbols") == before + 2
+
+    def test_intraday_read_counted_once(self):
+        """Test get_intraday_quotes is not also counted as get_quotes."""
+        session = Mock()
+        session.execute.return_value.scalars.return_value.all.return_value = []
+        intraday = sample("opa_quotes_storage_query_seconds_count", method="get_intraday_quotes")
+        quotes = sample("opa_quotes_storage_query_seconds_count", method="get_quotes")
+
+        QuoteRepository(session).get_intraday_quotes("AAPL", datetime(2025, 12, 22, tzinfo=UTC))
+
+        assert (
+            sample("opa_quotes_storage_query_seconds_count", method="get_intraday_quotes")
+            == intraday + 1
+        )
+        assert sample("opa_quotes_storage_query_seconds_count", method="get_quotes") == quotes
+
+
+class TestBulkInsertMetrics:
+    """Tests for bulk_insert metrics."""
+
+    def test_records_validation_db_time_and_rows(self):
+        """Test a successful insert observes validation, DB time and rows."""
+        validation = sample("opa_quotes_storage_insert_validation_seconds_count")
+        rows = sample("opa_quotes_storage_insert_rows_sum")
+
+        QuoteRepository(Mock()).bulk_insert([QUOTE, QUOTE])
+
+        assert sample("opa_quotes_storage_insert_validation_seconds_count") == validation + 1
+        assert sample("opa_quotes_storage_insert_db_seconds_count") >= 1
+        assert sample("opa_quotes_storage_insert_rows_sum") == rows + 2
+
+    def test_counts_rejects(self):
+        """Test invalid batches count every record as rejected."""
+        before = sample("opa_quotes_storage_rejected_records_total", method="bulk_insert")
+
+        with pytest.raises(ValidationError):
+            QuoteRepository(Mock()).bulk_insert([QUOTE, {**QUOTE, "close": -1}])
+
+        after = sample("opa_quotes_storage_rejected_records_total", method="bulk_insert")
+        assert after == before + 2
+
+    def test_counts_conflicts(self):
+        """Test unique violations are counted as conflicts."""
+        session = Mock()
+        session.execute.side_effect = IntegrityError("INSERT", {}, Mock(pgcode="23505"))
+        before = sample("opa_quotes_storage_conflicts_total", method="bulk_insert")
+
+        with pytest.raises(IntegrityError):
+            QuoteRepository(session).bulk_insert([QUOTE])
+
+        assert sample("opa_quotes_storage_conflicts_total", method="bulk_insert") == before + 1
+
+
+class TestInstrumentEngine:
+    """Tests for pool instrumentation."""
+
+    def test_pool_gauges_and_wait(self):
+        """Test checked-out gauge follows checkouts and waits are observed."""
+        engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=1)
+        instrument_engine(engine, name="test_pool")
+
+        with engine.connect() as first, engine.connect() as second:
+            first.execute(text("SELECT 1"))
+            second.execute(text("SELECT 1"))
+            assert sample("opa_quotes_storage_pool_checked_out", pool="test_pool") == 2
+            assert sample("opa_quotes_storage_pool_overflow", pool="test_pool") == 1
+
+        assert sample("opa_quotes_storage_pool_checked_out", pool="test_pool") == 0
+        assert sample("opa_quotes_storage_pool_wait_seconds_count", pool="test_pool") == 2
+        engine.dispose()
+
+    def test_wait_recorded_after_dispose(self):
+        """Test the pool created by dispose() is timed as well."""
+        engine = create_engine("sqlite://", poolclass=QueuePool)
+        instrument_engine(engine, name="test_disposed")
+        with engine.connect():
+            pass
+
+        engine.dispose()
+        for _ in range(2):
+            with engine.connect():
+                pass
+
+        assert sample("opa_quotes_storage_pool_wait_seconds_count", pool="test_disposed") == 3
+        engine.dispose()
@@ -1,9 +1,9 @@
 """Unit tests for SQLAlchemy models."""
 
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from decimal import Decimal
 
-from opa_quotes_storage.models import RealTimeQuote
+from opa_quotes_storage.models import OhlcvDaily, RealTimeQuote
 
 
 class TestRealTimeQuote:
@@ -104,3 +104,60 @@ class TestRealTimeQuote:
         assert "symbol" in pk_columns
         assert "timestamp" in pk_columns
         assert len(pk_columns) == 2
+
+
+class TestOhlcvDaily:
+    """Tests for OhlcvDaily model."""
+
+    def test_ohlcv_daily_creation(self):
+        """Test creating an OhlcvDaily instance."""
+        bar = OhlcvDaily(
+            ticker="AAPL",
+            date=date(2024, 1, 2),
+            open=187.15,
+            high=188.44,
+            low=183.89,
+            close=185.64,
+            adj_close=184.94,
+            volume=82488700,
+        )
+
+        assert bar.ticker == "AAPL"
+        assert bar.date == date(2024, 1, 2)
+        assert bar.adj_close == 184.94
+
+    def test_ohlcv_daily_to_dict(self):
+        """Test converting bar to dictionary."""
+        bar = OhlcvDaily(
+            ticker="MSFT",
+            date=date(2024, 1, 2),
+            open=373.86,
+            high=375.90,
+            low=366.77,
+            close=370.87,
+            adj_close=370.87,
+            volume=25258600,
+        )
+
+        bar_dict = bar.to_dict()
+
+        assert bar_dict["ticker"] == "MSFT"
+        assert bar_dict["date"] == "2024-01-02"
+        assert bar_dict["close"] == 370.87
+        assert bar_dict["volume"] == 25258600
+        assert "OhlcvDaily" in repr(bar)
+
+    def test_table_name_and_primary_key(self):
+        """Test table, schema and primary key (ticker, date)."""
+        assert OhlcvDaily.__tablename__ == "ohlcv_daily"
+        assert OhlcvDaily.__table_args__ == {"schema": "quotes"}
+
+        pk_columns = {col.name for col in OhlcvDaily.__table__.primary_key.columns}
+        assert pk_columns == {"ticker", "date"}
+
+    def test_source_column(self):
+        """Test provenance column defaults to 'external' in the database."""
+        source = OhlcvDaily.__table__.c.source
+
+        assert not source.nullable
+        assert "external" in str(source.server_default.arg)
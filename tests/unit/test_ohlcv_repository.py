@@ -0,0 +1,166 @@
+"""Unit tests for OhlcvDailyRepository."""
+
+from datetime import date
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from opa_quotes_storage.ohlcv_repository import OhlcvDailyRepository, OhlcvDailySchema
+from pydantic import ValidationError
+
+
+def _bar(**overrides):
+    bar = {
+        "ticker": "AAPL",
+        "date": date(2024, 1, 2),
+        "open": 187.15,
+        "high": 188.44,
+        "low": 183.89,
+        "close": 185.64,
+        "volume": 82488700,
+    }
+    bar.update(overrides)
+    return bar
+
+
+class TestOhlcvDailySchema:
+    """Tests for OhlcvDailySchema validation."""
+
+    def test_valid_bar(self):
+        """Test validating a valid bar."""
+        bar = OhlcvDailySchema(**_bar(ticker="aapl"))
+
+        assert bar.ticker == "AAPL"
+        assert bar.adj_close == bar.close  # Defaults to close
+
+    def test_explicit_adj_close(self):
+        """Test adjusted close is kept when provided."""
+        bar = OhlcvDailySchema(**_bar(adj_close=184.94))
+
+        assert bar.adj_close == 184.94
+
+    def test_negative_prices_rejected(self):
+        """Test that negative prices raise error."""
+        with pytest.raises(ValidationError):
+            OhlcvDailySchema(**_bar(low=-1.0))
+
+    def test_missing_volume_rejected(self):
+        """Test that volume is required."""
+        bar = _bar()
+        del bar["volume"]
+
+        with pytest.raises(ValidationError):
+            OhlcvDailySchema(**bar)
+
+
+class TestOhlcvDailyRepository:
+    """Tests for OhlcvDailyRepository."""
+
+    def test_bulk_upsert_empty(self):
+        """Test empty input does not touch the database."""
+        mock_session = Mock()
+        repo = OhlcvDailyRepository(session=mock_session)
+
+        assert repo.bulk_upsert([]) == 0
+        assert not mock_session.connection.called
+
+    def test_bulk_upsert_uses_copy(self):
+        """Test bars are written with COPY and committed."""
+        mock_session = Mock()
+        cursor = mock_session.connection.return_value.connection.cursor.return_value
+        cursor.rowcount = 2
+        repo = OhlcvDailyRepository(session=mock_session)
+
+        count = repo.bulk_upsert([_bar(), _bar(date=date(2024, 1, 3))])
+
+        assert count == 2
+        assert cursor.copy_expert.called
+        assert "price_basis" in cursor.execute.call_args_list[-1].args[0]
+        assert cursor.close.called
+        assert mock_session.commit.called
+
+    def test_bulk_upsert_through_compression_manager(self):
+        """Test writes decompress their target chunks first, as backfills do."""
+        mock_session = Mock()
+        cursor = mock_session.connection.return_value.connection.cursor.return_value
+        cursor.rowcount = 1
+        compression = Mock()
+        compression.merge.side_effect = lambda rows, write: write(rows)
+        repo = OhlcvDailyRepository(session=mock_session, compression=compression)
+
+        assert repo.bulk_upsert([_bar()]) == 1
+        rows = compression.merge.call_args.args[0]
+        assert [row[:2] for row in rows] == [("AAPL", date(2024, 1, 2))]
+        assert cursor.copy_expert.called
+
+    def test_bulk_upsert_batches(self):
+        """Test batch_size splits COPY calls."""
+        mock_session = Mock()
+        cursor = mock_session.connection.return_value.connection.cursor.return_value
+        cursor.rowcount = 1
+        repo = OhlcvDailyRepository(session=mock_session)
+
+        bars = [_bar(date=date(2024, 1, d)) for d in range(2, 5)]
+        count = repo.bulk_upsert(bars, batch_size=1)
+
+        assert count == 3
+        assert cursor.copy_expert.call_count == 3
+
+    def test_bulk_upsert_validates(self):
+        """Test invalid bars are rejected before writing."""
+        mock_session = Mock()
+        repo = OhlcvDailyRepository(session=mock_session)
+
+        with pytest.raises(ValidationError):
+            repo.bulk_upsert([_bar(ticker="")])
+        assert not mock_session.commit.called
+
+    def test_get_bars_columnar(self):
+        """Test rows are pivoted into columnar lists per ticker."""
+        mock_session = Mock()
+        mock_session.execute.return_value = [
+            ("AAPL", date(2024, 1, 2), 1.0, 2.0, 0.5, 1.5, 1.5, 100),
+            ("AAPL", date(2024, 1, 3), 1.5, 2.5, 1.0, 2.0, 2.0, 200),
+            ("MSFT", date(2024, 1, 2), 3.0, 4.0, 2.5, 3.5, 3.5, 300),
+        ]
+        repo = OhlcvDailyRepository(session=mock_session)
+
+        bars = repo.get_bars(["aapl", "msft"], date(2024, 1, 1), date(2024, 1, 31))
+
+        assert bars["AAPL"]["date"] == [date(2024, 1, 2), date(2024, 1, 3)]
+        assert bars["AAPL"]["close"] == [1.5, 2.0]
+        assert bars["MSFT"]["volume"] == [300]
+
+    def test_get_latest_bar(self):
+        """Test getting latest bar."""
+        mock_session = Mock()
+        mock_execute = MagicMock()
+        mock_execute.scalar_one_or_none.return_value = None
+        mock_session.execute.return_value = mock_execute
+        repo = OhlcvDailyRepository(session=mock_session)
+
+        assert repo.get_latest_bar("AAPL") is None
+        assert mock_session.execute.called
+
+    def test_resample_query(self):
+        """Test resampling aggregates in the database."""
+        from sqlalchemy.dialects import postgresql
+
+        mock_session = Mock()
+        mock_session.execute.return_value = []
+        repo = OhlcvDailyRepository(session=mock_session)
+
+        result = repo.resample("AAPL", date(2024, 1, 1), date(2024, 12, 31), period="month")
+
+        assert result == {}
+        stmt = mock_session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "date_trunc" in sql
+        assert "first(" in sql
+        assert "last(" in sql
+
+    def test_resample_invalid_period(self):
+        """Test unknown periods raise ValueError."""
+        repo = OhlcvDailyRepository(session=Mock())
+
+        with pytest.raises(ValueError):
+            repo.resample("AAPL", date(2024, 1, 1), date(2024, 12, 31), period="quarter")
@@ -0,0 +1,104 @@
+"""Unit tests for query plan capture and summaries."""
+
+import json
+from unittest.mock import MagicMock
+
+from opa_quotes_storage.plans import capture_plans, explain_statement, summarize
+from sqlalchemy import create_engine, text
+
+# get_quotes on a hypertable: runtime exclusion skipped one of two chunks
+EXPLAIN = [
+    {
+        "Plan": {
+            "Node Type": "Custom Scan",
+            "Custom Plan Provider": "ChunkAppend",
+            "Shared Hit Blocks": 12,
+            "Shared Read Blocks": 3,
+            "Plans": [
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "_hyper_1_1_chunk",
+                    "Index Name": "_hyper_1_1_chunk_real_time_pkey",
+                    "Actual Loops": 1,
+                },
+                {
+                    "Node Type": "Index Scan",
+                    "Relation Name": "_hyper_1_2_chunk",
+                    "Index Name": "_hyper_1_2_chunk_real_time_pkey",
+                    "Actual Loops": 0,
+                },
+            ],
+        },
+        "Planning Time": 0.8,
+        "Execution Time": 0.3,
+    }
+]
+
+
+class TestSummarize:
+    """Tests for summarize."""
+
+    def test_index_scans_and_exclusion(self):
+        """Test scanned relations, indexes and timings are extracted."""
+        summary = summarize(json.dumps(EXPLAIN))
+
+        assert summary.node_types == ("Custom Scan", "Index Scan", "Index Scan")
+        assert summary.scanned == ("_hyper_1_1_chunk",)
+        assert summary.seq_scanned == ()
+        assert len(summary.indexes) == 2
+        assert not summary.has_sort
+        assert summary.planning_ms == 0.8
+        assert summary.execution_ms == 0.3
+        assert summary.shared_hit_blocks == 12
+
+    def test_seq_scan_and_sort(self):
+        """Test sequential scans and sorts are flagged."""
+        explain = [
+            {
+                "Plan": {
+                    "Node Type": "Sort",
+                    "Plans": [{"Node Type": "Seq Scan", "Relation Name": "real_time"}],
+                }
+            }
+        ]
+
+        summary = summarize(explain)
+
+        assert summary.has_sort
+        assert summary.seq_scanned == ("real_time",)
+        assert summary.planning_ms is None
+
+
+class TestCapturePlans:
+    """Tests for explain_statement and capture_plans."""
+
+    def test_explain_statement_rolls_back(self):
+        """Test EXPLAIN options and rollback."""
+        conn = MagicMock()
+        conn.exec_driver_sql.return_value.scalar.return_value = json.dumps(EXPLAIN)
+
+        plan = explain_statement(conn, "SELECT %(x)s", {"x": 1}, analyze=False)
+
+        assert plan == EXPLAIN
+        assert conn.exec_driver_sql.call_args[0] == ("EXPLAIN (FORMAT JSON) SELECT %(x)s", {"x": 1})
+        conn.rollback.assert_called_once()
+
+    def test_capture_replays_executed_statements(self, monkeypatch):
+        """Test statements run by the call are replayed under EXPLAIN."""
+        engine = create_engine("sqlite://")
+        replayed = []
+
+        def fake_explain(conn, statement, parameters, analyze):
+            replayed.append((statement, parameters, analyze))
+            return EXPLAIN
+
+        monkeypatch.setattr("opa_quotes_storage.plans.explain_statement", fake_explain)
+
+        def call():
+            with engine.connect() as conn:
+                conn.execute(text("SELECT :x"), {"x": 1})
+
+        plans = capture_plans(engine, call)
+
+        assert replayed == [("SELECT ?", (1,), True)]
+        assert plans[0].scanned == ("_hyper_1_1_chunk",)
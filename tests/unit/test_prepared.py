@@ -0,0 +1,132 @@
+"""Unit tests for server-side prepared statements."""
+
+from datetime import UTC, datetime
+from unittest.mock import Mock
+
+import pytest
+from opa_quotes_storage.prepared import (
+    COLUMNS,
+    INSERT_QUOTES,
+    LATEST_QUOTE,
+    QUOTES_RANGE,
+    STATEMENTS,
+    columns,
+    forget,
+    prepare,
+    prepare_all,
+    supports_prepared,
+)
+from sqlalchemy.exc import DBAPIError
+
+
+def make_conn(name="postgresql", driver="psycopg2"):
+    """Connection mock with a real info dict."""
+    conn = Mock()
+    conn.info = {}
+    conn.dialect.name = name
+    conn.dialect.driver = driver
+    return conn
+
+
+def db_error(pgcode):
+    """DBAPIError whose driver error carries a SQLSTATE."""
+    return DBAPIError("EXECUTE", {}, Mock(pgcode=pgcode))
+
+
+class TestStatements:
+    """Tests for the statement texts."""
+
+    def test_names_match_prepare_and_execute(self):
+        """Test each statement prepares and executes under its own name."""
+        for statement in STATEMENTS:
+            assert statement.prepare.startswith(f"PREPARE {statement.name} (")
+            assert statement.execute.startswith(f"EXECUTE {statement.name}(")
+
+    def test_select_lists_model_columns(self):
+        """Test reads return every model column, in model order."""
+        select_list = ", ".join(COLUMNS)
+        assert f"SELECT {select_list} FROM quotes.real_time" in LATEST_QUOTE.prepare
+        assert f"SELECT {select_list} FROM quotes.real_time" in QUOTES_RANGE.prepare
+
+    def test_insert_takes_one_typed_array_per_column(self):
+        """Test the insert unnests one array per column, cast on EXECUTE."""
+        assert "unnest($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)" in INSERT_QUOTES.prepare
+        assert "NUMERIC(10, 2)[]" in INSERT_QUOTES.prepare
+        assert "CAST(:volume AS BIGINT[])" in INSERT_QUOTES.execute
+        assert INSERT_QUOTES.execute.count("CAST(") == len(COLUMNS)
+
+
+class TestPrepare:
+    """Tests for the per-connection statement cache."""
+
+    def test_prepares_once_per_connection(self):
+        """Test PREPARE is issued on first use only."""
+        conn = make_conn()
+
+        assert prepare(conn, LATEST_QUOTE)
+        assert not prepare(conn, LATEST_QUOTE)
+
+        conn.exec_driver_sql.assert_called_once_with(LATEST_QUOTE.prepare)
+
+    def test_connections_have_separate_caches(self):
+        """Test each connection prepares its own copy."""
+        first, second = make_conn(), make_conn()
+
+        assert prepare(first, QUOTES_RANGE)
+        assert prepare(second, QUOTES_RANGE)
+
+    def test_failed_prepare_not_cached(self):
+        """Test a statement is only cached once PREPARE succeeded."""
+        conn = make_conn()
+        conn.exec_driver_sql.side_effect = [db_error("42P01"), None]
+
+        with pytest.raises(DBAPIError):
+            prepare(conn, LATEST_QUOTE)
+        assert prepare(conn, LATEST_QUOTE)
+
+    def test_prepare_all(self):
+        """Test every hot statement is prepared, skipping cached ones."""
+        conn = make_conn()
+        prepare(conn, LATEST_QUOTE)
+
+        assert prepare_all(conn) == len(STATEMENTS) - 1
+
+    def test_forget_unknown_statement(self):
+        """Test the cache is dropped when the server lost the statements."""
+        conn = make_conn()
+        prepare(conn, LATEST_QUOTE)
+
+        forget(conn, db_error("26000"))
+
+        assert prepare(conn, LATEST_QUOTE)
+
+    def test_forget_keeps_cache_on_other_errors(self):
+        """Test unrelated errors keep the cache."""
+        conn = make_conn()
+        prepare(conn, LATEST_QUOTE)
+
+        forget(conn, db_error("23505"))
+
+        assert not prepare(conn, LATEST_QUOTE)
+
+    def test_supports_prepared(self):
+        """Test only psycopg2 on PostgreSQL uses PREPARE."""
+        assert supports_prepared(make_conn())
+        assert not supports_prepared(make_conn(driver="asyncpg"))
+        assert not supports_prepared(make_conn(name="sqlite", driver="pysqlite"))
+
+
+class TestColumns:
+    """Tests for transposing records into array parameters."""
+
+    def test_columns(self):
+        """Test records become one list per column, missing values as None."""
+        ts = datetime(2025, 12, 22, 10, 0, tzinfo=UTC)
+        params = columns(
+            [{"symbol": "AAPL", "timestamp": ts, "close": 1}, {"symbol": "MSFT", "timestamp": ts}]
+        )
+
+        assert list(params) == list(COLUMNS)
+        assert params["symbol"] == ["AAPL", "MSFT"]
+        assert params["close"] == [1, None]
+        assert params["bid"] == [None, None]
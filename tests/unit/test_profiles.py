@@ -0,0 +1,171 @@
+"""Unit tests for session tuning profiles."""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from opa_quotes_storage import ohlcv_repository, repository
+from opa_quotes_storage.ohlcv_repository import OhlcvDailyRepository
+from opa_quotes_storage.profiles import (
+    ANALYTICS,
+    DEFAULT_PROFILE_KEY,
+    INGEST,
+    INTERACTIVE,
+    SessionProfile,
+    apply_profile,
+    get_profile,
+)
+from opa_quotes_storage.repository import QuoteRepository
+
+
+def make_session(dialect="postgresql"):
+    """Session mock on a connection of the given dialect."""
+    session = MagicMock()
+    session.info = {}
+    session.connection.return_value.dialect.name = dialect
+    session.connection.return_value.info = {}
+    return session
+
+
+class TestSessionProfile:
+    """Tests for profile definitions."""
+
+    def test_builtin_profiles(self):
+        """Test the ingest, analytics and interactive settings."""
+        assert INGEST.settings["synchronous_commit"] == "off"
+        assert INGEST.batch_size > 1000
+        assert int(ANALYTICS.settings["max_parallel_workers_per_gather"]) > 0
+        assert "work_mem" in ANALYTICS.settings
+        assert INTERACTIVE.settings["statement_timeout"] == "2s"
+
+    def test_get_profile(self):
+        """Test lookup by name and rejection of unknown names."""
+        assert get_profile("ingest") is INGEST
+        with pytest.raises(ValueError):
+            get_profile("bulk")
+
+    def test_options_escape_spaces(self):
+        """Test libpq options escape spaces and backslashes."""
+        profile = SessionProfile(name="x", settings={"search_path": "a, b", "x": "c\\d"})
+
+        assert profile.options() == "-c search_path=a,\\ b -c x=c\\\\d"
+
+
+class TestApplyProfile:
+    """Tests for apply_profile."""
+
+    def test_single_set_local_statement(self):
+        """Test all settings are sent in one transaction-local statement."""
+        session = make_session()
+
+        assert apply_profile(session, ANALYTICS)
+
+        stmt, params = session.execute.call_args.args
+        assert str(stmt).count("set_config(") == 3
+        assert str(stmt).count(", true)") == 3
+        assert params["name_0"] == "work_mem"
+        assert params["value_0"] == "256MB"
+
+    def test_skipped_when_already_applied_in_transaction(self):
+        """Test the profile is sent once per transaction."""
+        session = make_session()
+
+        assert apply_profile(session, INTERACTIVE)
+        assert not apply_profile(session, INTERACTIVE)
+        assert apply_profile(session, INGEST)
+        session.execute.reset_mock()
+
+        session.get_transaction.return_value = Mock()  # New transaction
+        assert apply_profile(session, INGEST)
+        session.execute.assert_called_once()
+
+    def test_switch_resets_settings_of_previous_profile(self):
+        """Test interactive -> ingest in one transaction resets statement_timeout."""
+        session = make_session()
+
+        apply_profile(session, INTERACTIVE)
+        assert apply_profile(session, INGEST)
+
+        stmt, params = session.execute.call_args.args
+        assert str(stmt).count(", true)") == 4
+        assert "reset_val FROM pg_settings" in str(stmt)
+        resets = {v for k, v in params.items() if k.startswith("reset_")}
+        assert resets == {"statement_timeout", "max_parallel_workers_per_gather"}
+        assert "work_mem" not in resets
+
+    def test_connection_default_restored_after_switch(self):
+        """Test the connection default profile is re-applied after another one."""
+        session = make_session()
+        session.connection.return_value.info[DEFAULT_PROFILE_KEY] = "ingest"
+
+        assert apply_profile(session, INTERACTIVE)
+        assert apply_profile(session, INGEST)
+
+        _, params = session.execute.call_args.args
+        assert params["value_0"] == "off"
+        assert "statement_timeout" in params.values()
+
+    def test_skipped_for_connection_default(self):
+        """Test connections opened with the profile need no SET LOCAL."""
+        session = make_session()
+        session.connection.return_value.info[DEFAULT_PROFILE_KEY] = "ingest"
+
+        assert not apply_profile(session, INGEST)
+        assert apply_profile(session, INTERACTIVE)
+
+    def test_skipped_on_other_dialects(self):
+        """Test non-PostgreSQL connections are left alone."""
+        session = make_session("sqlite")
+
+        assert not apply_profile(session, INGEST)
+        session.execute.assert_not_called()
+
+    def test_empty_profile(self):
+        """Test a profile without settings sends nothing."""
+        session = make_session()
+
+        assert not apply_profile(session, SessionProfile(name="none"))
+        session.connection.assert_not_called()
+
+
+class TestRepositoryProfiles:
+    """Tests for the profile each repository method picks."""
+
+    def _profiles(self, module, call):
+        """Profile names applied while running call."""
+        with patch.object(module, "apply_profile") as apply:
+            call()
+        return [c.args[1].name for c in apply.call_args_list]
+
+    def test_quote_repository_methods(self):
+        """Test writes ingest, point reads are interactive, scans are analytics."""
+        repo = QuoteRepository(session=MagicMock(), prepared=False, profiles=True)
+        now = datetime(2025, 12, 22, 10, 0, tzinfo=UTC)
+
+        assert self._profiles(
+            repository, lambda: repo.bulk_insert([{"symbol": "AAPL", "timestamp": now}])
+        ) == ["ingest"]
+        assert self._profiles(repository, lambda: repo.get_latest_quote("AAPL")) == ["interactive"]
+        assert self._profiles(repository, lambda: repo.get_quotes("AAPL", now, now)) == [
+            "interactive"
+        ]
+        assert self._profiles(repository, lambda: repo.count_quotes("AAPL")) == ["analytics"]
+        assert self._profiles(repository, lambda: repo.get_symbols()) == ["analytics"]
+
+    def test_ohlcv_repository_methods(self):
+        """Test daily bar writes ingest and multi-year reads are analytics."""
+        repo = OhlcvDailyRepository(session=MagicMock(), profiles=True)
+        day = datetime(2024, 1, 2).date()
+
+        assert self._profiles(ohlcv_repository, lambda: repo.get_bars("AAPL", day, day)) == [
+            "analytics"
+        ]
+        assert self._profiles(ohlcv_repository, lambda: repo.get_latest_bar("AAPL")) == [
+            "interactive"
+        ]
+
+    def test_disabled(self):
+        """Test profiles=False applies nothing."""
+        repo = QuoteRepository(session=MagicMock(), prepared=False, profiles=False)
+
+        assert self._profiles(repository, lambda: repo.get_latest_quote("AAPL")) == []
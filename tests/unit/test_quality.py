@@ -0,0 +1,112 @@
+"""Unit tests for the set-based ohlcv_daily quality report."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+from opa_quotes_storage.quality import check_tickers, is_anomaly, quality_report
+from opa_quotes_storage.trading_calendar import TradingSession
+
+GAP_ROW = (
+    "AAPL",
+    3,
+    date(2024, 1, 1),
+    date(2024, 1, 15),
+    8,
+    [[date(2024, 1, 2), date(2024, 1, 15)]],
+    0,
+    0,
+    0,
+    0,
+)
+MISSING_ROW = ("NODATA", 0, None, None, 0, [], 0, 0, 0, 0)
+
+
+def mock_cursor(rows):
+    """DB-API cursor returning fixed rows."""
+    cursor = MagicMock()
+    cursor.fetchall.return_value = rows
+    return cursor
+
+
+class TestCheckTickers:
+    """Tests for check_tickers."""
+
+    def test_maps_rows(self):
+        """Test rows become report entries with gap tuples."""
+        report = check_tickers(mock_cursor([GAP_ROW, MISSING_ROW]), ["AAPL", "NODATA"])
+
+        assert report[0]["ticker"] == "AAPL"
+        assert report[0]["missing_sessions"] == 8
+        assert report[0]["gaps"] == [(date(2024, 1, 2), date(2024, 1, 15))]
+        assert report[1]["record_count"] == 0
+
+    def test_single_query_with_calendar(self):
+        """Test one statement carries tickers and calendar parameters."""
+        cursor = mock_cursor([])
+        calendar = TradingSession(name="X", weekdays=frozenset({1, 2}), holidays={date(2024, 1, 1)})
+
+        check_tickers(cursor, ["AAPL", "MSFT"], calendar=calendar, max_missing_sessions=0)
+
+        assert cursor.execute.call_count == 1
+        params = cursor.execute.call_args.args[1]
+        assert params["tickers"] == ["AAPL", "MSFT"]
+        assert params["weekdays"] == [1, 2]
+        assert params["holidays"] == [date(2024, 1, 1)]
+        assert params["max_missing_sessions"] == 0
+        assert params["include_clean"] is False
+
+    def test_empty_tickers(self):
+        """Test no query is issued without tickers."""
+        cursor = mock_cursor([])
+
+        assert check_tickers(cursor, []) == []
+        assert not cursor.execute.called
+
+
+class TestIsAnomaly:
+    """Tests for is_anomaly."""
+
+    def test_clean_and_anomalous_entries(self):
+        """Test entries without failed checks are clean."""
+        clean = dict(
+            record_count=3,
+            gaps=[],
+            ohlc_violations=0,
+            bad_volume=0,
+            duplicate_days=0,
+            off_calendar=0,
+        )
+
+        assert not is_anomaly(clean)
+        assert is_anomaly({**clean, "record_count": 0})
+        assert is_anomaly({**clean, "ohlc_violations": 2})
+
+
+class TestQualityReport:
+    """Tests for quality_report."""
+
+    def test_chunks_and_sorts(self):
+        """Test tickers are checked in chunks and merged in ticker order."""
+        engine = MagicMock()
+        cursor = engine.raw_connection.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchall.side_effect = lambda: [
+            (t, 0, None, None, 0, [], 0, 0, 0, 0)
+            for t in cursor.execute.call_args.args[1]["tickers"]
+        ]
+
+        report = quality_report(engine, ["C", "B", "A"], chunk_size=2, workers=1)
+
+        assert cursor.execute.call_count == 2
+        assert [entry["ticker"] for entry in report] == ["A", "B", "C"]
+        assert engine.raw_connection.return_value.close.call_count == 2
+
+    def test_all_tickers_by_default(self):
+        """Test stored tickers are listed when none are given."""
+        engine = MagicMock()
+        conn = engine.connect.return_value.__enter__.return_value
+        conn.exec_driver_sql.return_value.scalars.return_value = ["AAPL"]
+        cursor = engine.raw_connection.return_value.cursor.return_value.__enter__.return_value
+        cursor.fetchall.return_value = []
+
+        assert quality_report(engine) == []
+        assert cursor.execute.call_args.args[1]["tickers"] == ["AAPL"]
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, Mock
 import pytest
 from opa_quotes_storage.repository import QuoteRepository, QuoteSchema
 from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
 
 
 class TestQuoteSchema:
@@ -212,3 +213,197 @@ class TestQuoteRepository:
         )
 
         assert mock_session.execute.called
+
+
+class TestGapfilledSeries:
+    """Tests for QuoteRepository.get_gapfilled_series."""
+
+    def _compile(self, stmt):
+        from sqlalchemy.dialects import postgresql
+
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    def test_locf_query_uses_gapfill(self):
+        """Test that LOCF fill is pushed down to TimescaleDB."""
+        repo = QuoteRepository(session=Mock())
+
+        stmt = repo._gapfill_statement(
+            ["AAPL"],
+            datetime(2025, 12, 22, tzinfo=UTC),
+            datetime(2025, 12, 23, tzinfo=UTC),
+            "1m",
+            "locf",
+            None,
+        )
+        sql = self._compile(stmt)
+
+        assert "time_bucket_gapfill" in sql
+        assert "locf(" in sql
+        # Seeded with the last close before the window
+        assert "ORDER BY real_time_1.timestamp DESC" in sql
+
+    def test_interpolate_query(self):
+        """Test interpolate fill strategy."""
+        repo = QuoteRepository(session=Mock())
+
+        stmt = repo._gapfill_statement(
+            ["AAPL"],
+            datetime(2025, 12, 22, tzinfo=UTC),
+            datetime(2025, 12, 23, tzinfo=UTC),
+            "5m",
+            "interpolate",
+            None,
+        )
+        sql = self._compile(stmt)
+
+        assert "interpolate(" in sql
+        assert "locf(" not in sql
+
+    def test_trading_session_filter(self):
+        """Test that session calendars filter buckets in local time."""
+        from opa_quotes_storage.trading_calendar import US_EQUITIES
+
+        repo = QuoteRepository(session=Mock())
+
+        stmt = repo._gapfill_statement(
+            ["AAPL"],
+            datetime(2025, 12, 22, tzinfo=UTC),
+            datetime(2025, 12, 23, tzinfo=UTC),
+            "1m",
+            "locf",
+            US_EQUITIES,
+        )
+        sql = self._compile(stmt)
+
+        assert "timezone(" in sql
+        assert "isodow" in sql
+
+    def test_invalid_fill_rejected(self):
+        """Test that unknown fill strategies raise ValueError."""
+        repo = QuoteRepository(session=Mock())
+
+        with pytest.raises(ValueError):
+            repo.get_gapfilled_series(
+                "AAPL", datetime(2025, 12, 22), datetime(2025, 12, 23), fill="nearest"
+            )
+
+    def test_invalid_interval_rejected(self):
+        """Test that unknown intervals raise ValueError."""
+        repo = QuoteRepository(session=Mock())
+
+        with pytest.raises(ValueError):
+            repo.get_gapfilled_series(
+                "AAPL", datetime(2025, 12, 22), datetime(2025, 12, 23), interval="7m"
+            )
+
+    def test_columnar_output(self):
+        """Test rows are returned as columnar lists per symbol."""
+        t0 = datetime(2025, 12, 22, 14, 30, tzinfo=UTC)
+        t1 = datetime(2025, 12, 22, 14, 31, tzinfo=UTC)
+        mock_session = Mock()
+        mock_session.execute.return_value = [
+            ("AAPL", t0, 180.0, 181.0, 179.5, 180.5, 1000),
+            ("AAPL", t1, 180.5, 180.5, 180.5, 180.5, 0),
+            ("MSFT", t0, 420.0, 421.0, 419.0, 420.5, 500),
+        ]
+
+        repo = QuoteRepository(session=mock_session)
+        grid = repo.get_gapfilled_series(["aapl", "msft"], t0, t1)
+
+        assert set(grid) == {"AAPL", "MSFT"}
+        assert grid["AAPL"]["timestamp"] == [t0, t1]
+        assert grid["AAPL"]["close"] == [180.5, 180.5]
+        assert grid["AAPL"]["volume"] == [1000, 0]
+        assert grid["MSFT"]["open"] == [420.0]
+
+
+class TestPreparedStatements:
+    """Tests for QuoteRepository on server-side prepared statements."""
+
+    def _session(self):
+        """Session mock whose connection is psycopg2 on PostgreSQL."""
+        conn = Mock()
+        conn.info = {}
+        conn.dialect.name = "postgresql"
+        conn.dialect.driver = "psycopg2"
+        session = MagicMock()
+        session.connection.return_value = conn
+        return session, conn
+
+    def test_get_latest_quote_executes_prepared(self):
+        """Test the latest quote runs EXECUTE after a one-time PREPARE."""
+        session, conn = self._session()
+        repo = QuoteRepository(session=session, prepared=True, profiles=False)
+
+        repo.get_latest_quote("aapl")
+        repo.get_latest_quote("msft")
+
+        conn.exec_driver_sql.assert_called_once()
+        assert "PREPARE opa_latest_quote" in conn.exec_driver_sql.call_args.args[0]
+        stmt, params = session.execute.call_args.args
+        assert "EXECUTE opa_latest_quote" in str(stmt)
+        assert params == {"symbol": "MSFT"}
+
+    def test_get_quotes_passes_null_limit(self):
+        """Test a missing limit is sent as NULL (no limit)."""
+        session, _ = self._session()
+        repo = QuoteRepository(session=session, prepared=True, profiles=False)
+        start = datetime(2025, 12, 1, tzinfo=UTC)
+        end = datetime(2025, 12, 2, tzinfo=UTC)
+
+        repo.get_quotes("aapl", start, end)
+
+        stmt, params = session.execute.call_args.args
+        assert "EXECUTE opa_quotes_range" in str(stmt)
+        assert params == {"symbol": "AAPL", "start_date": start, "end_date": end, "limit": None}
+
+    def test_bulk_insert_executes_one_array_batch(self):
+        """Test each batch is one EXECUTE with column arrays."""
+        session, conn = self._session()
+        repo = QuoteRepository(session=session, prepared=True, profiles=False)
+        quotes = [
+            {"symbol": "aapl", "timestamp": datetime(2025, 12, 22, 10, i), "close": 1}
+            for i in range(3)
+        ]
+
+        assert repo.bulk_insert(quotes, batch_size=2) == 3
+
+        assert conn.exec_driver_sql.call_count == 1
+        batches = [c.args[1] for c in session.execute.call_args_list]
+        assert [b["symbol"] for b in batches] == [["AAPL", "AAPL"], ["AAPL"]]
+        assert batches[1]["close"] == [Decimal("1")]
+        session.commit.assert_called_once()
+
+    def test_unknown_statement_reprepares(self):
+        """Test a lost statement is prepared again on the next call."""
+        session, conn = self._session()
+        session.execute.side_effect = [DBAPIError("EXECUTE", {}, Mock(pgcode="26000")), Mock()]
+        repo = QuoteRepository(session=session, prepared=True, profiles=False)
+
+        with pytest.raises(DBAPIError):
+            repo.get_latest_quote("AAPL")
+        repo.get_latest_quote("AAPL")
+
+        assert conn.exec_driver_sql.call_count == 2
+
+    def test_disabled_uses_plain_sql(self):
+        """Test prepared=False (PgBouncer mode) never PREPAREs."""
+        session, conn = self._session()
+        repo = QuoteRepository(session=session, prepared=False, profiles=False)
+
+        repo.get_latest_quote("AAPL")
+
+        conn.exec_driver_sql.assert_not_called()
+        session.connection.assert_not_called()
+        assert "EXECUTE" not in str(session.execute.call_args.args[0])
+
+    def test_default_from_settings(self, monkeypatch):
+        """Test the default follows DB_PREPARED_STATEMENTS."""
+        from opa_quotes_storage.config import get_settings
+
+        monkeypatch.setenv("DB_PREPARED_STATEMENTS", "false")
+        get_settings.cache_clear()
+        try:
+            assert QuoteRepository(session=Mock()).prepared is False
+        finally:
+            get_settings.cache_clear()
@@ -0,0 +1,468 @@
+"""Unit tests for write retries and the circuit breaker."""
+
+import threading
+from datetime import UTC, date, datetime
+from unittest.mock import Mock, patch
+
+import psycopg2
+import pytest
+from conftest import sample
+from opa_quotes_storage.health import HealthChecker
+from opa_quotes_storage.ohlcv_repository import OhlcvDailyRepository
+from opa_quotes_storage.repository import QuoteRepository
+from opa_quotes_storage.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retry,
+    is_transient,
+    reset_session,
+    session_policy,
+)
+from pydantic import ValidationError
+from sqlalchemy import exc
+
+QUOTE = {"symbol": "AAPL", "timestamp": datetime(2025, 12, 22, 10, 0, tzinfo=UTC), "close": 1.0}
+
+# Retry immediately
+NO_WAIT = RetryPolicy(attempts=3, base_delay=0)
+
+
+def pg_error(pgcode, cls=psycopg2.OperationalError):
+    """psycopg2 error carrying a SQLSTATE, as raised by the server."""
+    error = cls("server error")
+    error.__setstate__({"pgcode": pgcode, "pgerror": None, "cursor": None})
+    return error
+
+
+def connection_lost():
+    """Error SQLAlchemy raises when the server closes the connection."""
+    return exc.OperationalError("INSERT", {}, psycopg2.OperationalError("server closed"))
+
+
+def make_session():
+    """Session mock holding no pending ORM changes."""
+    session = Mock()
+    session.new = session.dirty = session.deleted = ()
+    return session
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestIsTransient:
+    """Tests for error classification."""
+
+    @pytest.mark.parametrize("pgcode", ["40001", "40P01", "55P03", "53300", "57P01", "08006"])
+    def test_transient_sqlstates(self, pgcode):
+        """Test serialization, deadlock, lock, restart and connection errors."""
+        assert is_transient(exc.OperationalError("SQL", {}, pg_error(pgcode)))
+        assert is_transient(pg_error(pgcode))  # Raw, from a DBAPI cursor
+
+    @pytest.mark.parametrize("pgcode", ["23505", "22003", "42P01", "57014"])
+    def test_permanent_sqlstates(self, pgcode):
+        """Test constraint, data, SQL and statement timeout errors."""
+        assert not is_transient(exc.DBAPIError("SQL", {}, pg_error(pgcode, psycopg2.Error)))
+
+    def test_connection_loss(self):
+        """Test connection losses without a SQLSTATE are transient."""
+        assert is_transient(connection_lost())
+        assert is_transient(psycopg2.InterfaceError("connection already closed"))
+        assert is_transient(exc.TimeoutError("QueuePool limit reached"))
+
+    def test_invalidated_connection(self):
+        """Test any error that invalidated the connection is transient."""
+        error = exc.DBAPIError("SQL", {}, Exception(), connection_invalidated=True)
+
+        assert is_transient(error)
+
+    def test_other_errors(self):
+        """Test non-database errors and unknown DBAPI errors are permanent."""
+        assert not is_transient(ValueError("bad"))
+        assert not is_transient(exc.IntegrityError("INSERT", {}, Mock(pgcode="23505")))
+        assert not is_transient(exc.ProgrammingError("SQL", {}, psycopg2.ProgrammingError()))
+
+
+class TestRetryPolicy:
+    """Tests for backoff delays."""
+
+    def test_delay_bounded(self):
+        """Test delays grow exponentially with jitter up to max_delay."""
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.5)
+
+        for attempt, ceiling in enumerate([0.1, 0.2, 0.4, 0.5, 0.5]):
+            delays = [policy.delay(attempt) for _ in range(50)]
+            assert all(0 <= d <= ceiling for d in delays)
+            assert len(set(delays)) > 1
+
+    def test_at_least_one_attempt(self):
+        """Test a policy must make at least one call."""
+        with pytest.raises(ValidationError):
+            RetryPolicy(attempts=0)
+
+    def test_single_attempt_with_pending_changes(self):
+        """Test sessions with other pending changes are not retried."""
+        session = make_session()
+        assert session_policy(session, NO_WAIT) is NO_WAIT
+
+        session.new = (object(),)
+
+        assert session_policy(session, NO_WAIT).attempts == 1
+
+
+class TestCircuitBreaker:
+    """Tests for breaker state transitions."""
+
+    def test_opens_at_threshold(self):
+        """Test consecutive failures open the breaker and reject calls."""
+        breaker = CircuitBreaker("test_open", failure_threshold=2, clock=FakeClock())
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert sample("opa_quotes_storage_circuit_state", breaker="test_open") == 2
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert sample("opa_quotes_storage_circuit_rejections_total", breaker="test_open") == 1
+
+    def test_success_resets_count(self):
+        """Test a success between failures keeps the breaker closed."""
+        breaker = CircuitBreaker("test_reset", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+        assert breaker.failures == 1
+
+    def test_half_open_trial(self):
+        """Test one trial call after reset_timeout; success closes."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test_trial", failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        clock.now = 30
+
+        assert breaker.state == HALF_OPEN
+        assert sample("opa_quotes_storage_circuit_state", breaker="test_trial") == 1
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # Only one trial at a time
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert sample("opa_quotes_storage_circuit_state", breaker="test_trial") == 0
+
+    def test_interrupted_trial_released(self):
+        """Test an interrupt during the half-open trial lets the next call try."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test_interrupt", failure_threshold=1, clock=clock)
+        breaker.record_failure()
+        clock.now = breaker.reset_timeout
+
+        with pytest.raises(KeyboardInterrupt):
+            call_with_retry(Mock(side_effect=KeyboardInterrupt), "test_interrupt", NO_WAIT, breaker)
+
+        assert breaker.state == HALF_OPEN
+        assert call_with_retry(Mock(return_value="ok"), "test_interrupt", NO_WAIT, breaker) == "ok"
+        assert breaker.state == CLOSED
+
+    def test_half_open_admits_one_thread(self):
+        """Test other threads are rejected until the trial's outcome is recorded."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test_one_trial", failure_threshold=1, clock=clock)
+        breaker.record_failure()
+        clock.now = breaker.reset_timeout
+        admitted = []
+
+        def other() -> None:
+            try:
+                breaker.before_call()
+                admitted.append(True)
+            except CircuitOpenError:
+                admitted.append(False)
+
+        def in_other_thread() -> None:
+            thread = threading.Thread(target=other)
+            thread.start()
+            thread.join()
+
+        def trial() -> str:
+            in_other_thread()  # While the trial runs
+            return "ok"
+
+        record_success = breaker.record_success
+
+        def recording_success() -> None:
+            in_other_thread()  # After the trial returned, before its success is recorded
+            record_success()
+
+        with patch.object(breaker, "record_success", recording_success):
+            assert call_with_retry(trial, "test_one_trial", NO_WAIT, breaker) == "ok"
+
+        assert admitted == [False, False]
+        assert breaker.state == CLOSED
+
+    def test_half_open_failure_reopens(self):
+        """Test a failed trial opens the breaker for another reset_timeout."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test_reopen", failure_threshold=3, reset_timeout=10, clock=clock)
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 10
+        breaker.before_call()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        clock.now = 19
+        assert breaker.state == OPEN
+        clock.now = 20
+        assert breaker.state == HALF_OPEN
+
+    def test_check(self):
+        """Test health statuses follow the state."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("test_check", failure_threshold=1, reset_timeout=5, clock=clock)
+        assert breaker.check()["status"] == "healthy"
+
+        breaker.record_failure()
+        result = breaker.check()
+        assert result["status"] == "unhealthy"
+        assert result["consecutive_failures"] == 1
+
+        clock.now = 5
+        assert breaker.check()["status"] == "degraded"
+
+
+class TestCallWithRetry:
+    """Tests for call_with_retry."""
+
+    def test_retries_transient(self):
+        """Test transient failures are retried after on_retry and a backoff sleep."""
+        call = Mock(side_effect=[connection_lost(), connection_lost(), "done"])
+        on_retry, sleep = Mock(), Mock()
+        before = sample("opa_quotes_storage_retries_total", method="test_retry")
+
+        result = call_with_retry(call, "test_retry", NO_WAIT, on_retry=on_retry, sleep=sleep)
+
+        assert result == "done"
+        assert call.call_count == 3
+        assert on_retry.call_count == 2
+        assert sleep.call_count == 2
+        assert sample("opa_quotes_storage_retries_total", method="test_retry") == before + 2
+
+    def test_gives_up(self):
+        """Test the last transient error is raised after all attempts."""
+        call = Mock(side_effect=connection_lost())
+
+        with pytest.raises(exc.OperationalError):
+            call_with_retry(call, "test_give_up", NO_WAIT, sleep=Mock())
+
+        assert call.call_count == 3
+
+    def test_permanent_not_retried(self):
+        """Test permanent errors are raised at once and close the breaker."""
+        breaker = CircuitBreaker("test_permanent")
+        breaker.record_failure()
+        call = Mock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            call_with_retry(call, "test_permanent", NO_WAIT, breaker, sleep=Mock())
+
+        assert call.call_count == 1
+        assert breaker.failures == 0
+
+    def test_open_breaker_stops_retries(self):
+        """Test retries stop once the failures open the breaker."""
+        breaker = CircuitBreaker("test_shed", failure_threshold=2)
+        call = Mock(side_effect=connection_lost())
+
+        with pytest.raises(CircuitOpenError):
+            call_with_retry(call, "test_shed", NO_WAIT, breaker, sleep=Mock())
+
+        assert call.call_count == 2
+        with pytest.raises(CircuitOpenError):
+            call_with_retry(call, "test_shed", NO_WAIT, breaker, sleep=Mock())
+        assert call.call_count == 2
+
+    def test_reset_session_invalidates_on_failure(self):
+        """Test a failing rollback discards the session's connections."""
+        session = Mock()
+        session.rollback.side_effect = connection_lost()
+
+        reset_session(session)
+
+        session.invalidate.assert_called_once()
+
+
+class TestRepositoryWrites:
+    """Tests for retried repository writes."""
+
+    def make_repo(self, session, name):
+        """QuoteRepository with plain SQL, no profiles and its own breaker."""
+        return QuoteRepository(
+            session, prepared=False, profiles=False, retry=NO_WAIT, breaker=CircuitBreaker(name)
+        )
+
+    def test_bulk_insert_retried(self):
+        """Test a connection lost mid-batch rolls back and re-runs all batches."""
+        session = make_session()
+        session.execute.side_effect = [None, connection_lost(), None, None]
+
+        count = self.make_repo(session, "test_insert").bulk_insert([QUOTE, QUOTE], batch_size=1)
+
+        assert count == 2
+        assert session.execute.call_count == 4
+        session.rollback.assert_called_once()
+        session.commit.assert_called_once()
+
+    def test_bulk_insert_lost_commit(self):
+        """Test a retry conflicting after a lost commit counts as committed."""
+        session = make_session()
+        session.commit.side_effect = connection_lost()
+        session.execute.side_effect = [
+            None,
+            exc.IntegrityError("INSERT", {}, Mock(pgcode="23505")),
+            Mock(scalar_one=Mock(return_value=1)),
+        ]
+        freshness = Mock()
+        repo = self.make_repo(session, "test_lost_commit")
+        repo.freshness = freshness
+
+        assert repo.bulk_insert([QUOTE]) == 1
+        freshness.observe.assert_called_once()
+        count = session.execute.call_args.args[0]
+        assert "count(*)" in str(count)
+
+    def test_bulk_insert_lost_commit_rows_missing(self):
+        """Test a conflict after a lost commit raises unless all rows are stored."""
+        session = make_session()
+        session.commit.side_effect = connection_lost()
+        session.execute.side_effect = [
+            None,
+            exc.IntegrityError("INSERT", {}, Mock(pgcode="23505")),
+            Mock(scalar_one=Mock(return_value=1)),
+        ]
+        repo = self.make_repo(session, "test_lost_commit_missing")
+
+        with pytest.raises(exc.IntegrityError):
+            repo.bulk_insert([QUOTE, {**QUOTE, "symbol": "MSFT"}])
+
+    def test_bulk_insert_pending_changes_not_retried(self):
+        """Test the caller's pending objects are never rolled back by a retry."""
+        session = make_session()
+        session.dirty = (object(),)
+        session.execute.side_effect = connection_lost()
+
+        with pytest.raises(exc.OperationalError):
+            self.make_repo(session, "test_pending").bulk_insert([QUOTE])
+
+        assert session.execute.call_count == 1
+        session.rollback.assert_not_called()
+
+    def test_bulk_insert_conflict_not_retried(self):
+        """Test a genuine duplicate still raises without a retry."""
+        session = make_session()
+        session.execute.side_effect = exc.IntegrityError("INSERT", {}, Mock(pgcode="23505"))
+
+        with pytest.raises(exc.IntegrityError):
+            self.make_repo(session, "test_conflict").bulk_insert([QUOTE])
+
+        assert session.execute.call_count == 1
+
+    def test_bulk_insert_validation_not_retried(self):
+        """Test invalid records never reach the database."""
+        session = make_session()
+
+        with pytest.raises(ValidationError):
+            self.make_repo(session, "test_invalid").bulk_insert([{**QUOTE, "close": -1}])
+
+        assert not session.execute.called
+
+    def test_bulk_insert_sheds_when_open(self):
+        """Test an open breaker rejects writes without touching the session."""
+        session = make_session()
+        breaker = CircuitBreaker("test_insert_open", failure_threshold=1)
+        breaker.record_failure()
+        repo = QuoteRepository(session, prepared=False, profiles=False, breaker=breaker)
+
+        with pytest.raises(CircuitOpenError):
+            repo.bulk_insert([QUOTE])
+
+        assert not session.execute.called
+
+    def test_default_attempts_from_settings(self, monkeypatch):
+        """Test the retry policy defaults to the db_write_attempts setting."""
+        from opa_quotes_storage.config import get_settings
+        from opa_quotes_storage.resilience import WRITE_BREAKER
+
+        monkeypatch.setenv("DB_WRITE_ATTEMPTS", "5")
+        get_settings.cache_clear()
+        try:
+            repo = QuoteRepository(Mock())
+        finally:
+            get_settings.cache_clear()
+
+        assert repo.retry.attempts == 5
+        assert repo.breaker is WRITE_BREAKER
+
+    def test_bulk_upsert_retried(self):
+        """Test a COPY failing on a lost connection is retried."""
+        session = make_session()
+        cursor = session.connection.return_value.connection.cursor.return_value
+        cursor.rowcount = 1
+        cursor.copy_expert.side_effect = [psycopg2.OperationalError("server closed"), None]
+        repo = OhlcvDailyRepository(
+            session, profiles=False, retry=NO_WAIT, breaker=CircuitBreaker("test_upsert")
+        )
+        bar = {
+            "ticker": "AAPL",
+            "date": date(2024, 1, 2),
+            "open": 1.0,
+            "high": 1.0,
+            "low": 1.0,
+            "close": 1.0,
+            "volume": 1,
+        }
+
+        assert repo.bulk_upsert([bar]) == 1
+        session.rollback.assert_called_once()
+        session.commit.assert_called_once()
+
+
+class TestCircuitBreakerHealth:
+    """Tests for HealthChecker.check_circuit_breaker."""
+
+    def test_reports_state(self):
+        """Test the check is unhealthy while the breaker is open."""
+        breaker = CircuitBreaker("test_health", failure_threshold=1)
+        checker = HealthChecker()
+        assert checker.check_circuit_breaker(breaker)["status"] == "healthy"
+
+        breaker.record_failure()
+        result = checker.check_circuit_breaker(breaker)
+
+        assert result["status"] == "unhealthy"
+        assert result["state"] == OPEN
+        assert result["latency_ms"] >= 0
+
+    def test_default_breaker(self):
+        """Test the process-wide write breaker is checked by default."""
+        with patch("opa_quotes_storage.resilience.WRITE_BREAKER") as breaker:
+            breaker.check.return_value = {"status": "healthy"}
+
+            assert HealthChecker().check_circuit_breaker()["status"] == "healthy"
@@ -0,0 +1,96 @@
+"""Unit tests for the real_time -> ohlcv_daily rollup job."""
+
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import Mock
+
+from opa_quotes_storage.rollup import DailyRollup
+from opa_quotes_storage.trading_calendar import US_EQUITIES, TradingSession
+from sqlalchemy.dialects import postgresql
+
+
+def compile_sql(stmt):
+    """Render a statement for PostgreSQL."""
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestDailyRollup:
+    """Tests for DailyRollup."""
+
+    def test_closed_through_after_close(self):
+        """Test today counts once the local session has closed."""
+        rollup = DailyRollup(Mock())
+
+        # 2024-01-03 21:30 UTC = 16:30 New York (Wednesday)
+        assert rollup.closed_through(datetime(2024, 1, 3, 21, 30, tzinfo=UTC)) == date(2024, 1, 3)
+        # 15:00 New York: today still open, yesterday is the last closed day
+        assert rollup.closed_through(datetime(2024, 1, 3, 20, 0, tzinfo=UTC)) == date(2024, 1, 2)
+
+    def test_closed_through_skips_non_session_days(self):
+        """Test weekends and holidays are skipped."""
+        calendar = US_EQUITIES.model_copy(update={"holidays": frozenset({date(2024, 1, 5)})})
+        rollup = DailyRollup(Mock(), calendar=calendar)
+
+        # Sunday -> Friday is a holiday -> Thursday
+        assert rollup.closed_through(datetime(2024, 1, 7, 12, tzinfo=UTC)) == date(2024, 1, 4)
+
+    def test_batches_aligned_to_chunks(self):
+        """Test batches end on chunk boundaries (7-day chunks start on Thursdays)."""
+        rollup = DailyRollup(Mock(), batch_days=7)
+
+        batches = rollup.batches(date(2024, 1, 1), date(2024, 1, 20))
+
+        assert batches == [
+            (date(2024, 1, 1), date(2024, 1, 3)),
+            (date(2024, 1, 4), date(2024, 1, 10)),
+            (date(2024, 1, 11), date(2024, 1, 17)),
+            (date(2024, 1, 18), date(2024, 1, 20)),
+        ]
+
+    def test_chunk_days_from_timescaledb(self):
+        """Test the real_time chunk interval is read from TimescaleDB."""
+        session = Mock()
+        session.execute.return_value.scalar_one_or_none.return_value = timedelta(days=1)
+        assert DailyRollup(session).chunk_days() == 1
+
+        session.execute.return_value.scalar_one_or_none.return_value = None
+        assert DailyRollup(session).chunk_days() == 7
+
+    def test_rollup_statement(self):
+        """Test aggregation runs in the database and never overwrites external bars."""
+        calendar = TradingSession(name="XNYS", timezone="America/New_York")
+
+        sql = compile_sql(
+            DailyRollup(Mock(), calendar=calendar).rollup_statement(
+                date(2024, 1, 2), date(2024, 1, 3)
+            )
+        )
+
+        assert sql.startswith("INSERT INTO quotes.ohlcv_daily")
+        assert "first(quotes.real_time.open, quotes.real_time.timestamp)" in sql
+        assert "last(quotes.real_time.close, quotes.real_time.timestamp)" in sql
+        assert "GROUP BY quotes.real_time.symbol, day" in sql
+        assert "ON CONFLICT (ticker, date) DO UPDATE" in sql
+        assert "WHERE quotes.ohlcv_daily.source = %(source_1)s" in sql
+
+    def test_run_advances_watermark_per_batch(self):
+        """Test each batch is committed with its watermark."""
+        session = Mock()
+        session.execute.return_value.scalar_one_or_none.return_value = date(2024, 1, 2)
+        session.execute.return_value.rowcount = 10
+        rollup = DailyRollup(session, batch_days=7)
+
+        stats = rollup.run(now=datetime(2024, 1, 12, 22, tzinfo=UTC))
+
+        assert stats == {"days": 10, "bars": 30, "watermark": date(2024, 1, 12)}
+        # 01-03 | 01-04..01-10 | 01-11..01-12
+        assert session.commit.call_count == 3
+
+    def test_run_up_to_date(self):
+        """Test nothing is written when the watermark is current."""
+        session = Mock()
+        session.execute.return_value.scalar_one_or_none.return_value = date(2024, 1, 12)
+
+        stats = DailyRollup(session).run(now=datetime(2024, 1, 12, 22, tzinfo=UTC))
+
+        assert stats["days"] == 0
+        assert not session.commit.called
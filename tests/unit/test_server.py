@@ -0,0 +1,160 @@
+"""Unit tests for the health/metrics HTTP server."""
+
+import asyncio
+import json
+from unittest.mock import Mock
+
+from opa_quotes_storage.server import HealthServer
+from opa_quotes_storage.slowlog import SlowQueryRecorder
+from prometheus_client import CollectorRegistry, Counter
+
+
+def make_server(status="healthy"):
+    """Server on a free port with a mocked checker and private registry."""
+    checker = Mock()
+    checker.check_all.return_value = {"overall_status": status, "checks": {}}
+    registry = CollectorRegistry()
+    Counter("test_server_requests_total", "Test counter", registry=registry).inc()
+    return HealthServer(checker=checker, host="127.0.0.1", port=0, registry=registry)
+
+
+async def exchange(server, *requests):
+    """Send raw requests on one connection, returning all response bytes."""
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"".join(requests))
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+        return data
+    finally:
+        await server.close()
+
+
+def get(path, connection="close", method="GET"):
+    """Raw HTTP/1.1 request."""
+    return f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: {connection}\r\n\r\n".encode()
+
+
+def split(data):
+    """Status code, headers and body of a single response."""
+    head, _, body = data.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+class TestHealthServer:
+    """Tests for HealthServer endpoints."""
+
+    def test_healthz(self):
+        """Test liveness answers without consulting the checker."""
+        server = make_server()
+        status, headers, body = split(asyncio.run(exchange(server, get("/healthz"))))
+
+        assert status == 200
+        assert body == b"ok\n"
+        assert headers["Connection"] == "close"
+        server.checker.check_all.assert_not_called()
+        server.checker.close.assert_called_once()
+
+    def test_readyz_healthy(self):
+        """Test readiness returns the checker report with 200."""
+        server = make_server()
+        status, headers, body = split(asyncio.run(exchange(server, get("/readyz"))))
+
+        assert status == 200
+        assert headers["Content-Type"] == "application/json"
+        assert json.loads(body)["overall_status"] == "healthy"
+
+    def test_readyz_unhealthy(self):
+        """Test readiness returns 503 unless healthy."""
+        server = make_server(status="degraded")
+        status, _, _ = split(asyncio.run(exchange(server, get("/readyz"))))
+
+        assert status == 503
+
+    def test_metrics(self):
+        """Test Prometheus exposition of the configured registry."""
+        server = make_server()
+        status, headers, body = split(asyncio.run(exchange(server, get("/metrics"))))
+
+        assert status == 200
+        assert headers["Content-Type"].startswith("text/plain")
+        assert b"test_server_requests_total 1.0" in body
+
+    def test_slow_queries(self):
+        """Test the slow query report is served as JSON."""
+        server = make_server()
+        server.recorder = SlowQueryRecorder(threshold_ms=100)
+        server.recorder.record("SELECT 1", None, 150.0)
+        status, _, body = split(asyncio.run(exchange(server, get("/slow-queries"))))
+
+        assert status == 200
+        assert json.loads(body)["statements"][0]["statement"] == "SELECT 1"
+
+    def test_not_found_and_method_not_allowed(self):
+        """Test unknown paths and non-GET methods."""
+        status, _, _ = split(asyncio.run(exchange(make_server(), get("/nope"))))
+        assert status == 404
+
+        status, _, _ = split(asyncio.run(exchange(make_server(), get("/healthz", method="POST"))))
+        assert status == 405
+
+    def test_head_has_length_but_no_body(self):
+        """Test HEAD reports Content-Length without sending a body."""
+        status, headers, body = split(
+            asyncio.run(exchange(make_server(), get("/healthz", method="HEAD")))
+        )
+
+        assert status == 200
+        assert headers["Content-Length"] == "3"
+        assert body == b""
+
+    def test_keep_alive(self):
+        """Test several requests are served on one connection."""
+        data = asyncio.run(
+            exchange(make_server(), get("/healthz", "keep-alive"), get("/readyz", "close"))
+        )
+
+        assert data.count(b"HTTP/1.1 200 OK") == 2
+
+    def test_bad_request(self):
+        """Test malformed request lines get a 400."""
+        status, _, _ = split(asyncio.run(exchange(make_server(), b"garbage\r\n\r\n")))
+
+        assert status == 400
+
+    def test_readyz_warming_up(self):
+        """Test readiness fails without running checks until the warm-up finishes."""
+        server = make_server()
+        server.warmup = Mock(ready=False)
+        status, _, body = split(asyncio.run(exchange(server, get("/readyz"))))
+
+        assert status == 503
+        assert json.loads(body)["overall_status"] == "warming_up"
+        server.checker.check_all.assert_not_called()
+
+        server.warmup.ready = True
+        status, _, _ = split(asyncio.run(exchange(server, get("/readyz"))))
+        assert status == 200
+
+    def test_serve_forever_runs_warmup(self):
+        """Test serve_forever runs the warm-up in the background."""
+        server = make_server()
+        server.warmup = Mock(ready=False)
+
+        async def scenario():
+            task = asyncio.create_task(server.serve_forever())
+            for _ in range(500):
+                if server.warmup.run.called:
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await server.close()
+
+        asyncio.run(scenario())
+
+        server.warmup.run.assert_called_once()
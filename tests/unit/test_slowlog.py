@@ -0,0 +1,139 @@
+"""Unit tests for the slow query recorder."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from opa_quotes_storage.config import get_settings
+from opa_quotes_storage.slowlog import _START_KEY, DEFAULT_THRESHOLD_MS, SlowQueryRecorder
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+
+def sqlite_engine(recorder):
+    """In-memory engine timed by recorder."""
+    engine = create_engine("sqlite://")
+    recorder.attach(engine)
+    return engine
+
+
+class TestSlowQueryRecorder:
+    """Tests for SlowQueryRecorder."""
+
+    def test_records_queries_over_threshold(self):
+        """Test cursor executions are timed and aggregated per statement."""
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        engine = sqlite_engine(recorder)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :x"), {"x": 1})
+            conn.execute(text("SELECT :x"), {"x": 2})
+
+        (statement, stats), *_ = recorder.top()
+        assert statement == "SELECT ?"
+        assert stats["calls"] == 2
+        assert len(recorder.queries) == 2
+        assert recorder.queries[-1].parameters == (2,)
+
+    def test_ignores_fast_queries(self):
+        """Test queries under the threshold are not recorded."""
+        recorder = SlowQueryRecorder(threshold_ms=60_000)
+        engine = sqlite_engine(recorder)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert recorder.stats == {}
+        assert not recorder.queries
+
+    def test_sampling_keeps_statistics(self):
+        """Test unsampled queries still count in the statistics."""
+        recorder = SlowQueryRecorder(threshold_ms=0, sample_rate=0)
+
+        recorder.record("SELECT 1", None, 150.0)
+
+        assert recorder.stats["SELECT 1"]["calls"] == 1
+        assert not recorder.queries
+
+    def test_failed_query_drops_start_time(self):
+        """Test a raising statement does not leave its start time on the connection."""
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        engine = sqlite_engine(recorder)
+
+        with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT * FROM missing_table"))
+                conn.rollback()
+
+            assert conn.info[_START_KEY] == []
+
+    def test_threshold_from_settings(self, monkeypatch):
+        """Test the default threshold is read from settings when attached."""
+        monkeypatch.setenv("SLOW_QUERY_MS", "250")
+        get_settings.cache_clear()
+        try:
+            recorder = SlowQueryRecorder()
+            assert recorder.threshold_ms == DEFAULT_THRESHOLD_MS
+            sqlite_engine(recorder)
+        finally:
+            get_settings.cache_clear()
+
+        assert recorder.threshold_ms == 250
+
+    def test_detach(self):
+        """Test a detached engine is no longer timed."""
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        engine = sqlite_engine(recorder)
+        recorder.detach(engine)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert not recorder.queries
+
+    def test_report(self):
+        """Test the report orders statements by total time."""
+        recorder = SlowQueryRecorder(threshold_ms=100, capacity=2)
+        recorder.record("SELECT a", None, 150.0)
+        recorder.record("SELECT b", None, 400.0)
+        recorder.record("SELECT a", None, 200.0)
+
+        report = recorder.report()
+
+        assert [s["statement"] for s in report["statements"]] == ["SELECT b", "SELECT a"]
+        assert report["statements"][1]["mean_ms"] == 175.0
+        assert report["statements"][1]["max_ms"] == 200.0
+        # Ring buffer keeps the two most recent, newest first
+        assert [q["duration_ms"] for q in report["recent"]] == [200.0, 400.0]
+
+        recorder.reset()
+        assert recorder.report()["statements"] == []
+
+    def test_explain_replays_slowest_read(self):
+        """Test EXPLAIN runs for reads with the slowest call's parameters."""
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        recorder.record("SELECT %(x)s", {"x": 1}, 150.0)
+        recorder.record("SELECT %(x)s", {"x": 2}, 300.0)
+        recorder.record("INSERT INTO t VALUES (1)", None, 900.0)
+        engine = MagicMock()
+        conn = engine.connect.return_value.__enter__.return_value
+        conn.info = {}
+        conn.exec_driver_sql.return_value.scalar.return_value = '[{"Plan": {}}]'
+
+        assert recorder.explain(engine) == 1
+        assert recorder.explain(engine) == 0  # already captured
+
+        sql, parameters = conn.exec_driver_sql.call_args[0]
+        assert sql == "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT %(x)s"
+        assert parameters == {"x": 2}
+        conn.rollback.assert_called_once()
+        assert recorder.report()["statements"][1]["plan"] == [{"Plan": {}}]
+
+    def test_explain_failure_is_logged(self):
+        """Test a failing EXPLAIN is skipped."""
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        recorder.record("SELECT 1", None, 150.0)
+        engine = MagicMock()
+        engine.connect.side_effect = RuntimeError("down")
+
+        assert recorder.explain(engine) == 0
@@ -0,0 +1,127 @@
+"""Unit tests for storage and compression reporting."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+
+from conftest import sample
+from opa_quotes_storage.storage import StorageMonitor, build_reports
+
+NOW = datetime.now(UTC)
+
+
+def day(n):
+    """n days before NOW."""
+    return NOW - timedelta(days=n)
+
+
+# 3 daily real_time chunks: the oldest compressed 10:1, one backlogged, one current
+CHUNK_ROWS = [
+    ("real_time", "_hyper_1_1_chunk", day(40), day(39), True, 1000, 100),
+    ("real_time", "_hyper_1_2_chunk", day(35), day(34), False, 1000, 1000),
+    ("real_time", "_hyper_1_3_chunk", day(1), day(0), False, 1000, 1000),
+    ("ohlcv_daily", "_hyper_2_4_chunk", day(300), day(-65), False, 500, 500),
+]
+
+JOB_ROWS = [
+    (
+        "real_time",
+        1000,
+        "policy_compression",
+        True,
+        timedelta(days=30),
+        day(1),
+        day(1),
+        "Success",
+        day(-1),
+        30,
+        0,
+    ),
+    (
+        "ohlcv_daily",
+        1001,
+        "policy_compression",
+        True,
+        timedelta(days=30),
+        day(1),
+        day(2),
+        "Failed",
+        day(-1),
+        30,
+        2,
+    ),
+]
+
+
+class TestStorageReport:
+    """Tests for report assembly."""
+
+    def test_sizes_ratio_and_backlog(self):
+        """Test totals, compression ratio and chunks behind the policy."""
+        report = build_reports(CHUNK_ROWS, JOB_ROWS, NOW)["quotes.real_time"]
+
+        assert report.total_bytes == 2100
+        assert report.uncompressed_bytes == 3000
+        assert report.compression_ratio == 10.0
+        assert report.compress_after == timedelta(days=30)
+        assert [chunk.chunk for chunk in report.backlog] == ["_hyper_1_2_chunk"]
+        assert report.chunks[0].compression_ratio == 10.0
+        assert report.chunks[1].compression_ratio is None
+
+    def test_projected_growth(self):
+        """Test growth is the ingest rate divided by the compression ratio."""
+        report = build_reports(CHUNK_ROWS, JOB_ROWS, NOW)["quotes.real_time"]
+
+        assert report.span_days == 40
+        assert report.ingest_bytes_per_day == 75.0
+        assert report.projected_bytes_per_day == 7.5
+
+    def test_problems(self):
+        """Test backlog, failed jobs and low ratios are reported."""
+        reports = build_reports(CHUNK_ROWS, JOB_ROWS, NOW)
+
+        assert len(reports["quotes.real_time"].problems()) == 1
+        assert reports["quotes.real_time"].problems(target_ratio=20)[-1].endswith("below 20:1")
+        problems = reports["quotes.ohlcv_daily"].problems()
+        assert problems == ["quotes.ohlcv_daily: job 1001 (policy_compression) last run failed"]
+
+    def test_no_policy_no_backlog(self):
+        """Test hypertables without a compression policy have no backlog."""
+        report = build_reports(CHUNK_ROWS[:3], [], NOW)["quotes.real_time"]
+
+        assert report.compress_after is None
+        assert report.backlog == ()
+        assert report.projected_bytes_per_day == report.ingest_bytes_per_day
+
+    def test_summary(self):
+        """Test summary is JSON-ready."""
+        summary = build_reports(CHUNK_ROWS, JOB_ROWS, NOW)["quotes.ohlcv_daily"].summary()
+
+        assert summary["compression_ratio"] is None
+        assert summary["backlog_chunks"] == 0
+        assert summary["jobs"][0]["last_run_status"] == "Failed"
+        assert summary["jobs"][0]["next_start"] == day(-1).isoformat()
+
+
+class TestStorageMonitor:
+    """Tests for StorageMonitor."""
+
+    def test_reports_exports_metrics(self):
+        """Test reports run the catalog queries and update gauges."""
+        session = Mock()
+        session.execute.return_value.all.side_effect = [CHUNK_ROWS, JOB_ROWS]
+
+        reports = StorageMonitor(session).reports()
+
+        assert set(reports) == {"quotes.real_time", "quotes.ohlcv_daily"}
+        assert session.execute.call_count == 2
+        labels = {"hypertable": "quotes.real_time"}
+        assert sample("opa_quotes_storage_hypertable_bytes", **labels) == 2100
+        assert sample("opa_quotes_storage_compression_ratio", **labels) == 10.0
+        assert sample("opa_quotes_storage_compression_backlog_chunks", **labels) == 1
+        job = {
+            "hypertable": "quotes.ohlcv_daily",
+            "job_id": "1001",
+            "proc_name": "policy_compression",
+        }
+        assert sample("opa_quotes_storage_job_failures", **job) == 2
+        assert sample("opa_quotes_storage_job_last_run_failed", **job) == 1
@@ -0,0 +1,44 @@
+"""Unit tests for trading session calendars."""
+
+from datetime import UTC, date, datetime, time
+
+import pytest
+from opa_quotes_storage.trading_calendar import US_EQUITIES, TradingSession
+from pydantic import ValidationError
+
+
+class TestTradingSession:
+    """Tests for TradingSession."""
+
+    def test_us_equities_hours(self):
+        """Test the predefined US equities session."""
+        assert US_EQUITIES.timezone == "America/New_York"
+        assert US_EQUITIES.open == time(9, 30)
+        assert US_EQUITIES.close == time(16, 0)
+
+    def test_is_session_day_weekend(self):
+        """Test that weekends have no session."""
+        assert US_EQUITIES.is_session_day(date(2025, 12, 22))  # Monday
+        assert not US_EQUITIES.is_session_day(date(2025, 12, 20))  # Saturday
+
+    def test_is_session_day_holiday(self):
+        """Test that holidays have no session."""
+        session = US_EQUITIES.model_copy(update={"holidays": frozenset({date(2025, 12, 25)})})
+
+        assert not session.is_session_day(date(2025, 12, 25))
+        assert session.is_session_day(date(2025, 12, 24))
+
+    def test_is_open_in_local_time(self):
+        """Test open hours are evaluated in the exchange timezone."""
+        assert US_EQUITIES.is_open(datetime(2025, 12, 22, 14, 30, tzinfo=UTC))  # 09:30 EST
+        assert not US_EQUITIES.is_open(datetime(2025, 12, 22, 14, 29, tzinfo=UTC))
+        assert not US_EQUITIES.is_open(datetime(2025, 12, 22, 21, 0, tzinfo=UTC))  # 16:00 EST
+        assert US_EQUITIES.is_open(datetime(2025, 7, 1, 13, 30, tzinfo=UTC))  # 09:30 EDT
+        assert not US_EQUITIES.is_open(datetime(2025, 12, 20, 15, 0, tzinfo=UTC))  # Saturday
+
+    def test_session_is_immutable(self):
+        """Test that sessions cannot be modified."""
+        session = TradingSession(name="TEST")
+
+        with pytest.raises(ValidationError):
+            session.name = "OTHER"
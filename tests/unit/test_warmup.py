@@ -0,0 +1,183 @@
+"""Unit tests for connection and statement warm-up."""
+
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock, Mock, patch
+
+from opa_quotes_storage import warmup
+from opa_quotes_storage.warmup import (
+    WARMUP_SYMBOL,
+    Warmup,
+    recent_indexes_sql,
+    warm_connection,
+)
+
+
+def make_engine(pool_size=3):
+    """Engine mock whose first pool_size connects only return together."""
+    engine = Mock()
+    engine.pool.size.return_value = pool_size
+    barrier = threading.Barrier(pool_size, timeout=5)
+    connections = []
+    lock = threading.Lock()
+
+    def connect():
+        with lock:
+            conn = MagicMock()
+            connections.append(conn)
+            parallel = len(connections) <= pool_size
+        if parallel:
+            barrier.wait()  # Raises if the pool is not opened in parallel
+        return conn
+
+    engine.connect.side_effect = connect
+    return engine, connections
+
+
+class TestWarmConnection:
+    """Tests for warm_connection."""
+
+    def test_runs_hot_reads(self):
+        """Test the hot repository reads run once and the transaction ends."""
+        conn = Mock()
+        with patch.object(warmup, "QuoteRepository") as repo_class:
+            assert warm_connection(conn) == 2
+
+        repo = repo_class.return_value
+        repo.get_latest_quote.assert_called_once_with(WARMUP_SYMBOL)
+        assert repo.get_quotes.call_args.args[0] == WARMUP_SYMBOL
+        conn.rollback.assert_called_once()
+
+    def test_prepares_hot_statements(self):
+        """Test every hot statement is prepared when enabled on PostgreSQL."""
+        conn = Mock()
+        conn.dialect.name = "postgresql"
+        conn.dialect.driver = "psycopg2"
+        with (
+            patch.object(warmup, "QuoteRepository") as repo_class,
+            patch.object(warmup, "prepare_all") as prepare_all,
+        ):
+            repo_class.return_value.prepared = True
+            warm_connection(conn)
+
+        prepare_all.assert_called_once_with(conn)
+
+
+class TestWarmup:
+    """Tests for Warmup."""
+
+    def test_opens_pool_in_parallel(self):
+        """Test pool_size distinct connections are opened at once and returned."""
+        engine, connections = make_engine(pool_size=3)
+        warm = Warmup(engine)
+        assert not warm.ready
+
+        with (
+            patch.object(warmup, "warm_connection", return_value=2) as warm_conn,
+            patch.object(Warmup, "_prewarm_indexes"),
+        ):
+            report = warm.run()
+
+        assert report.connections == 3
+        assert report.statements == 6
+        assert report.errors == []
+        assert {call.args[0] for call in warm_conn.call_args_list} == set(connections[:3])
+        for conn in connections[:3]:
+            conn.close.assert_called_once()
+        assert warm.ready
+        assert warm.wait(0)
+        assert warm.report is report
+
+    def test_connection_failure_reported(self):
+        """Test a failing connection is reported while the rest are warmed."""
+        engine, connections = make_engine(pool_size=2)
+        calls = iter([2, RuntimeError("boom")])
+
+        def warm_conn(conn):
+            result = next(calls)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with (
+            patch.object(warmup, "warm_connection", side_effect=warm_conn),
+            patch.object(Warmup, "_prewarm_indexes"),
+        ):
+            report = Warmup(engine).run()
+
+        assert report.connections == 1
+        assert report.errors == ["warm connection: boom"]
+        for conn in connections[:2]:
+            conn.close.assert_called_once()
+
+    def test_step_failure_reported(self):
+        """Test a failing step does not stop the warm-up."""
+        engine, _ = make_engine(pool_size=1)
+        with (
+            patch.object(warmup, "warm_connection", return_value=2),
+            patch.object(Warmup, "_prewarm_indexes", side_effect=RuntimeError("no chunks")),
+        ):
+            warm = Warmup(engine)
+            report = warm.run()
+
+        assert report.connections == 1
+        assert report.errors == ["prewarm indexes: no chunks"]
+        assert warm.ready
+
+    def test_prewarm_skipped_without_extension(self):
+        """Test index warm-up is skipped when pg_prewarm is missing."""
+        conn = Mock()
+        conn.execute.return_value.scalar.return_value = None
+        report = warmup.WarmupReport()
+
+        Warmup(Mock(), connections=1)._prewarm_indexes(conn, report)
+
+        assert report.indexes == 0
+        conn.execute.assert_called_once()
+
+    def test_prewarm_loads_recent_indexes(self):
+        """Test each recent chunk index is passed to pg_prewarm."""
+        conn = Mock()
+        conn.execute.return_value.scalar.return_value = 1
+        conn.execute.return_value.scalars.return_value.all.return_value = ["a_pkey", "a_idx"]
+        report = warmup.WarmupReport()
+
+        Warmup(Mock(), connections=1)._prewarm_indexes(conn, report)
+
+        assert report.indexes == 2
+        prewarmed = [call.args[1] for call in conn.execute.call_args_list[2:]]
+        assert prewarmed == [{"index": "a_pkey"}, {"index": "a_idx"}]
+
+    def test_prime_symbols_and_freshness(self):
+        """Test latest quotes are read and the freshness monitor is loaded."""
+        engine, _ = make_engine(pool_size=1)
+        freshness = Mock()
+        warm = Warmup(
+            engine, symbols=["aapl", "msft"], freshness=freshness, chunk_lookback=timedelta(days=1)
+        )
+
+        with (
+            patch.object(warmup, "warm_connection", return_value=2),
+            patch.object(Warmup, "_prewarm_indexes"),
+            patch.object(warmup, "QuoteRepository") as repo_class,
+        ):
+            report = warm.run()
+
+        latest = repo_class.return_value.get_latest_quote
+        assert [call.args[0] for call in latest.call_args_list] == ["AAPL", "MSFT"]
+        assert report.primed_symbols == 2
+        assert freshness.load.call_args.args[1] == timedelta(days=1)
+
+    def test_pool_size_default(self):
+        """Test pools without a size warm one connection."""
+        engine = Mock()
+        engine.pool = object()
+
+        assert Warmup(engine).connections == 1
+
+    def test_recent_indexes_sql(self):
+        """Test the lookback is inlined as seconds."""
+        sql = recent_indexes_sql(timedelta(days=2))
+
+        assert "INTERVAL '172800 seconds'" in sql
+        assert "show_chunks('quotes.real_time'" in sql